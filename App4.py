@@ -1,41 +1,82 @@
 import streamlit as st
-import pandas as pd
 import datetime
-import os
-import plotly.express as px
+import io
+import pandas as pd
+
+from worklog import profiling
+from worklog.audit import as_of, trail
+from worklog.bulk import date_range
+from worklog.cache import CACHE
+from worklog.charts import cumulative_chart, earnings_pie
+from worklog.core import ALREADY_LOGGED, NON_WORKING, REMOVED, log_day, open_worklog, remove_day
+from worklog.periods import (archive_closed, create_period, current_period, find_period, history_version,
+                             is_archived, list_periods, list_workers, load_history)
+from worklog.rates import DEFAULT_WORKER, load_rates, rates_for, reprice_worker, set_rate
+from worklog.rollups import rollup
+from worklog.transfer import MIME_TYPES, export, import_file
+from worklog.views import debug_panel, paged_table, set_session_actor, sync_status
+from worklog.workdays import load_calendar
 
 # --- PAGE CONFIG ---
 st.set_page_config(layout="centered")
+profiling.begin_run("App4")  # No-op unless profiling is on (see the Debug panel)
+# Clicks update the shared worklog and return; a background thread writes them to disk
+CACHE.background_writes()
+set_session_actor("App4")  # Who the audit trail records for changes made here
+
+# --- WORKER & PAY PERIOD ---
+st.sidebar.header("Worker")
+with st.sidebar:
+    sync_status()
+worker = st.sidebar.text_input("Name", value="me", key="worker_widget").strip()
+try:
+    current = current_period(worker)
+except ValueError as e:
+    st.sidebar.error(str(e))
+    st.stop()
+archive_closed(worker)  # Periods closed for a while become compressed and read-only
+periods = list_periods(worker)
+work_calendar = load_calendar(worker)  # weekly days off and holidays, from worklogs/calendar.json
+period = st.sidebar.selectbox(
+    "Pay period", periods, index=periods.index(current),
+    format_func=lambda p: f"{p.start:%d %b %Y} – {p.end:%d %b %Y}" + (" (archived)" if is_archived(p.path) else "")
+)
+
+with st.sidebar.expander("New pay period"):
+    new_start = st.date_input("Start", value=periods[-1].end + datetime.timedelta(days=1), key="new_period_start")
+    new_end = st.date_input("End", value=new_start + (period.end - period.start), key="new_period_end")
+    st.caption("Day rates come from the worker's hourly rate history.")
+    if st.button("Create Period", use_container_width=True):
+        try:
+            create_period(worker, new_start, new_end)
+            st.rerun()
+        except ValueError as e:
+            st.error(str(e))
 
-# --- SETTINGS ---
-DATA_FILE = "worklog.csv"
-hourly_rate = 12.48
-non_working_days = ["Sunday", "Wednesday"]
-
-# --- FUNCTIONS TO LOAD AND SAVE DATA ---
-def load_data():
-    if os.path.exists(DATA_FILE):
-        df = pd.read_csv(DATA_FILE)
-        df['Date'] = pd.to_datetime(df['Date']).dt.date
-        return df
-    else:
-        start_date = datetime.date(2025, 9, 14)
-        end_date = datetime.date(2025, 10, 11)
-        dates = pd.date_range(start_date, end_date)
-        return pd.DataFrame({
-            "Date": dates.date, "Day": dates.day_name(),
-            "Hours Worked": [0.0] * len(dates), "Hourly Rate": [hourly_rate] * len(dates),
-            "Earned": [0.0] * len(dates), "To Earn": [0.0] * len(dates)
-        })
-
-def save_data(df):
-    df.to_csv(DATA_FILE, index=False)
-
-# --- INITIALIZE SESSION STATE ---
-if "worklog" not in st.session_state:
-    st.session_state.worklog = load_data()
-
-df = st.session_state.worklog
+with st.sidebar.expander("Hourly rate"):
+    rate_schedule = load_rates()
+    st.dataframe(rate_schedule[rate_schedule["Worker"].isin([DEFAULT_WORKER, worker])], hide_index=True)
+    rate_from = st.date_input("Effective from", value=period.start, key="rate_from_widget")
+    rate_value = st.number_input("Hourly rate (£)", value=float(rates_for(rate_schedule, worker, [rate_from])[0]),
+                                 min_value=0.0, step=0.01, key="rate_value_widget")
+    if st.button("Apply Rate", use_container_width=True):
+        CACHE.flush()  # Repricing rewrites the periods from disk
+        set_rate(worker, rate_from, rate_value)
+        changed = reprice_worker(worker, since=rate_from, calendar=work_calendar)
+        st.success(f"Repriced {changed} days from {rate_from}.")
+        st.rerun()
+
+profiling.lap("sidebar")
+
+DATA_PATH = period.path
+
+# --- LOAD THE SHARED WORKLOG ---
+# (one copy per file for the whole server process, reloaded only when the file changes)
+worklog = open_worklog(DATA_PATH, calendar=work_calendar)
+df = worklog.df
+date_index = worklog.index
+totals = worklog.totals
+profiling.lap("load")
 
 # --- HEADER & PRIMARY ACTION ---
 st.title("Work Log Tracker")
@@ -43,75 +84,80 @@ st.title("Work Log Tracker")
 st.subheader("Log Today's Hours")
 today = datetime.date.today()
 # We check if today's date (September 28, 2025) is within the DataFrame's range
-if today >= df["Date"].min() and today <= df["Date"].max():
+if date_index.start <= today <= date_index.end:
     if st.button("Log Today", use_container_width=True, type="primary"):
-        idx = df.index[df["Date"] == today][0]
-        day_name = df.loc[idx, "Day"]
-        if day_name in non_working_days:
-            # It's Sunday, which is a non-working day
-            st.warning(f"Today ({day_name}) is a non-working day.")
+        result = log_day(worklog, today, 4, overwrite=True)
+        if result.status == NON_WORKING:
+            st.warning(f"Today ({result.day}) is a non-working day.")
         else:
-            df.loc[idx, "Hours Worked"] = 4
-            df.loc[idx, "Earned"] = df.loc[idx, "Hours Worked"] * df.loc[idx, "Hourly Rate"]
-            save_data(df)
             st.success(f"Logged 4 hours for {today}")
             st.rerun()
 else:
     st.info(f"Today's date ({today}) is outside the current logging period.")
+profiling.lap("log today")
 
 st.divider()
 
-# --- RECALCULATE DATA ---
-workdays_mask = ~df["Day"].isin(non_working_days)
-df.loc[workdays_mask, "To Earn"] = (4 * df.loc[workdays_mask, "Hourly Rate"]) - df.loc[workdays_mask, "Earned"]
-df.loc[df["To Earn"] < 0, "To Earn"] = 0
-df.loc[~workdays_mask, "To Earn"] = 0
-st.session_state.worklog = df
-
 # --- METRICS & CHART ---
-total_earned = df["Earned"].sum()
-total_toearn = df["To Earn"].sum()
-total = total_earned + total_toearn
+total_earned = totals.earned
+total_toearn = totals.to_earn
+total = totals.overall
 
 st.header("Financial Overview")
 col1, col2, col3 = st.columns(3)
 col1.metric("Total Earned", f"£{total_earned:.2f}")
 col2.metric("Total To Earn", f"£{total_toearn:.2f}")
 col3.metric("Overall", f"£{total:.2f}")
+st.caption(f"{totals.workdays.count()} workdays in this period ({totals.expected_hours} hours expected), "
+           f"{totals.workdays.count(today, period.end)} of them from today on.")
 
-fig = px.pie(
-    names=["Earned", "To Earn"], values=[total_earned, total_toearn],
-    hole=0.5, color=["Earned", "To Earn"],
-    color_discrete_map={"Earned": "green", "To Earn": "gold"}
-)
-fig.update_traces(textinfo="label+percent", textfont_size=14)
+fig = earnings_pie(round(total_earned, 2), round(total_toearn, 2))
 st.plotly_chart(fig, use_container_width=True)
+profiling.lap("metrics & pie")
+
+st.subheader("Cumulative Earnings")
+chart_col1, chart_col2 = st.columns(2)
+chart_scope = chart_col1.radio("Show", ["This period", "All periods"], horizontal=True, key="chart_scope_widget")
+chart_freq = chart_col2.radio("Per", ["Day", "Week"], horizontal=True, key="chart_freq_widget")
+if chart_scope == "This period":
+    history_fig = cumulative_chart(worklog.cache_key, df, chart_freq[0])
+else:
+    CACHE.flush()  # The other periods are read from disk, after any queued changes reach it
+    history_fig = cumulative_chart(history_version(worker), lambda: load_history(worker), chart_freq[0])
+st.plotly_chart(history_fig, use_container_width=True)
+profiling.lap("cumulative chart")
+
+st.subheader("Reports")
+report_level = st.radio("Totals per", ["Week", "Month", "Period"], horizontal=True, key="report_level_widget")
+# Read from the small per-period summaries, never from the raw days of older periods
+report = rollup(worker, report_level.lower())
+st.dataframe(report.drop(columns="Worker"), hide_index=True, use_container_width=True,
+             column_config={"Utilization": st.column_config.ProgressColumn(min_value=0.0, max_value=1.0)})
+profiling.lap("reports")
 
 st.divider()
 
 # --- DETAILED LOG & EDITING CONTROLS ---
 st.header("Detailed Work Log")
+if worklog.read_only:
+    st.info("This period is archived: its hours can no longer be changed.")
 
 col1, col2 = st.columns(2)
 with col1:
     st.subheader("Log a Missed Day")
     # Create the container HERE
     message_container1 = st.container()
-    missed_date = st.date_input("Select a date", min_value=df["Date"].min(), max_value=df["Date"].max(), key="missed_date_widget")
+    missed_date = st.date_input("Select a date", min_value=date_index.start, max_value=date_index.end, key="missed_date_widget")
     
-    if st.button("Log Missed Day", use_container_width=True):
-        idx = df.index[df["Date"] == missed_date][0]
-        day_name = df.loc[idx, "Day"]
-        if day_name in non_working_days:
+    if st.button("Log Missed Day", use_container_width=True, disabled=worklog.read_only):
+        result = log_day(worklog, missed_date, 4)
+        if result.status == NON_WORKING:
             # Write the message to the container
             message_container1.warning(f"{missed_date} was a non-working day.")
-        elif df.loc[idx, "Hours Worked"] > 0:
+        elif result.status == ALREADY_LOGGED:
             # Write the message to the container
             message_container1.info(f"{missed_date} already has hours logged.")
         else:
-            df.loc[idx, "Hours Worked"] = 4
-            df.loc[idx, "Earned"] = df.loc[idx, "Hours Worked"] * df.loc[idx, "Hourly Rate"]
-            save_data(df)
             # Write the message to the container
             message_container1.success(f"Logged 4 hours for {missed_date}")
             st.rerun()
@@ -120,14 +166,10 @@ with col2:
     st.subheader("Remove a Log")
     # Create the second container HERE
     message_container2 = st.container()
-    date_to_remove = st.date_input("Select a date", min_value=df["Date"].min(), max_value=df["Date"].max(), key="remove_date_widget")
-
-    if st.button("Remove Log", use_container_width=True):
-        idx = df.index[df["Date"] == date_to_remove][0]
-        if df.loc[idx, "Hours Worked"] > 0:
-            df.loc[idx, "Hours Worked"] = 0.0
-            df.loc[idx, "Earned"] = 0.0
-            save_data(df)
+    date_to_remove = st.date_input("Select a date", min_value=date_index.start, max_value=date_index.end, key="remove_date_widget")
+
+    if st.button("Remove Log", use_container_width=True, disabled=worklog.read_only):
+        if remove_day(worklog, date_to_remove).status == REMOVED:
             # Write the message to the container
             message_container2.success(f"Log for {date_to_remove} has been removed.")
             st.rerun()
@@ -135,4 +177,95 @@ with col2:
             # Write the message to the container
             message_container2.info(f"No hours were logged for {date_to_remove}.")
 
-st.dataframe(df)
\ No newline at end of file
+with st.expander("Backfill a Date Range"):
+    backfill_from = st.date_input("From", value=date_index.start, min_value=date_index.start, max_value=date_index.end, key="backfill_from_widget")
+    backfill_to = st.date_input("To", value=today if date_index.start <= today <= date_index.end else date_index.end,
+                                min_value=date_index.start, max_value=date_index.end, key="backfill_to_widget")
+    if st.button("Log Range", use_container_width=True, disabled=worklog.read_only):
+        result = worklog.log_days(date_range(backfill_from, backfill_to), 4)
+        st.success(f"Logged 4 hours on {len(result.logged)} days "
+                   f"({len(result.already_logged)} already logged, {len(result.non_working)} non-working).")
+        st.rerun()
+
+profiling.lap("editing controls")
+
+# Only the visible page is sent to the browser; other workers' logs for the same dates can be included
+table_workers = st.multiselect("Workers", list_workers() or [worker], default=[worker], key="table_workers_widget")
+table_periods = [(w, p) for w, p in ((w, find_period(w, period.start)) for w in table_workers) if p is not None]
+table_logs = [(w, open_worklog(p.path, calendar=load_calendar(w))) for w, p in table_periods]
+
+
+def table_data():
+    return pd.concat([log.df.assign(Worker=w) for w, log in table_logs], ignore_index=True)
+
+
+if table_logs:
+    # Pages are cached per copy contents; a log that is about to be reloaded isn't cached
+    table_key = tuple(log.cache_key for _, log in table_logs)
+    paged_table(None if None in table_key else table_key,
+                table_data, date_index.start, date_index.end)
+else:
+    st.info("None of the selected workers have a period covering these dates.")
+profiling.lap("table")
+
+with st.expander("Export / Import"):
+    export_col, import_col = st.columns(2)
+    with export_col:
+        export_workers = st.multiselect("Workers", list_workers() or [worker], default=[worker], key="export_workers_widget")
+        export_from = st.date_input("From", value=periods[0].start, key="export_from_widget")
+        export_to = st.date_input("To", value=periods[-1].end, key="export_to_widget")
+        export_format = st.selectbox("Format", list(MIME_TYPES), key="export_format_widget")
+        if st.button("Prepare Export", use_container_width=True):
+            # Written chunk by chunk; only the finished file is kept for the download button
+            CACHE.flush()
+            buffer = io.BytesIO()
+            rows = export(buffer, export_workers, export_from, export_to, fmt=export_format)
+            st.session_state["export_download"] = (f"worklog_{export_from}_{export_to}.{export_format}",
+                                                   buffer.getvalue(), MIME_TYPES[export_format], rows)
+        if "export_download" in st.session_state:
+            name, data, mime, rows = st.session_state["export_download"]
+            st.download_button(f"Download {name} ({rows} rows)", data, file_name=name, mime=mime,
+                               use_container_width=True)
+    with import_col:
+        upload = st.file_uploader("Worklog export", type=["csv", "jsonl", "ndjson", "parquet"], key="import_file_widget")
+        if upload is not None and st.button("Import", use_container_width=True):
+            CACHE.flush()
+            try:
+                result = import_file(upload)
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                st.success(f"Read {result.rows} rows: {result.upserted} changed, "
+                           f"{result.periods_created} periods created.")
+                for reason, rows in result.rejected.items():
+                    st.warning(f"Skipped {rows} rows: {reason}.")
+profiling.lap("export / import")
+
+with st.expander("History"):
+    # Every saved change to this period, newest first; Remove Log keeps the hours it cleared here
+    history_day = st.date_input("Day", value=None, min_value=date_index.start, max_value=date_index.end,
+                                key="history_day_widget")
+    # The trail is only read while this is on, not on every rerun
+    if st.toggle("Show changes", key="history_show_widget"):
+        CACHE.flush()
+        changes = trail(DATA_PATH, history_day)
+        if changes.empty:
+            st.caption("No changes recorded yet.")
+        else:
+            st.dataframe(changes.iloc[::-1], hide_index=True)
+    as_of_col1, as_of_col2 = st.columns(2)
+    as_of_date = as_of_col1.date_input("As of", value=today, key="as_of_date_widget")
+    as_of_time = as_of_col2.time_input("Time", value=datetime.time(23, 59), key="as_of_time_widget")
+    if st.button("Show Worklog As Of", use_container_width=True):
+        CACHE.flush()
+        try:
+            past = as_of(DATA_PATH, datetime.datetime.combine(as_of_date, as_of_time), work_calendar)
+        except ValueError as e:
+            st.info(str(e))
+        else:
+            st.caption(f"Earned £{past['Earned'].sum():.2f}, to earn £{past['To Earn'].sum():.2f} "
+                       f"as of {as_of_date} {as_of_time:%H:%M}.")
+            st.dataframe(past, hide_index=True)
+profiling.lap("history")
+
+debug_panel()
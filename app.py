@@ -1,93 +1,62 @@
 import streamlit as st
-import pandas as pd
 import datetime
-import plotly.express as px
+
+from worklog.charts import earnings_pie
+from worklog.core import ALREADY_LOGGED, MISSING, NON_WORKING, MemoryWorklog, log_day
+from worklog.storage import default_frame
+from worklog.views import paged_table
+from worklog.workdays import load_calendar
 
 # --- Settings ---
 hourly_rate = 12.48
-non_working_days = ["Sunday", "Wednesday"]
+work_calendar = load_calendar()  # weekly days off and holidays, from worklogs/calendar.json
 
 # --- Initialize session state ---
 if "worklog" not in st.session_state:
     start_date = datetime.date(2025, 9, 14)
     end_date = datetime.date(2025, 10, 11)
-    dates = pd.date_range(start_date, end_date)
-
-    st.session_state.worklog = pd.DataFrame({
-        "Date": dates,
-        "Day": dates.day_name(),
-        "Hours Worked": [0]*len(dates),
-        "Hourly Rate": [hourly_rate]*len(dates),
-        "Earned": [0]*len(dates),
-        "To Earn": [0]*len(dates)
-    })
+    # Kept in this session only; nothing is written to disk
+    st.session_state.worklog = MemoryWorklog(default_frame(start_date, end_date, hourly_rate), work_calendar)
 
-df = st.session_state.worklog
+worklog = st.session_state.worklog
+df = worklog.df
+date_index = worklog.index
+totals = worklog.totals
 
 # --- Button to log today ---
 today = datetime.date.today()
 if st.button("Log Today"):
-    df["Date"] = pd.to_datetime(df["Date"]).dt.date
-    if today in df["Date"].values:
-        idx = df.index[df["Date"] == today][0]
-        day_name = df.loc[idx, "Day"]
-
-        if day_name in non_working_days:
-            df.loc[idx, "Hours Worked"] = 0
-            df.loc[idx, "Earned"] = 0
-            st.warning(f"⛔ No work logged today ({day_name})")
-        else:
-            df.loc[idx, "Hours Worked"] = 4
-            df.loc[idx, "Earned"] = df.loc[idx, "Hours Worked"] * df.loc[idx, "Hourly Rate"]
-            st.success(f"✅ Logged 4 hours for {day_name} ({today})")
-    else:
+    result = log_day(worklog, today, 4, overwrite=True)
+    if result.status == MISSING:
         st.error(f"⚠️ Today's date ({today}) is not in your worklog table!")
+    elif result.status == NON_WORKING:
+        st.warning(f"⛔ No work logged today ({result.day})")
+    else:
+        st.success(f"✅ Logged 4 hours for {result.day} ({today})")
 
 # --- Log missed day ---
-missed_date = st.date_input("Pick a missed date to log", min_value=df["Date"].min(), max_value=df["Date"].max())
+missed_date = st.date_input("Pick a missed date to log", min_value=date_index.start, max_value=date_index.end)
 if st.button("Log Missed Day"):
-    df["Date"] = pd.to_datetime(df["Date"]).dt.date
-    if missed_date in df["Date"].values:
-        idx = df.index[df["Date"] == missed_date][0]
-        day_name = df.loc[idx, "Day"]
-
-        if day_name in non_working_days:
-            st.warning(f"⛔ {missed_date} was a non-working day ({day_name})")
-        elif df.loc[idx, "Hours Worked"] > 0:
-            st.info(f"ℹ️ {missed_date} already logged ({df.loc[idx, 'Hours Worked']} hrs)")
-        else:
-            df.loc[idx, "Hours Worked"] = 4
-            df.loc[idx, "Earned"] = df.loc[idx, "Hours Worked"] * df.loc[idx, "Hourly Rate"]
-            st.success(f"✅ Logged 4 hours for {day_name} ({missed_date})")
-    else:
+    result = log_day(worklog, missed_date, 4)
+    if result.status == MISSING:
         st.error(f"⚠️ {missed_date} is not in your worklog table!")
-
-st.session_state.worklog = df
-
-# --- Calculate "To Earn" ---
-# --- Calculate "To Earn" ---
-df["To Earn"] = 0  # default
-workdays_mask = ~df["Day"].isin(non_working_days)
-df.loc[workdays_mask, "To Earn"] = (4 * df.loc[workdays_mask, "Hourly Rate"]) - df.loc[workdays_mask, "Earned"]
-
+    elif result.status == NON_WORKING:
+        st.warning(f"⛔ {missed_date} was a non-working day ({result.day})")
+    elif result.status == ALREADY_LOGGED:
+        st.info(f"ℹ️ {missed_date} already logged ({result.hours} hrs)")
+    else:
+        st.success(f"✅ Logged 4 hours for {result.day} ({missed_date})")
 
 # --- Totals ---
-total_earned = df["Earned"].sum()
-total_toearn = df["To Earn"].sum()
-total = total_earned + total_toearn
+total_earned = totals.earned
+total_toearn = totals.to_earn
+total = totals.overall
 
 st.subheader("Work Log")
-st.dataframe(df)
+paged_table(None, df, date_index.start, date_index.end)
 
 # --- Chart ---
-fig = px.pie(
-    names=["Earned", "To Earn"],
-    values=[total_earned, total_toearn],
-    hole=0.5,
-    color=["Earned", "To Earn"],
-    color_discrete_map={"Earned":"green", "To Earn":"gold"}
-)
-fig.update_traces(textinfo="label+percent", textfont_size=14)
+fig = earnings_pie(round(total_earned, 2), round(total_toearn, 2))
 st.plotly_chart(fig, use_container_width=True)
 
 # --- Totals display ---
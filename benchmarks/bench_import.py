@@ -0,0 +1,79 @@
+"""
+Start-up cost of the worklog entry points: wall time of a fresh interpreter
+importing each target, and which heavy libraries each one pulls in.
+
+    python benchmarks/bench_import.py              # 5 runs per target, best and median
+    python benchmarks/bench_import.py --runs 20
+
+``worklog`` and ``worklog.cli`` must stay free of pandas, streamlit and
+plotly; the script exits with status 1 if either of them imports one.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ["numpy", "pandas", "plotly", "streamlit"]
+TARGETS = [
+    ("python (baseline)", "pass"),
+    ("import worklog", "import worklog"),
+    ("import worklog.cli", "import worklog.cli"),
+    ("python -m worklog --help", "import worklog.cli, contextlib, io\n"
+                                 "with contextlib.redirect_stdout(io.StringIO()):\n"
+                                 "    try: worklog.cli.main(['--help'])\n"
+                                 "    except SystemExit: pass"),
+    ("import worklog.core", "import worklog.core"),
+    ("import pandas", "import pandas"),
+    ("import plotly.express", "import plotly.express"),
+    ("import streamlit", "import streamlit"),
+]
+HEADLESS = {"import worklog", "import worklog.cli", "python -m worklog --help"}
+
+# Runs inside the child interpreter; prints elapsed seconds and the heavy modules loaded
+_CHILD = """
+import json, sys, time
+began = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - began
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(code):
+    """One cold run: (seconds, heavy modules loaded), or None if the import fails."""
+    child = subprocess.run([sys.executable, "-c", _CHILD.format(code=code, heavy=HEAVY)],
+                           cwd=ROOT, capture_output=True, text=True)
+    if child.returncode != 0:
+        return None
+    return json.loads(child.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'target':<28} {'best ms':>9} {'median ms':>10}  heavy modules loaded")
+    for label, code in TARGETS:
+        runs = [measure(code) for _ in range(args.runs)]
+        if runs[0] is None:
+            print(f"{label:<28} {'-':>9} {'-':>10}  (not installed)")
+            continue
+        times = [r["seconds"] * 1000 for r in runs]
+        loaded = runs[0]["loaded"]
+        print(f"{label:<28} {min(times):>9.1f} {statistics.median(times):>10.1f}  {', '.join(loaded) or '-'}")
+        if label in HEADLESS and set(loaded) & {"pandas", "plotly", "streamlit"}:
+            failed = True
+    if failed:
+        print("FAIL: a headless entry point imports pandas, plotly or streamlit")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
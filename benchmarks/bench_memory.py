@@ -0,0 +1,39 @@
+"""
+Bytes per row of the worklog in memory: the original object/string frame,
+the frame as load_data now returns it (categorical Day), and CompactWorklog.
+
+Run from the repository root:
+
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --rows 10000 1000000 10000000
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import single_worklog  # noqa: E402
+from worklog.compact_history import CompactWorklog  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'original B/row':>15} {'categorical B/row':>18} {'compact B/row':>14} {'saving':>8}")
+    for rows in args.rows:
+        df = single_worklog(rows)
+        df["Day"] = df["Day"].astype(object)
+        original = df.memory_usage(deep=True, index=False).sum() / rows
+        df["Day"] = df["Day"].astype("category")
+        categorical = df.memory_usage(deep=True, index=False).sum() / rows
+        compact = CompactWorklog.from_frame(df, worker="bench").nbytes / rows
+        print(f"{rows:>10} {original:>15.1f} {categorical:>18.1f} {compact:>14.1f} {original / compact:>7.0f}x")
+        del df
+
+
+if __name__ == "__main__":
+    main()
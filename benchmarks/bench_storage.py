@@ -0,0 +1,74 @@
+"""
+Cold load time and peak RSS of load_data for each snapshot backend.
+
+Every measurement runs in a fresh interpreter so that the numbers include
+parsing from disk and nothing is shared between runs. Run from the
+repository root:
+
+    python benchmarks/bench_storage.py                 # 10k, 1M and 10M rows
+    python benchmarks/bench_storage.py --rows 10000    # a quick check
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from synthetic import single_worklog  # noqa: E402
+from worklog.backends import get_backend  # noqa: E402
+
+FORMATS = [".csv", ".parquet", ".feather"]
+
+# Runs inside the child interpreter; prints elapsed seconds and peak RSS in KiB
+# (ru_maxrss would inherit the parent's high-water mark across fork, so VmHWM is preferred)
+_CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+from worklog.storage import load_data
+columns = {columns!r}
+began = time.perf_counter()
+df = load_data({path!r}, columns=columns)
+elapsed = time.perf_counter() - began
+try:
+    with open("/proc/self/status") as f:
+        rss = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+except OSError:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"seconds": elapsed, "rss_kib": rss}}))
+"""
+
+
+def measure(path, columns=None):
+    code = _CHILD.format(root=ROOT, path=path, columns=columns)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'format':>9} {'columns':>12} {'load (s)':>9} {'peak RSS (MiB)':>15} {'file (MiB)':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.rows:
+            df = single_worklog(rows)
+            for extension in FORMATS:
+                path = os.path.join(directory, f"worklog_{rows}{extension}")
+                get_backend(path).write(df, path)
+                size = os.path.getsize(path) / 2**20
+                for columns in (None, ["Date", "Earned"]):
+                    result = measure(path, columns)
+                    label = "all" if columns is None else "Date,Earned"
+                    print(f"{rows:>10} {extension:>9} {label:>12} {result['seconds']:>9.3f} "
+                          f"{result['rss_kib'] / 1024:>15.1f} {size:>11.1f}")
+            del df
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Per-write cost of the WAL (log_change) against a full-CSV rewrite (save_data).
+
+Run from the repository root:
+
+    python benchmarks/bench_wal.py
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from worklog import storage  # noqa: E402
+
+SIZES = [1_000, 10_000, 100_000]
+WRITES = 200
+
+
+def bench(rows, directory):
+    path = os.path.join(directory, f"worklog_{rows}.csv")
+    start = datetime.date(2000, 1, 1)
+    df = storage.default_frame(start, start + datetime.timedelta(days=rows - 1))
+    storage.save_data(df, path)
+
+    began = time.perf_counter()
+    for i in range(WRITES):
+        storage.log_change(start + datetime.timedelta(days=i % rows), 4.0, 49.92, path)
+    wal = (time.perf_counter() - began) / WRITES
+
+    # A full rewrite per click is what save_data used to cost; a few samples are enough
+    samples = 3
+    began = time.perf_counter()
+    for _ in range(samples):
+        storage.save_data(df, path)
+    full = (time.perf_counter() - began) / samples
+    return wal, full
+
+
+def main():
+    print(f"{'rows':>10} {'log_change (ms)':>16} {'save_data (ms)':>16}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in SIZES:
+            wal, full = bench(rows, directory)
+            print(f"{rows:>10} {wal * 1000:>16.3f} {full * 1000:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
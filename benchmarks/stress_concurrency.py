@@ -0,0 +1,87 @@
+"""
+Multi-process stress check for concurrent worklog writes.
+
+Several processes fire thousands of log/remove operations at one worklog
+while the WAL is kept tiny so that background compactions run constantly.
+Each process owns its own set of dates and remembers the last value it wrote
+for each of them; at the end the reloaded worklog must match every one.
+
+Run from the repository root (exits non-zero if any write was lost):
+
+    python benchmarks/stress_concurrency.py
+    python benchmarks/stress_concurrency.py --processes 16 --ops 2000
+"""
+
+import argparse
+import datetime
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from worklog import storage  # noqa: E402
+
+START = datetime.date(2020, 1, 1)
+RATE = 12.48
+
+
+def hammer(args):
+    path, worker, processes, ops, days = args
+    storage.COMPACT_BYTES = 2048  # Force compactions while everyone is writing
+    rng = random.Random(worker)
+    mine = [START + datetime.timedelta(days=d) for d in range(worker, days, processes)]
+    expected = {}
+    for _ in range(ops):
+        date = rng.choice(mine)
+        hours = rng.choice([0.0, 4.0])  # log or remove
+        storage.log_change(date, hours, hours * RATE, path)
+        expected[date] = hours
+        if rng.random() < 0.01:
+            storage.load_data(path)  # Readers in the mix
+    # Let a compaction this process started finish before it exits
+    while storage._compacting:
+        time.sleep(0.01)
+    return expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=1000, help="operations per process")
+    parser.add_argument("--days", type=int, default=730, help="rows in the worklog")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "worklog.csv")
+        df = storage.default_frame(START, START + datetime.timedelta(days=args.days - 1), RATE)
+        storage.save_data(df, path)
+
+        began = time.perf_counter()
+        jobs = [(path, w, args.processes, args.ops, args.days) for w in range(args.processes)]
+        with multiprocessing.Pool(args.processes) as pool:
+            results = pool.map(hammer, jobs)
+        elapsed = time.perf_counter() - began
+
+        storage.compact(path)
+        df = storage.load_data(path).set_index("Date")
+        lost = [(date, hours, df.at[date, "Hours Worked"])
+                for expected in results for date, hours in expected.items()
+                if df.at[date, "Hours Worked"] != hours or df.at[date, "Earned"] != hours * RATE]
+
+    total = args.processes * args.ops
+    print(f"{total} operations from {args.processes} processes in {elapsed:.2f}s "
+          f"({total / elapsed:.0f} ops/s)")
+    if lost:
+        for date, want, got in lost[:20]:
+            print(f"LOST {date}: expected {want} hours, found {got}")
+        print(f"{len(lost)} dates lost their last write")
+        sys.exit(1)
+    print(f"OK: all {sum(len(r) for r in results)} touched dates hold their last write")
+
+
+if __name__ == "__main__":
+    main()
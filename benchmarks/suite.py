@@ -0,0 +1,198 @@
+"""
+Benchmark suite for the worklog hot paths, with machine-readable results.
+
+For each size a synthetic worklog is spread over ``--workers`` workers and
+these cases are timed:
+
+    save_data[.csv|.parquet]   write the whole frame as one snapshot
+    cold_load[.csv|.parquet]   load_data in a fresh interpreter
+    totals                     Totals.from_frame over every row (To Earn recalculation)
+    table_select               filter + sort for one page of the Detailed Work Log
+    table_serialize[json|arrow] encode that page the way it is sent to the browser
+    log_row / remove_row       one button press on a worker's partition (lookup + WAL write)
+    log_row_memory             the same lookup and totals update without the write
+    bulk_log                   log every day of a worker's partition in one call
+
+Run from the repository root:
+
+    python benchmarks/suite.py                                  # 1k, 100k and 1M rows
+    python benchmarks/suite.py --rows 1000 10000000 --workers 1000 --json HEAD.json
+    python benchmarks/suite.py --compare base.json HEAD.json    # exit 1 on a regression
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_storage import measure  # noqa: E402
+from synthetic import synthetic_worklog, worker_names, worker_partition  # noqa: E402
+from worklog.cache import CachedWorklog  # noqa: E402
+from worklog.core import MemoryWorklog, log_day, remove_day  # noqa: E402
+from worklog.storage import save_data  # noqa: E402
+from worklog.table import Query, get_page, select  # noqa: E402
+from worklog.totals import Totals  # noqa: E402
+from worklog.workdays import WorkCalendar  # noqa: E402
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+FORMATS = [".csv", ".parquet"] if pyarrow else [".csv"]
+ROW_OPS = 200
+
+
+def timed(fn, repeat):
+    """Wall time of ``repeat`` calls of ``fn``, in seconds."""
+    times = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - began)
+    return times
+
+
+def timed_each(fn, items):
+    """Wall time of ``fn(item)`` for each item, in seconds."""
+    times = []
+    for item in items:
+        began = time.perf_counter()
+        fn(item)
+        times.append(time.perf_counter() - began)
+    return times
+
+
+def _wait_for_compaction():
+    for thread in threading.enumerate():
+        if thread.name.startswith("compact-"):
+            thread.join()
+
+
+def run_size(rows, workers, repeat, directory):
+    """Runs every case on one synthetic worklog; returns a list of result records."""
+    calendar = WorkCalendar()
+    df = synthetic_worklog(rows, workers, calendar)
+    results = []
+    heavy_repeat = max(1, min(repeat, 3))
+
+    def record(case, times, rows_touched=rows):
+        results.append({"case": case, "rows": rows, "workers": workers, "rows_touched": rows_touched,
+                        "best": min(times), "median": statistics.median(times), "runs": len(times)})
+
+    for extension in FORMATS:
+        path = os.path.join(directory, f"all_{rows}{extension}")
+        record(f"save_data[{extension}]", timed(lambda: save_data(df, path), heavy_repeat))
+        record(f"cold_load[{extension}]", [measure(path)["seconds"] for _ in range(heavy_repeat)])
+
+    record("totals", timed(lambda: Totals.from_frame(df, calendar), repeat))
+
+    last = worker_names(workers)[-1] if workers > 1 else None
+    query = Query(status="Logged", workers=[last] if last else None, sort_by="Earned", ascending=False)
+    record("table_select", timed(lambda: select(df, query), repeat))
+    page = get_page(None, df, query)
+    record("table_serialize[json]", timed(lambda: page.rows.to_json(orient="split", date_format="iso"), repeat),
+           len(page.rows))
+    if pyarrow:
+        record("table_serialize[arrow]",
+               timed(lambda: pyarrow.Table.from_pandas(page.rows, preserve_index=False), repeat), len(page.rows))
+
+    # One worker's partition, as the apps see it
+    part = worker_partition(df, worker_names(workers)[0])
+    part_path = os.path.join(directory, f"part_{rows}.csv")
+    save_data(part, part_path)
+    dates = part["Date"].to_numpy()
+    workdays = dates[calendar.mask(dates)]
+    picks = np.random.default_rng(1).choice(workdays, size=min(ROW_OPS, len(workdays)), replace=False)
+
+    worklog = CachedWorklog(part_path, calendar)
+    record("log_row", timed_each(lambda d: log_day(worklog, d, 4, overwrite=True), picks), 1)
+    record("remove_row", timed_each(lambda d: remove_day(worklog, d), picks), 1)
+    memory = MemoryWorklog(part.copy(), calendar)
+    record("log_row_memory", timed_each(lambda d: log_day(memory, d, 4, overwrite=True), picks), 1)
+    record("bulk_log", timed(lambda: worklog.log_days(list(dates), 4, overwrite=True), repeat), len(part))
+    _wait_for_compaction()
+    return results
+
+
+def _meta():
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "when": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "pyarrow": pyarrow.__version__ if pyarrow else None,
+        "machine": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(base_file, head_file, threshold):
+    """Prints head/base median ratios; returns True if any case got slower than ``threshold``."""
+    with open(base_file) as f:
+        base = {(r["case"], r["rows"], r["workers"]): r for r in json.load(f)["results"]}
+    with open(head_file) as f:
+        head = json.load(f)["results"]
+    regressed = False
+    print(f"{'case':<24} {'rows':>10} {'base ms':>10} {'head ms':>10} {'ratio':>7}")
+    for result in head:
+        before = base.get((result["case"], result["rows"], result["workers"]))
+        if before is None:
+            continue
+        ratio = result["median"] / before["median"] if before["median"] else float("inf")
+        flag = "  SLOWER" if ratio > threshold else ""
+        regressed |= bool(flag)
+        print(f"{result['case']:<24} {result['rows']:>10} {before['median'] * 1000:>10.3f} "
+              f"{result['median'] * 1000:>10.3f} {ratio:>6.2f}x{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--workers", type=int, default=100, help="workers the rows are spread over")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case (cold load and saves use at most 3)")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="compare two result files")
+    parser.add_argument("--threshold", type=float, default=1.25, help="ratio counted as a regression")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+
+    results = []
+    print(f"{'case':<24} {'rows':>10} {'workers':>8} {'best ms':>10} {'median ms':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.rows:
+            for result in run_size(rows, min(args.workers, rows), args.repeat, directory):
+                results.append(result)
+                print(f"{result['case']:<24} {result['rows']:>10} {result['workers']:>8} "
+                      f"{result['best'] * 1000:>10.3f} {result['median'] * 1000:>10.3f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"meta": _meta(), "results": results}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Synthetic worklogs for the benchmarks, from a thousand to tens of millions of rows.
+
+Rows are split evenly over ``workers``; each worker gets one contiguous run
+of days (so its partition has the same shape as a real one) with a few
+distinct hourly rates, about 60% of workdays logged and nothing logged on
+non-working days. The output is deterministic for a given seed.
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from worklog.totals import Totals
+from worklog.workdays import WorkCalendar
+
+START = datetime.date(1990, 1, 1)
+_MAX_DAYS = (datetime.date(9999, 12, 31) - START).days
+
+
+def worker_names(workers):
+    return [f"w{i:05d}" for i in range(workers)]
+
+
+def synthetic_worklog(rows, workers=1, calendar=None, seed=0, start=START):
+    """A worklog frame of ``rows`` rows, with a categorical Worker column when workers > 1."""
+    calendar = WorkCalendar() if calendar is None else calendar
+    per_worker = -(-rows // workers)
+    if per_worker > _MAX_DAYS:
+        raise ValueError(f"{per_worker} days per worker run past year 9999; use more workers")
+    positions = np.arange(rows)
+    codes = positions // per_worker
+    dates = pd.DatetimeIndex(np.datetime64(start, "D") + (positions % per_worker).astype("timedelta64[D]"))
+    rate = 12.48 + 0.5 * (codes % 4)
+    logged = np.random.default_rng(seed).random(rows) < 0.6
+    hours = np.where(logged & calendar.mask(dates.values), 4.0, 0.0)
+    df = pd.DataFrame({
+        "Date": dates.date,
+        "Day": pd.Categorical(dates.day_name()),
+        "Hours Worked": hours,
+        "Hourly Rate": rate,
+        "Earned": hours * rate,
+        "To Earn": 0.0,
+    })
+    Totals.from_frame(df, calendar)
+    if workers > 1:
+        df["Worker"] = pd.Categorical.from_codes(codes, worker_names(workers))
+    return df
+
+
+def single_worklog(rows, calendar=None, seed=0):
+    """A ``rows``-row frame for one worklog file, with no Worker column.
+
+    Beyond the days left before year 9999 the rows are laid out as several
+    workers' runs, so dates repeat.
+    """
+    workers = -(-rows // _MAX_DAYS)
+    return synthetic_worklog(rows, workers, calendar, seed).drop(columns="Worker", errors="ignore")
+
+
+def worker_partition(df, worker):
+    """One worker's rows of a multi-worker frame, as a single-worker worklog."""
+    if "Worker" not in df.columns:
+        return df.copy()
+    return df[df["Worker"] == worker].drop(columns="Worker").reset_index(drop=True)
@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Every test runs in its own directory with the default, relative file names
+for name in ("WORKLOG_FILE", "WORKLOG_DIR", "WORKLOG_CALENDAR", "WORKLOG_PROFILE", "TRADE_JOURNAL"):
+    os.environ.pop(name, None)
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,128 @@
+import datetime
+import os
+import subprocess
+import sys
+import time
+
+import pandas as pd
+import pytest
+
+from worklog import audit, periods, storage
+from worklog.cache import CachedWorklog
+from worklog.core import log_day, remove_day
+from worklog.workdays import load_calendar
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DAY = datetime.date(2025, 9, 15)  # A Monday
+
+
+def new_worklog(path="worklog.csv"):
+    storage.save_data(storage.default_frame(), path, action="create")
+    return path
+
+
+def hours(df, date=DAY):
+    return float(df.loc[df["Date"] == date, "Hours Worked"].item())
+
+
+def test_log_and_remove_keep_old_values():
+    path = new_worklog()
+    audit.set_actor("alice")
+    worklog = CachedWorklog(path, load_calendar())
+    log_day(worklog, DAY, 4.0)
+    remove_day(worklog, DAY)
+
+    events = audit.trail(path, DAY)
+    assert list(events["Action"]) == ["log", "remove"]
+    assert list(events["Who"]) == ["alice", "alice"]
+    assert list(events["Old Hours"]) == [0.0, 4.0]
+    assert list(events["New Hours"]) == [4.0, 0.0]
+    assert events["Old Earned"].iloc[1] == 4.0 * storage.HOURLY_RATE
+
+
+def test_as_of_across_checkpoints(monkeypatch):
+    monkeypatch.setattr(audit, "CHECKPOINT_BYTES", 1000)
+    path = new_worklog()
+    states = []
+    for i in range(60):
+        value = float(i % 5)
+        storage.log_change(DAY + datetime.timedelta(days=i % 3), value, value * storage.HOURLY_RATE, path)
+        states.append((time.time(), storage.load_data(path)["Hours Worked"].to_numpy()))
+        time.sleep(0.002)
+
+    assert len(audit._checkpoints(path)) > 3
+    for when, expected in states:
+        assert (audit.as_of(path, when)["Hours Worked"].to_numpy() == expected).all()
+    assert not [name for name in os.listdir(audit.checkpoint_dir(path)) if not audit._CHECKPOINT_NAME.match(name)]
+
+
+def test_checkpoints_are_listed_once_per_file(monkeypatch):
+    monkeypatch.setattr(audit, "CHECKPOINT_BYTES", 1000)
+    path = new_worklog()
+    listed = []
+    checkpoints = audit._checkpoints
+    monkeypatch.setattr(audit, "_checkpoints", lambda p: listed.append(p) or checkpoints(p))
+    for i in range(30):
+        storage.log_change(DAY, float(i % 5), i % 5 * storage.HOURLY_RATE, path)
+    assert listed == []  # Known from the save that created the file
+
+    audit._newest.clear()  # As in a new process
+    storage.log_change(DAY, 1.0, storage.HOURLY_RATE, path)
+    storage.log_change(DAY, 2.0, 2.0 * storage.HOURLY_RATE, path)
+    assert listed == [path]
+    assert len(checkpoints(path)) > 2
+    assert hours(audit.as_of(path, time.time())) == 2.0
+
+
+def test_as_of_applies_events_written_late():
+    path = new_worklog()
+    stamped = audit.events([(DAY, 4.0, 4.0 * storage.HOURLY_RATE)])  # Made now, written later
+    time.sleep(0.01)
+    other = DAY + datetime.timedelta(days=1)
+    storage.log_change(other, 2.0, 2.0 * storage.HOURLY_RATE, path)
+    storage.log_changes([(DAY, 4.0, 4.0 * storage.HOURLY_RATE)], path, events=stamped)
+
+    df = audit.as_of(path, stamped[0]["at"])
+    assert hours(df) == 4.0
+    assert hours(df, other) == 0.0
+
+
+def test_as_of_before_the_trail_starts():
+    path = new_worklog()
+    with pytest.raises(ValueError):
+        audit.as_of(path, datetime.datetime(2000, 1, 1))
+
+
+def test_trail_starts_with_a_baseline_for_existing_files():
+    path = "old.csv"
+    storage.default_frame().to_csv(path, index=False)  # Written before auditing existed
+    storage.log_change(DAY, 4.0, 4.0 * storage.HOURLY_RATE, path)
+    assert hours(audit.as_of(path, 1.0)) == 0.0
+    assert hours(audit.as_of(path, time.time())) == 4.0
+
+
+def test_scripts_that_never_import_audit_are_audited():
+    def run(*args):
+        subprocess.run([sys.executable, *args], check=True, env=dict(os.environ, PYTHONPATH=ROOT), timeout=60)
+
+    run("-c", "import datetime\n"
+              "from worklog import periods, storage\n"
+              "period = periods.create_period('alice', datetime.date(2025, 9, 14), datetime.date(2025, 10, 11))\n"
+              "storage.log_change(datetime.date(2025, 9, 15), 4.0, 4.0 * storage.HOURLY_RATE, period.path)\n")
+    run("-m", "worklog.rates", "set", "alice", "2025-09-14", "20")
+    run("-m", "worklog.rates", "reprice", "alice")
+
+    [period] = periods.list_periods("alice")
+    assert list(audit.trail(period.path)["Action"]) == ["create", "log", "reprice"]
+    df = storage.load_data(period.path)
+    assert df["Earned"].sum() == 80.0
+    pd.testing.assert_frame_equal(audit.as_of(period.path, time.time()), df, check_categorical=False)
+
+    run("-c", "import datetime\n"
+              "from worklog import periods\n"
+              "periods.archive_closed('alice', today=datetime.date(2025, 11, 20))\n")
+    [archived] = periods.list_periods("alice")
+    assert periods.is_archived(archived.path)
+    assert not os.path.exists(audit.audit_path(period.path))
+    assert not os.path.exists(audit.checkpoint_dir(period.path))
+    assert list(audit.trail(archived.path)["Action"]) == ["create", "log", "reprice"]
@@ -0,0 +1,40 @@
+import datetime
+
+import pandas as pd
+
+from worklog import bulk, periods, storage
+
+
+def test_import_timesheet_skips_archived_periods():
+    periods.create_period("alice", datetime.date(2025, 9, 14), datetime.date(2025, 10, 11))
+    current = periods.create_period("alice", datetime.date(2025, 10, 12), datetime.date(2025, 11, 8))
+    [archived] = periods.archive_closed("alice", today=datetime.date(2025, 11, 1))
+
+    sheet = pd.DataFrame({"Date": [datetime.date(2025, 9, 15), datetime.date(2025, 10, 13)], "Hours": [4.0, 3.0]})
+    results = bulk.import_timesheet(sheet, worker="alice")
+
+    assert results[current.path].logged == [datetime.date(2025, 10, 13)]
+    assert results["alice: archived period"].missing == [datetime.date(2025, 9, 15)]
+    assert storage.load_data(archived.path)["Hours Worked"].sum() == 0.0
+
+
+def test_log_days_skips_non_working_and_logged_days():
+    path = "worklog.csv"
+    storage.save_data(storage.default_frame(), path)
+    storage.log_change(datetime.date(2025, 9, 15), 2.0, 2.0 * storage.HOURLY_RATE, path)
+    # 14 Sep is a Sunday and 17 Sep a Wednesday, the default days off
+    result = bulk.log_days(bulk.date_range(datetime.date(2025, 9, 14), datetime.date(2025, 9, 17)), 4.0, path)
+    assert result.logged == [datetime.date(2025, 9, 16)]
+    assert result.non_working == [datetime.date(2025, 9, 14), datetime.date(2025, 9, 17)]
+    assert result.already_logged == [datetime.date(2025, 9, 15)]
+
+
+def test_timesheet_reports_bad_and_blank_workers():
+    current = periods.create_period("alice", datetime.date(2025, 9, 14), datetime.date(2025, 10, 11))
+    with open("sheet.csv", "w", encoding="utf-8") as f:
+        f.write("date,hours,worker\n2025-09-15,4,alice\n2025-09-16,4,bob smith\n2025-09-18,4,\n")
+    results = bulk.import_timesheet(bulk.read_timesheet("sheet.csv"))
+
+    assert results[current.path].logged == [datetime.date(2025, 9, 15)]
+    assert results["bob smith: bad worker"].missing == [datetime.date(2025, 9, 16)]
+    assert results["(blank): bad worker"].missing == [datetime.date(2025, 9, 18)]
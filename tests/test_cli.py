@@ -0,0 +1,20 @@
+import datetime
+import os
+
+from worklog import cli, periods
+
+
+def test_read_commands_create_no_period():
+    for argv in (["totals", "--worker", "alice"], ["show", "--worker", "alice"],
+                 ["history", "--worker", "alice"], ["remove", "2025-09-15", "--worker", "alice"]):
+        assert cli.main(argv) == 1
+    assert not os.path.exists(periods.DATA_DIR)
+
+
+def test_log_creates_the_period_that_read_commands_then_use():
+    assert cli.main(["log", "2025-09-15", "--worker", "alice"]) == 0
+    [period] = periods.list_periods("alice")
+    assert period.start <= datetime.date(2025, 9, 15) <= period.end
+    assert cli.main(["show", "--worker", "alice", "--from", "2025-09-15", "--to", "2025-09-15"]) == 0
+    assert cli.main(["history", "--worker", "alice", "--date", "2025-09-15"]) == 0
+    assert periods.list_periods("alice") == [period]
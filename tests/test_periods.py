@@ -0,0 +1,50 @@
+import datetime
+import threading
+
+from worklog import periods, storage
+
+TODAY = datetime.date(2025, 11, 20)  # Two periods after the default one, which is closed by then
+
+
+def test_concurrent_roll_over_runs_once():
+    path = "worklog.csv"
+    storage.save_data(storage.default_frame(), path)
+    storage.log_change(datetime.date(2025, 9, 15), 4.0, 4.0 * storage.HOURLY_RATE, path)
+
+    barrier = threading.Barrier(8)
+    results, errors = [], []
+
+    def roll():
+        barrier.wait()
+        try:
+            results.append(periods.roll_over(path, today=TODAY))
+        except Exception as e:  # Reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=roll) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(results) == [False] * 7 + [True]
+    df = storage.load_data(path)
+    assert df["Date"].iloc[0] == datetime.date(2025, 11, 9)
+    assert df["Date"].iloc[-1] == datetime.date(2025, 12, 6)
+    archive = storage.load_data("worklog-archive/2025-09-14_2025-10-11.csv.gz")
+    assert archive["Hours Worked"].sum() == 4.0
+    assert not periods.roll_over(path, today=TODAY)
+
+
+def test_archived_period_is_read_only():
+    period = periods.create_period("alice", datetime.date(2025, 9, 14), datetime.date(2025, 10, 11))
+    [archived] = periods.archive_closed("alice", today=TODAY)
+    assert periods.is_archived(archived.path)
+    assert periods.list_periods("alice") == [archived]
+    try:
+        storage.log_change(datetime.date(2025, 9, 15), 4.0, 49.92, archived.path)
+    except storage.ReadOnlyWorklogError:
+        pass
+    else:
+        raise AssertionError(f"{period.path} was changed after archiving")
@@ -0,0 +1,40 @@
+import datetime
+import threading
+
+import pandas as pd
+
+from worklog import rates, storage
+
+START = datetime.date(2025, 9, 14)
+
+
+def test_reprice_alongside_logging():
+    path = "worklog.csv"
+    storage.save_data(storage.default_frame(), path)
+    schedule = pd.DataFrame({"Worker": ["*"], "Effective From": [START], "Hourly Rate": [20.0]})
+    days = [START + datetime.timedelta(days=i) for i in range(1, 21)]
+    errors = []
+
+    def log():
+        for day in days:
+            storage.log_change(day, 2.0, 2.0 * storage.HOURLY_RATE, path)
+
+    def reprice():
+        try:
+            for _ in range(10):
+                rates.reprice(path, schedule=schedule)
+        except Exception as e:  # Reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=log), threading.Thread(target=reprice)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    rates.reprice(path, schedule=schedule)
+    df = storage.load_data(path)
+    assert df["Hours Worked"].sum() == 40.0
+    assert (df["Hourly Rate"] == 20.0).all()
+    assert df["Earned"].sum() == 800.0
@@ -0,0 +1,68 @@
+import datetime
+import os
+import sqlite3
+
+from worklog import backends, storage
+
+START = datetime.date(2025, 9, 14)
+END = datetime.date(2025, 10, 11)
+RATE = 12.48
+BACKEND = backends.get_backend("team.sqlite")
+
+
+def frame(hours=0.0):
+    df = storage.default_frame(START, END, RATE)
+    df["Hours Worked"] = hours
+    df["Earned"] = hours * RATE
+    return df
+
+
+def test_write_read_range_and_date_bounds():
+    BACKEND.write(frame(4.0), "team.sqlite", "alice")
+    df = BACKEND.read_range("team.sqlite", START + datetime.timedelta(days=1), START + datetime.timedelta(days=3),
+                            worker="alice")
+    assert list(df["Date"]) == [START + datetime.timedelta(days=i) for i in (1, 2, 3)]
+    assert list(df.columns) == list(BACKEND.COLUMNS)
+    assert (df["Hours Worked"] == 4.0).all()
+    assert BACKEND.date_bounds("team.sqlite", "alice") == (START, END)
+    assert BACKEND.date_bounds("team.sqlite", "bob") == (None, None)
+
+
+def test_update_rows_and_worker_isolation():
+    BACKEND.write(frame(1.0), "team.sqlite", "alice")
+    BACKEND.write(frame(2.0), "team.sqlite", "bob")
+    BACKEND.update_rows("team.sqlite", [(START, 5.0, 5.0 * RATE)], "alice")
+    BACKEND.write(frame(3.0), "team.sqlite", "bob")  # Replaces only bob's rows
+
+    alice = BACKEND.read("team.sqlite", worker="alice")
+    bob = BACKEND.read("team.sqlite", worker="bob")
+    assert alice["Hours Worked"].sum() == 5.0 + 1.0 * (len(alice) - 1)
+    assert (bob["Hours Worked"] == 3.0).all()
+    assert len(alice) == len(bob) == (END - START).days + 1
+
+
+def test_reads_do_not_write():
+    sqlite3.connect("empty.sqlite").close()
+    assert not BACKEND.exists("empty.sqlite")
+    with sqlite3.connect("empty.sqlite") as connection:
+        assert connection.execute("SELECT count(*) FROM sqlite_master").fetchone() == (0,)
+
+    storage.save_data(frame(), "worklog.sqlite")
+    storage.log_change(START, 4.0, 4.0 * RATE, "worklog.sqlite")
+    before = os.stat("worklog.sqlite")
+    assert storage.load_data("worklog.sqlite")["Hours Worked"].sum() == 4.0
+    assert storage.load_range("worklog.sqlite", START, START)["Hours Worked"].item() == 4.0
+    assert storage.date_bounds("worklog.sqlite") == (START, END)
+    after = os.stat("worklog.sqlite")
+    assert (after.st_mtime_ns, after.st_size) == (before.st_mtime_ns, before.st_size)
+
+
+def test_migrate_into_one_database_per_worker():
+    storage.save_data(frame(), "alice.csv")
+    storage.log_change(START, 4.0, 4.0 * RATE, "alice.csv")
+    storage.save_data(frame(2.0), "bob.csv")
+    assert backends.migrate("alice.csv", "team.sqlite", worker="alice") == len(frame())
+    assert backends.migrate("bob.csv", "team.sqlite", worker="bob") == len(frame())
+
+    assert BACKEND.read("team.sqlite", worker="alice")["Hours Worked"].sum() == 4.0
+    assert BACKEND.read("team.sqlite", worker="bob")["Hours Worked"].sum() == 2.0 * len(frame())
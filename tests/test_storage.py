@@ -0,0 +1,96 @@
+import datetime
+import os
+import threading
+
+from worklog import storage
+
+START = datetime.date(2025, 9, 14)
+RATE = 12.48
+
+
+def new_worklog(path="worklog.csv", days=28):
+    storage.save_data(storage.default_frame(START, START + datetime.timedelta(days=days - 1), RATE), path)
+    return path
+
+
+def hours(path, date):
+    df = storage.load_data(path)
+    return float(df.loc[df["Date"] == date, "Hours Worked"].item())
+
+
+def test_wal_round_trip_and_compaction():
+    path = new_worklog()
+    day = START + datetime.timedelta(days=1)
+    storage.log_change(day, 4.0, 4.0 * RATE, path)
+    storage.log_changes([(day, 2.5, 2.5 * RATE), (START, 3.0, 3.0 * RATE)], path)
+    assert os.path.exists(storage.wal_path(path))
+    assert hours(path, day) == 2.5
+    assert hours(path, START) == 3.0
+
+    assert storage.compact(path)
+    assert not os.path.exists(storage.wal_path(path))
+    assert hours(path, day) == 2.5
+    assert hours(path, START) == 3.0
+
+
+def test_torn_wal_line_is_ignored():
+    path = new_worklog()
+    storage.log_change(START, 4.0, 4.0 * RATE, path)
+    with open(storage.wal_path(path), "a", encoding="utf-8") as f:
+        f.write('{"Date": "2025-09-1')
+    assert hours(path, START) == 4.0
+
+
+def test_stale_save_is_refused():
+    path = new_worklog()
+    version = storage.data_version(path)
+    storage.log_change(START, 4.0, 4.0 * RATE, path)
+    try:
+        storage.save_data(storage.load_data(path), path, expected_version=version)
+    except storage.StaleWorklogError:
+        pass
+    else:
+        raise AssertionError("save_data overwrote a newer file")
+
+
+def test_reader_during_compaction():
+    path = new_worklog(days=60)
+    stop = threading.Event()
+    errors = []
+
+    def write_and_compact():
+        try:
+            value = 0.0
+            while not stop.is_set():
+                value = 4.0 - value
+                storage.log_changes([(START + datetime.timedelta(days=d), value, value * RATE) for d in range(60)],
+                                    path)
+                storage.compact(path)
+        except Exception as e:  # Reported by the main thread
+            errors.append(e)
+
+    writer = threading.Thread(target=write_and_compact)
+    writer.start()
+    try:
+        for _ in range(150):
+            df = storage.load_data(path)
+            # Each batch changes every row at once, so a consistent read never mixes two batches
+            assert df["Hours Worked"].nunique() == 1
+    finally:
+        stop.set()
+        writer.join()
+    assert not errors
+
+
+def test_snapshot_keeps_file_permissions():
+    path = new_worklog()
+    os.chmod(path, 0o640)
+    storage.save_data(storage.load_data(path), path)
+    assert os.stat(path).st_mode & 0o777 == 0o640
+    assert os.stat(new_worklog("other.csv")).st_mode & 0o777 == 0o666 & ~_umask()
+
+
+def _umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
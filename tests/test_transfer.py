@@ -0,0 +1,69 @@
+import datetime
+import io
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from worklog import periods, storage, transfer
+from worklog.workdays import WorkCalendar
+
+START = datetime.date(2025, 9, 14)
+RATE = 12.48
+
+
+def test_validate_rejects_bad_rows():
+    chunk = pd.DataFrame({
+        "Worker": ["alice", None, " ", "../x", "bob", "alice", "alice", "alice"],
+        "Date": ["2025-09-15", "2025-09-15", "2025-09-15", "2025-09-15", "2025-13-01", "2025-09-16", "2025-09-17",
+                 "2025-09-15"],
+        "Hours Worked": ["4", "4", "4", "4", "4", "25", "3", "2"],
+        "Hourly Rate": [None, None, None, None, None, None, "x", "13.5"],
+    })
+    clean, rejected = transfer.validate(chunk)
+    assert rejected == {"bad worker": 3, "bad date": 1, "bad hours": 1, "bad hourly rate": 1}
+    # The last row for a (worker, date) wins
+    assert clean.to_dict("records") == [{"Worker": "alice", "Date": datetime.date(2025, 9, 15),
+                                         "Hours Worked": 2.0, "Hourly Rate": 13.5}]
+
+
+def test_upsert_rows_writes_only_changes():
+    path = "worklog.csv"
+    storage.save_data(storage.default_frame(START, START + datetime.timedelta(days=27), RATE), path)
+    calendar = WorkCalendar()
+    day = START + datetime.timedelta(days=1)
+    rows = pd.DataFrame({"Date": [day, START - datetime.timedelta(days=1)], "Hours Worked": [4.0, 1.0],
+                         "Hourly Rate": [np.nan, np.nan]})
+    assert transfer.upsert_rows(rows, path, calendar) == (1, 1)
+    assert os.path.exists(storage.wal_path(path))  # Hours only: a WAL record, not a new snapshot
+    version = storage.data_version(path)
+    assert transfer.upsert_rows(rows, path, calendar) == (0, 1)
+    assert storage.data_version(path) == version
+
+    rows["Hourly Rate"] = 20.0
+    assert transfer.upsert_rows(rows, path, calendar) == (1, 1)
+    assert not os.path.exists(storage.wal_path(path))  # A rate change is saved as a snapshot
+    df = storage.load_data(path).set_index("Date")
+    assert (df.loc[day, "Hours Worked"], df.loc[day, "Hourly Rate"], df.loc[day, "Earned"]) == (4.0, 20.0, 80.0)
+
+
+def test_export_import_round_trip():
+    for worker, hours in (("alice", 4.0), ("bob", 2.5)):
+        for offset in (0, 28):
+            period = periods.create_period(worker, START + datetime.timedelta(days=offset),
+                                           START + datetime.timedelta(days=offset + 27), hourly_rate=RATE)
+            storage.log_change(period.start + datetime.timedelta(days=1), hours, hours * RATE, period.path)
+    expected = pd.concat(list(transfer.iter_export()), ignore_index=True)
+
+    for fmt in ("csv", "jsonl", "parquet"):
+        out = io.BytesIO()
+        assert transfer.export(out, fmt=fmt) == len(expected)
+        os.rename(periods.DATA_DIR, f"old-{fmt}")
+        result = transfer.import_file(io.BytesIO(out.getvalue()), fmt=fmt)
+        assert (result.rows, result.upserted, result.periods_created, result.rejected) == (len(expected), 4, 4, {})
+        actual = pd.concat(list(transfer.iter_export()), ignore_index=True)
+        pd.testing.assert_frame_equal(actual.astype({"Day": str}), expected.astype({"Day": str}))
+        assert transfer.import_file(io.BytesIO(out.getvalue()), fmt=fmt).upserted == 0
+        shutil.rmtree(periods.DATA_DIR)
+        os.rename(f"old-{fmt}", periods.DATA_DIR)
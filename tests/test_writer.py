@@ -0,0 +1,71 @@
+import datetime
+import os
+import subprocess
+import sys
+
+from worklog import storage
+from worklog.cache import CachedWorklog
+from worklog.table import Query, get_page
+from worklog.workdays import load_calendar
+from worklog.writer import BackgroundWriter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DAY = datetime.date(2025, 9, 15)  # A Monday
+
+
+def hours_on_disk(path, date=DAY):
+    df = storage.load_data(path)
+    return float(df.loc[df["Date"] == date, "Hours Worked"].item())
+
+
+def test_burst_is_coalesced_into_one_write(monkeypatch):
+    storage.save_data(storage.default_frame(), "worklog.csv")
+    calls = []
+    monkeypatch.setattr("worklog.writer.log_changes",
+                        lambda changes, *args, **kwargs: calls.append(changes) or storage.log_changes(
+                            changes, *args, **kwargs))
+    writer = BackgroundWriter(delay=0.2)
+    worklog = CachedWorklog("worklog.csv", load_calendar(), writer)
+    for hours in (1.0, 2.0, 3.0):
+        worklog.set_hours(DAY, hours)
+    assert writer.flush(timeout=10)
+    assert calls == [[(DAY, 3.0, 3.0 * storage.HOURLY_RATE)]]
+    assert hours_on_disk("worklog.csv") == 3.0
+    assert writer.pending() == 0
+    writer.stop()
+
+
+def test_queued_changes_are_written_at_exit():
+    storage.save_data(storage.default_frame(), "worklog.csv")
+    script = (
+        "import datetime\n"
+        "from worklog.cache import CACHE\n"
+        "from worklog.core import log_day, open_worklog\n"
+        "CACHE.background_writes()\n"
+        "log_day(open_worklog('worklog.csv'), datetime.date(2025, 9, 15), 4)\n"
+        # No flush: the interpreter exits with the change still queued
+    )
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    subprocess.run([sys.executable, "-c", script], check=True, env=env, timeout=60)
+    assert hours_on_disk("worklog.csv") == 4.0
+
+
+def test_cache_key_changes_before_queued_changes_are_written():
+    storage.save_data(storage.default_frame(), "worklog.csv")
+    writer = BackgroundWriter(delay=2)
+    worklog = CachedWorklog("worklog.csv", load_calendar(), writer)
+    logged = Query(status="Logged")
+    assert get_page(worklog.cache_key, worklog.df, logged).total == 0
+
+    worklog.set_hours(DAY, 4.0)
+    assert worklog.version == storage.data_version("worklog.csv")  # Not written yet
+    assert get_page(worklog.cache_key, worklog.df, logged).total == 1
+    worklog.log_days([DAY + datetime.timedelta(days=1)], 4.0)
+    assert get_page(worklog.cache_key, worklog.df, logged).total == 2
+
+    key = worklog.cache_key
+    worklog.log_days([DAY], 4.0)  # Already logged: nothing changes
+    assert worklog.cache_key == key
+    assert writer.flush(timeout=10)
+    assert worklog.version == storage.data_version("worklog.csv") and worklog.cache_key != key
+    writer.stop()
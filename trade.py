@@ -1,5 +1,8 @@
 import streamlit as st
 
+from trade_journal import (NOT_TAKEN, OUTCOMES, evaluations, hit_rates, read_records, record_evaluation,
+                           record_outcome, to_frame)
+
 # Set page title and icon
 st.set_page_config(page_title="Execution Tool", page_icon="📈")
 
@@ -68,3 +71,45 @@ else:
     if not crit_sweep_1m: st.write("- ❌ Missing 1m Internal Liquidity Sweep.")
     if not crit_fvg: st.write("- ❌ Missing 1m FVG / IFVG for entry.")
     if not news_checked: st.write("- ❌ Check for high-impact news before trading.")
+
+# Section 4: Journal (every evaluation is kept, so the stats show what skipping a step costs)
+criteria = {"news": news_checked, "sweep_1h": sweep_1h, "choch": crit_choch, "sweep_1m": crit_sweep_1m,
+            "fvg": crit_fvg, "displacement": displacement}
+mindset = {"no_revenge": mindset_1, "accept_sl": mindset_2, "remember": mindset_3, "payout": mindset_4}
+
+st.markdown("---")
+st.header("Journal")
+col_took, col_skipped = st.columns(2)
+if col_took.button("I Took This Trade", use_container_width=True):
+    entry = record_evaluation(htf_bias, criteria, mindset)
+    st.success(f"Journaled as trade #{entry}. Record its outcome below once it closes.")
+if col_skipped.button("I Skipped It", use_container_width=True):
+    record_evaluation(htf_bias, criteria, mindset, outcome=NOT_TAKEN)
+    st.info("Journaled as not taken.")
+
+numbers, entries = evaluations(read_records())
+journal = to_frame(numbers, entries)
+
+pending = journal[journal["Outcome"] == "Pending"]
+if len(pending):
+    st.subheader("Record an Outcome")
+    opened = dict(zip(pending["Entry"], pending["Time"]))
+    settle_entry = st.selectbox("Trade", list(opened)[::-1],
+                                format_func=lambda e: f"#{e} — {opened[e]:%d %b %Y %H:%M}")
+    settle_outcome = st.radio("Outcome", ["Win", "Loss", "Breakeven"], horizontal=True)
+    if st.button("Record Outcome", use_container_width=True):
+        record_outcome(settle_entry, OUTCOMES.index(settle_outcome))
+        st.rerun()
+
+st.subheader("Hit Rate")
+group_by = st.radio("Grouped by what was missing", ["Criteria", "Mindset checks"], horizontal=True)
+report = hit_rates(entries, "missing" if group_by == "Criteria" else "mindset")
+if len(report):
+    st.dataframe(report, hide_index=True, use_container_width=True,
+                 column_config={"Hit Rate": st.column_config.ProgressColumn(min_value=0.0, max_value=1.0)})
+else:
+    st.caption("No settled trades yet.")
+
+with st.expander(f"All evaluations ({len(journal)})"):
+    # Newest first; only the latest few are sent to the browser
+    st.dataframe(journal.tail(500).iloc[::-1], hide_index=True, use_container_width=True)
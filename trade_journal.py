@@ -0,0 +1,218 @@
+"""
+Append-only journal of trade-checklist evaluations, for trade.py.
+
+Every evaluation is one fixed-width 16-byte record. It holds the time, the
+HTF bias, the six checklist criteria and the four mindset checks, each set
+as a bitmask, and an outcome. Records are only ever appended, so a trade's
+outcome, known later, is appended as its own record that points back at the
+evaluation (``ref``). Reading the journal is a single ``np.fromfile`` with no
+parsing, and the latest outcome per evaluation is resolved with array
+operations.
+
+Statistics work on the bitmasks directly. Grouping taken trades by which
+criteria were missing is one ``np.bincount`` over the missing-criteria mask,
+however long the journal is.
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from worklog.locking import file_lock
+
+# --- Settings ---
+JOURNAL_FILE = os.environ.get("TRADE_JOURNAL", "trade-journal.bin")
+MAGIC = b"TRDJRNL1"  # File header: format name and version
+
+BIASES = ["Bullish", "Bearish", "Unclear"]
+UNCLEAR = BIASES.index("Unclear")
+# (key, label) in bit order; appending keeps old records valid
+CRITERIA = [
+    ("news", "Economic calendar clear"),
+    ("sweep_1h", "1HR liquidity sweep"),
+    ("choch", "1m change of character"),
+    ("sweep_1m", "1m internal liquidity sweep"),
+    ("fvg", "1m FVG / IFVG"),
+    ("displacement", "Displacement"),
+]
+MINDSET = [
+    ("no_revenge", "Not revenge trading"),
+    ("accept_sl", "Accepts the stop loss"),
+    ("remember", "Remembers blown accounts"),
+    ("payout", "Focused on the payout"),
+]
+BIAS_BIT = len(CRITERIA)  # Bit of the missing mask that stands for an unclear bias
+OUTCOMES = ["Pending", "Win", "Loss", "Breakeven", "Not taken"]
+PENDING, WIN, LOSS, BREAKEVEN, NOT_TAKEN = range(len(OUTCOMES))
+
+RECORD = np.dtype([
+    ("time", "<i8"),  # Unix time, milliseconds
+    ("ref", "<i4"),  # -1 for an evaluation; for an outcome, the number of the evaluation it settles
+    ("bias", "u1"),
+    ("criteria", "u1"),  # Bit i set if CRITERIA[i] was met
+    ("mindset", "u1"),  # Bit i set if MINDSET[i] was checked
+    ("outcome", "u1"),
+])
+ALL_CRITERIA = (1 << len(CRITERIA)) - 1
+ALL_MINDSET = (1 << len(MINDSET)) - 1
+
+_cache = {}  # path -> (records read, array); the journal only grows, so only new records are read
+
+
+def encode(flags, names):
+    """Bitmask of the names in ``names`` whose flag is true in ``flags`` (a dict)."""
+    return sum(1 << i for i, (key, _) in enumerate(names) if flags.get(key))
+
+
+def decode(mask, names):
+    """Labels of the bits set in ``mask``."""
+    return [label for i, (_, label) in enumerate(names) if mask >> i & 1]
+
+
+def _append(record, path):
+    with file_lock(path):
+        with open(path, "ab") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                f.write(MAGIC)
+                size = len(MAGIC)
+            torn = (size - len(MAGIC)) % RECORD.itemsize
+            if torn:
+                # A crash mid-append left a partial record; drop it
+                size -= torn
+                f.truncate(size)
+            f.write(record.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+    return (size - len(MAGIC)) // RECORD.itemsize
+
+
+def record_evaluation(bias, criteria, mindset, outcome=PENDING, path=JOURNAL_FILE, when=None):
+    """Appends one evaluation and returns its number in the journal.
+
+    ``criteria`` and ``mindset`` are {key: bool} dicts keyed like CRITERIA
+    and MINDSET. ``outcome`` is PENDING for a trade that was taken, or
+    NOT_TAKEN.
+    """
+    record = np.zeros(1, dtype=RECORD)
+    record["time"] = int((time.time() if when is None else when) * 1000)
+    record["ref"] = -1
+    record["bias"] = BIASES.index(bias)
+    record["criteria"] = encode(criteria, CRITERIA)
+    record["mindset"] = encode(mindset, MINDSET)
+    record["outcome"] = outcome
+    return _append(record, path)
+
+
+def record_outcome(entry, outcome, path=JOURNAL_FILE, when=None):
+    """Appends the outcome of evaluation number ``entry``; the latest one recorded counts."""
+    record = np.zeros(1, dtype=RECORD)
+    record["time"] = int((time.time() if when is None else when) * 1000)
+    record["ref"] = entry
+    record["outcome"] = outcome
+    return _append(record, path)
+
+
+def read_records(path=JOURNAL_FILE):
+    """Every record of the journal as a structured array (RECORD), oldest first."""
+    try:
+        size = os.path.getsize(path)
+    except FileNotFoundError:
+        return np.zeros(0, dtype=RECORD)
+    count = max(size - len(MAGIC), 0) // RECORD.itemsize  # Ignores a torn final record
+    cached_count, cached = _cache.get(path, (0, np.zeros(0, dtype=RECORD)))
+    if count == cached_count:
+        return cached
+    if count < cached_count:
+        # Replaced by a different (shorter) journal
+        cached_count, cached = 0, np.zeros(0, dtype=RECORD)
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a trade journal")
+        f.seek(len(MAGIC) + cached_count * RECORD.itemsize)
+        new = np.fromfile(f, dtype=RECORD, count=count - cached_count)
+    records = np.concatenate([cached, new])
+    _cache[path] = (count, records)
+    return records
+
+
+def evaluations(records):
+    """The evaluation records with the latest outcome applied, plus their journal numbers.
+
+    Returns (numbers, evaluations).
+    """
+    is_evaluation = records["ref"] < 0
+    numbers = np.flatnonzero(is_evaluation)
+    settled = records[~is_evaluation]
+    result = records[is_evaluation].copy()
+    if len(settled) and len(numbers):
+        # Newest first, so np.unique's first occurrence of each ref is its latest outcome
+        refs, latest = np.unique(settled["ref"][::-1], return_index=True)
+        positions = np.searchsorted(numbers, refs).clip(max=len(numbers) - 1)
+        valid = numbers[positions] == refs
+        result["outcome"][positions[valid]] = settled["outcome"][::-1][latest[valid]]
+    return numbers, result
+
+
+def missing_mask(entries):
+    """Bitmask of what each evaluation lacked: criteria bits, plus BIAS_BIT for an unclear bias."""
+    missing = (~entries["criteria"].astype(np.uint16)) & ALL_CRITERIA
+    return missing | ((entries["bias"] == UNCLEAR).astype(np.uint16) << BIAS_BIT)
+
+
+def describe_missing(mask):
+    labels = decode(mask, CRITERIA)
+    if mask >> BIAS_BIT & 1:
+        labels.append("HTF bias")
+    return ", ".join(labels) or "Nothing (all met)"
+
+
+def describe_unchecked(mask):
+    return ", ".join(decode(mask, MINDSET)) or "Nothing (all checked)"
+
+
+def to_frame(numbers, entries):
+    """A readable table of evaluations: one column per criterion and mindset check."""
+    df = pd.DataFrame({
+        "Entry": numbers,
+        "Time": pd.to_datetime(entries["time"], unit="ms"),
+        "Bias": pd.Categorical.from_codes(entries["bias"], BIASES),
+    })
+    for i, (_, label) in enumerate(CRITERIA):
+        df[label] = (entries["criteria"] >> i & 1).astype(bool)
+    df["All criteria met"] = missing_mask(entries) == 0
+    df["Mindset complete"] = entries["mindset"] == ALL_MINDSET
+    df["Outcome"] = pd.Categorical.from_codes(entries["outcome"], OUTCOMES)
+    return df
+
+
+def hit_rates(entries, by="missing"):
+    """Win rate of settled trades, grouped by the criteria ("missing") or mindset checks ("mindset") left out.
+
+    Only trades with a win, loss or breakeven outcome count. Columns: the
+    group, Trades, Wins, Losses, Breakeven and Hit Rate, largest groups first.
+    """
+    settled = np.isin(entries["outcome"], (WIN, LOSS, BREAKEVEN))
+    if by == "missing":
+        keys, size, describe = missing_mask(entries), 1 << (BIAS_BIT + 1), describe_missing
+    elif by == "mindset":
+        keys = ALL_MINDSET & ~entries["mindset"].astype(np.uint16)
+        size, describe = 1 << len(MINDSET), describe_unchecked
+    else:
+        raise ValueError(f"Unknown grouping {by!r} (use 'missing' or 'mindset')")
+    keys, outcome = keys[settled], entries["outcome"][settled]
+    trades = np.bincount(keys, minlength=size)
+    wins = np.bincount(keys, weights=outcome == WIN, minlength=size).astype(int)
+    losses = np.bincount(keys, weights=outcome == LOSS, minlength=size).astype(int)
+    groups = np.flatnonzero(trades)
+    report = pd.DataFrame({
+        "Missing": [describe(int(mask)) for mask in groups],  # One label per group, not per row
+        "Trades": trades[groups],
+        "Wins": wins[groups],
+        "Losses": losses[groups],
+        "Breakeven": trades[groups] - wins[groups] - losses[groups],
+    })
+    report["Hit Rate"] = report["Wins"] / report["Trades"]
+    return report.sort_values("Trades", ascending=False, kind="stable").reset_index(drop=True)
@@ -0,0 +1,30 @@
+"""Shared worklog logic used by the Streamlit apps and the ``python -m worklog`` command line.
+
+Importing the package is cheap: the names below are resolved (and pandas
+imported) only when first used, so ``worklog.cli`` starts without them.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "DATA_FILE": "worklog.storage",
+    "compact": "worklog.storage",
+    "default_frame": "worklog.storage",
+    "load_data": "worklog.storage",
+    "log_change": "worklog.storage",
+    "save_data": "worklog.storage",
+    "MemoryWorklog": "worklog.core",
+    "log_day": "worklog.core",
+    "open_worklog": "worklog.core",
+    "remove_day": "worklog.core",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'worklog' has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,279 @@
+"""
+Audit trail of every change to a worklog, and the worklog as it was at any moment.
+
+Every row change is an immutable event in ``<file>.audit``, an append-only
+JSON-lines file. An event records when, who, the action, the date, and the
+hours and earned before and after. A whole-file save (a new period,
+repricing, an import that changes rates, a rollover) is one event naming the
+action, plus a checkpoint of the result. The events are appended from
+storage's hooks, while the file's lock for the change itself is held, so the
+trail is in the same order as the data. Storage imports this module before
+its first write, so every write is audited, from the apps and from scripts.
+
+Reconstruction starts from a checkpoint, not from the beginning. After every
+``CHECKPOINT_BYTES`` of events, the full state is kept under
+``<file>.checkpoints/<ms>_<offset><ext>``. A save's checkpoint is a hard link
+to the snapshot it wrote, which is never modified again; snapshots are only
+ever replaced by rename. ``as_of(path, when)`` loads the last checkpoint at or
+before ``when`` and replays the events after it that happened by then.
+An event is stamped when the change is made, which can be a moment before
+the background writer stores it, so stamps aren't strictly in file order.
+
+Who made a change comes from ``set_actor`` (the apps pass the signed-in user
+or the app's name), else ``$WORKLOG_USER``, else the OS user.
+
+    python -m worklog history --worker alice --date 2025-09-15
+    python -m worklog show --worker alice --as-of 2025-10-01T09:00
+"""
+
+import contextvars
+import datetime
+import getpass
+import json
+import os
+import re
+import time
+
+import pandas as pd
+
+from worklog import storage
+from worklog.backends import get_backend
+from worklog.locking import fsync_file
+from worklog.periods import DEFAULT_WORKER, worker_of
+from worklog.storage import apply_changes, load_data
+from worklog.totals import Totals
+from worklog.workdays import load_calendar
+
+CHECKPOINT_BYTES = 256 * 1024  # Events replayed at most by as_of, roughly 1,500 changes
+CHECKPOINT_EXTENSION = ".csv.gz"  # Checkpoints written from snapshot + WAL (not linked)
+COLUMNS = ["Date", "Day", "Hours Worked", "Hourly Rate", "Earned"]
+
+_CHECKPOINT_NAME = re.compile(r"^(\d+)_(\d+)\.(csv|csv\.gz|parquet|feather)$")  # Not the .lock files
+_actor = contextvars.ContextVar("worklog_actor", default=None)
+_newest = {}  # Absolute worklog path -> (time, audit offset, file) of its newest checkpoint seen here
+
+
+def audit_path(path):
+    return path + ".audit"
+
+
+def checkpoint_dir(path):
+    return path + ".checkpoints"
+
+
+# --- Who and what ---
+def set_actor(name):
+    """Records ``name`` as the author of changes made from the current thread (one app rerun)."""
+    _actor.set(name)
+
+
+def current_actor():
+    actor = _actor.get() or os.environ.get("WORKLOG_USER")
+    if actor:
+        return actor
+    try:
+        return getpass.getuser()
+    except (KeyError, OSError):
+        return "unknown"
+
+
+def _now():
+    # Whole milliseconds, rounded down so a stamp is never later than the change
+    return time.time_ns() // 1_000_000 / 1000
+
+
+def _number(value):
+    return None if value is None else float(value)
+
+
+def events(changes, previous=None, action=None, actor=None):
+    """Audit events for (date, hours, earned) changes, stamped now.
+
+    ``previous`` holds the (hours, earned) of each date before the change, if
+    known. ``action`` defaults to "log", or "remove" for zero hours.
+    """
+    at = _now()
+    actor = actor or current_actor()
+    previous = [(None, None)] * len(changes) if previous is None else previous
+    return [{"at": at, "actor": actor, "action": action or ("log" if hours else "remove"),
+             "date": date.isoformat(), "old_hours": _number(old_hours), "old_earned": _number(old_earned),
+             "hours": float(hours), "earned": float(earned)}
+            for (date, hours, earned), (old_hours, old_earned) in zip(changes, previous)]
+
+
+# --- Storage hooks, called with the worklog's lock held ---
+def _append(path, records):
+    with open(audit_path(path), "a", encoding="utf-8") as f:
+        f.write("".join(json.dumps(record) + "\n" for record in records))
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+
+def _checkpoints(path):
+    """(time, audit offset, file) of each checkpoint of a worklog, oldest first."""
+    directory = checkpoint_dir(path)
+    if not os.path.isdir(directory):
+        return []
+    found = []
+    for name in os.listdir(directory):
+        match = _CHECKPOINT_NAME.match(name)
+        if match:
+            found.append((int(match.group(1)) / 1000, int(match.group(2)), os.path.join(directory, name)))
+    return sorted(found)
+
+
+def _newest_checkpoint(path):
+    """The newest checkpoint of a worklog, or None; the directory is only listed when not known yet."""
+    key = os.path.abspath(path)
+    newest = _newest.get(key)
+    if newest is None or not os.path.exists(newest[2]):
+        checkpoints = _checkpoints(path)
+        newest = _newest[key] = checkpoints[-1] if checkpoints else None
+    return newest
+
+
+def _checkpoint(path, at, offset, state):
+    """Writes a read-only checkpoint; the worklog's lock already keeps other writers out."""
+    os.makedirs(checkpoint_dir(path), exist_ok=True)
+    file = os.path.join(checkpoint_dir(path), f"{round(at * 1000):013d}_{offset}{CHECKPOINT_EXTENSION}")
+    tmp = file + ".tmp"  # Not a checkpoint name, so never read half-written
+    df = state()
+    get_backend(file).write(df[[c for c in COLUMNS if c in df.columns]], tmp)
+    fsync_file(tmp)
+    os.chmod(tmp, 0o444)
+    os.replace(tmp, file)
+    _newest[os.path.abspath(path)] = (at, offset, file)
+
+
+def before_write(path, state):
+    """Keeps the state of a file from before its first audited change as its baseline checkpoint.
+
+    ``state`` returns the current frame; it is only called when needed.
+    """
+    if _newest_checkpoint(path) is None:
+        size = os.path.getsize(audit_path(path)) if os.path.exists(audit_path(path)) else 0
+        _checkpoint(path, 0.0, size, state)
+
+
+def after_changes(path, changes, new_events, state):
+    """Appends the events of row changes just written, and a checkpoint every CHECKPOINT_BYTES."""
+    new_events = events(changes) if new_events is None else new_events
+    size = _append(path, new_events)
+    # Another process's newer checkpoint only makes this one come early
+    newest = _newest_checkpoint(path)
+    if size - (newest[1] if newest else 0) >= CHECKPOINT_BYTES:
+        # Stamped now, not with the last event: every event before it was stamped earlier
+        _checkpoint(path, _now(), size, state)
+
+
+def after_save(path, df, action):
+    """Appends a save event and checkpoints the snapshot that was just written."""
+    event = {"at": _now(), "actor": current_actor(), "action": action}
+    size = _append(path, [event])
+    if not get_backend(path).in_place:
+        os.makedirs(checkpoint_dir(path), exist_ok=True)
+        file = os.path.join(checkpoint_dir(path), f"{round(event['at'] * 1000):013d}_{size}{os.path.splitext(path)[1]}")
+        try:
+            # The snapshot is replaced by rename, never rewritten, so this inode stays as it is now
+            os.link(path, file)
+            _newest[os.path.abspath(path)] = (event["at"], size, file)
+            return
+        except OSError:
+            pass  # No hard links on this filesystem; write a copy instead
+    _checkpoint(path, event["at"], size, lambda: df)
+
+
+def after_archive(path, dst):
+    """Moves a worklog's trail along with it into the archive."""
+    _newest.pop(os.path.abspath(path), None)
+    for trail_path in (audit_path, checkpoint_dir):
+        if os.path.exists(trail_path(path)) and not os.path.exists(trail_path(dst)):
+            os.replace(trail_path(path), trail_path(dst))
+
+
+storage.WRITE_HOOKS.append(before_write)
+storage.CHANGE_HOOKS.append(after_changes)
+storage.SNAPSHOT_HOOKS.append(after_save)
+storage.ARCHIVE_HOOKS.append(after_archive)
+
+
+# --- Reading ---
+def _read_events(path, offset=0):
+    try:
+        f = open(audit_path(path), encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with f:
+        f.seek(offset)
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # A torn final line from a crash mid-append
+                return
+
+
+def _seconds(when):
+    if isinstance(when, (int, float)):
+        return float(when)
+    if not isinstance(when, datetime.datetime):
+        # A date means the end of that day
+        when = datetime.datetime.combine(when, datetime.time.max)
+    return when.timestamp()
+
+
+def as_of(path, when, calendar=None):
+    """The worklog file as it was at ``when`` (a datetime, a date for the end of that day, or Unix seconds).
+
+    To Earn is recalculated with ``calendar`` (the file's worker's by
+    default). Raises ValueError if the audit trail starts after ``when``.
+    """
+    when = _seconds(when)
+    usable = [checkpoint for checkpoint in _checkpoints(path) if checkpoint[0] <= when]
+    if not usable:
+        raise ValueError(f"The audit trail of {path} starts after {datetime.datetime.fromtimestamp(when)}")
+    _, offset, file = usable[-1]
+    df = load_data(file)
+    changes = {}
+    for event in _read_events(path, offset):
+        # No early stop: a late-written event can be older than the one before it
+        if event["at"] <= when and "date" in event:
+            changes[datetime.date.fromisoformat(event["date"])] = {"Hours Worked": event["hours"],
+                                                                    "Earned": event["earned"]}
+    df = apply_changes(df, changes)
+    calendar = load_calendar(worker_of(path) or DEFAULT_WORKER) if calendar is None else calendar
+    Totals.from_frame(df, calendar)
+    return df
+
+
+def trail(path, date=None, since=None, until=None):
+    """The audit events of a worklog file, oldest first, optionally for one date and a time window.
+
+    With ``since``, reading starts at the last checkpoint before it instead
+    of the start of the trail.
+    """
+    start = _seconds(since) if since is not None else None
+    end = _seconds(until) if until is not None else None
+    offset = 0
+    if start is not None:
+        earlier = [checkpoint for checkpoint in _checkpoints(path) if checkpoint[0] <= start]
+        offset = earlier[-1][1] if earlier else 0
+    rows = []
+    for event in _read_events(path, offset):
+        if ((start is None or event["at"] >= start) and (end is None or event["at"] <= end)
+                and (date is None or event.get("date") == date.isoformat())):
+            rows.append(event)
+    rows.sort(key=lambda event: event["at"])  # Stable: file order among equal stamps
+    df = pd.DataFrame(rows, columns=["at", "actor", "action", "date", "old_hours", "old_earned", "hours", "earned"])
+    local = datetime.datetime.now().astimezone().tzinfo
+    return pd.DataFrame({
+        "When": pd.to_datetime(df["at"], unit="s", utc=True).dt.round("ms").dt.tz_convert(local).dt.tz_localize(None),
+        "Who": df["actor"],
+        "Action": df["action"],
+        "Date": pd.to_datetime(df["date"]).dt.date,
+        "Old Hours": df["old_hours"].astype(float),
+        "New Hours": df["hours"].astype(float),
+        "Old Earned": df["old_earned"].astype(float),
+        "New Earned": df["earned"].astype(float),
+    })
@@ -0,0 +1,315 @@
+"""
+Pluggable snapshot formats for the worklog.
+
+The backend is picked from the file extension of the snapshot path:
+
+    worklog.csv      -> CsvBackend (default, plain text)
+    worklog.parquet  -> ParquetBackend (typed columnar, date32/float64)
+    worklog.feather  -> FeatherBackend (typed columnar, uncompressed Arrow IPC)
+    worklog.sqlite   -> SqliteBackend (indexed table, updated in place; also .db)
+    x.csv.gz         -> ArchiveBackend (gzipped CSV of a closed period; read-only)
+
+The columnar formats need ``pyarrow``. They store ``Date`` as a native date32
+column, so loading skips the text parse entirely, and ``columns=`` reads only
+the requested columns from disk.
+
+The SQLite backend keeps many workers' rows in one database, keyed on
+(worker, date). A log or remove is a single UPDATE instead of a WAL append,
+and date ranges and min/max dates are index lookups, so they need no full
+load. The database runs in SQLite's WAL journal mode, so sessions keep
+reading while another one writes.
+
+Convert an existing CSV with:
+
+    python -m worklog.backends worklog.csv worklog.parquet
+    python -m worklog.backends worklog.csv worklog.sqlite
+    python -m worklog.backends worklogs/alice/2025-09-14_2025-10-11.csv team.sqlite --worker alice
+"""
+
+import argparse
+import contextlib
+import os
+import sqlite3
+
+import pandas as pd
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Parquet/Feather worklogs need pyarrow: pip install pyarrow") from e
+
+
+class Backend:
+    """Defaults shared by the backends: one snapshot file, replaced as a whole on save."""
+
+    in_place = False  # save writes into the existing file instead of a temp file + rename
+    read_only = False  # refuses saves and row changes once written (archived periods)
+    row_updates = False  # log/remove update rows directly instead of appending to the JSON WAL
+
+    def exists(self, path):
+        return os.path.exists(path)
+
+    def iter_chunks(self, path, chunk_rows, columns=None):
+        """Yields the snapshot as frames of at most ``chunk_rows`` rows; formats that can't stream read it whole."""
+        df = self.read(path, columns)
+        for begin in range(0, len(df), chunk_rows):
+            yield df.iloc[begin:begin + chunk_rows].reset_index(drop=True)
+
+
+class CsvBackend(Backend):
+    """Text snapshot; the format the apps have always used."""
+
+    def read(self, path, columns=None):
+        # Day holds seven distinct names; as a category it costs one byte per row
+        df = pd.read_csv(path, usecols=columns, dtype={"Day": "category"})
+        return self._parse_dates(df)
+
+    def iter_chunks(self, path, chunk_rows, columns=None):
+        with pd.read_csv(path, usecols=columns, dtype={"Day": "category"}, chunksize=chunk_rows) as reader:
+            for df in reader:
+                yield self._parse_dates(df.reset_index(drop=True))
+
+    @staticmethod
+    def _parse_dates(df):
+        if "Date" in df.columns:
+            df['Date'] = pd.to_datetime(df['Date'], format="%Y-%m-%d").dt.date
+        return df
+
+    def write(self, df, path):
+        df.to_csv(path, index=False)
+
+
+class ArchiveBackend(CsvBackend):
+    """Gzipped CSV of a closed pay period (see ``worklog.periods.archive_period``); never changes."""
+
+    read_only = True
+
+    def iter_chunks(self, path, chunk_rows, columns=None):
+        with pd.read_csv(path, usecols=columns, dtype={"Day": "category"}, compression="gzip",
+                         chunksize=chunk_rows) as reader:
+            for df in reader:
+                yield self._parse_dates(df.reset_index(drop=True))
+
+    def read(self, path, columns=None):
+        df = pd.read_csv(path, usecols=columns, dtype={"Day": "category"}, compression="gzip")
+        return self._parse_dates(df)
+
+    def write(self, df, path):
+        # The temp file written first has no .gz extension, so the compression is explicit
+        df.to_csv(path, index=False, compression="gzip")
+
+
+class ParquetBackend(Backend):
+    """Compressed columnar snapshot with a native date32 ``Date`` column."""
+
+    def read(self, path, columns=None):
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+        return pq.read_table(path, columns=columns).to_pandas()
+
+    def iter_chunks(self, path, chunk_rows, columns=None):
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+
+    def write(self, df, path):
+        _require_pyarrow()
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path)
+
+
+class FeatherBackend(Backend):
+    """Uncompressed Arrow IPC snapshot; the fastest to load, larger on disk."""
+
+    def read(self, path, columns=None):
+        _require_pyarrow()
+        import pyarrow.feather as feather
+        return feather.read_table(path, columns=columns).to_pandas()
+
+    def write(self, df, path):
+        _require_pyarrow()
+        import pyarrow as pa
+        import pyarrow.feather as feather
+        feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), path, compression="uncompressed")
+
+
+class SqliteBackend(Backend):
+    """One SQLite table for every worker, indexed on (worker, date).
+
+    Without a worker, a file's rows belong to the worker of its partition
+    path (see ``worklog.periods``), or to the default ``*`` worker.
+    """
+
+    in_place = True
+    row_updates = True
+
+    TABLE = "worklog"
+    # Frame column -> SQL column
+    COLUMNS = {"Date": "date", "Day": "day", "Hours Worked": "hours_worked", "Hourly Rate": "hourly_rate",
+               "Earned": "earned", "To Earn": "to_earn"}
+    SCHEMA = f"""
+        CREATE TABLE IF NOT EXISTS {TABLE} (
+            worker TEXT NOT NULL,
+            date TEXT NOT NULL,
+            day TEXT NOT NULL,
+            hours_worked REAL NOT NULL,
+            hourly_rate REAL NOT NULL,
+            earned REAL NOT NULL,
+            to_earn REAL NOT NULL,
+            PRIMARY KEY (worker, date)
+        ) WITHOUT ROWID
+    """
+
+    @contextlib.contextmanager
+    def connect(self, path, create=False):
+        """A connection that commits on success and is always closed.
+
+        With ``create`` the database is switched to WAL mode and the table is
+        created if needed; readers leave the file as it is.
+        """
+        connection = sqlite3.connect(path, timeout=30)
+        try:
+            if create:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(self.SCHEMA)
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def worker(path, worker=None):
+        if worker is not None:
+            return worker
+        from worklog.periods import DEFAULT_WORKER, worker_of  # periods builds on storage, which uses this module
+        return worker_of(path) or DEFAULT_WORKER
+
+    def exists(self, path):
+        if not os.path.exists(path):
+            return False
+        with self.connect(path) as connection:
+            if connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                  (self.TABLE,)).fetchone() is None:
+                return False
+            return connection.execute(f"SELECT 1 FROM {self.TABLE} WHERE worker = ? LIMIT 1",
+                                      (self.worker(path),)).fetchone() is not None
+
+    def _frame(self, rows, columns):
+        df = pd.DataFrame.from_records(rows, columns=columns)
+        if "Date" in df.columns:
+            df["Date"] = pd.to_datetime(df["Date"], format="%Y-%m-%d").dt.date
+        if "Day" in df.columns:
+            df["Day"] = df["Day"].astype("category")
+        return df
+
+    def read(self, path, columns=None, worker=None):
+        return self.read_range(path, None, None, columns, worker)
+
+    def _range_query(self, path, start, end, columns, worker):
+        sql = f"SELECT {', '.join(self.COLUMNS[c] for c in columns)} FROM {self.TABLE} WHERE worker = ?"
+        params = [self.worker(path, worker)]
+        if start is not None:
+            sql += " AND date >= ?"
+            params.append(start.isoformat())
+        if end is not None:
+            sql += " AND date <= ?"
+            params.append(end.isoformat())
+        return sql + " ORDER BY date", params
+
+    def read_range(self, path, start=None, end=None, columns=None, worker=None):
+        """Rows of one worker from ``start`` to ``end`` (inclusive, either may be None), by date."""
+        columns = list(self.COLUMNS) if columns is None else list(columns)
+        with self.connect(path) as connection:
+            rows = connection.execute(*self._range_query(path, start, end, columns, worker)).fetchall()
+        return self._frame(rows, columns)
+
+    def iter_range(self, path, start=None, end=None, chunk_rows=50_000, columns=None, worker=None):
+        """``read_range`` as frames of at most ``chunk_rows`` rows, fetched from one cursor."""
+        columns = list(self.COLUMNS) if columns is None else list(columns)
+        with self.connect(path) as connection:
+            cursor = connection.execute(*self._range_query(path, start, end, columns, worker))
+            while rows := cursor.fetchmany(chunk_rows):
+                yield self._frame(rows, columns)
+
+    def iter_chunks(self, path, chunk_rows, columns=None):
+        return self.iter_range(path, chunk_rows=chunk_rows, columns=columns)
+
+    def date_bounds(self, path, worker=None):
+        """(first, last) date of one worker, or (None, None) if it has no rows."""
+        with self.connect(path) as connection:
+            first, last = connection.execute(f"SELECT min(date), max(date) FROM {self.TABLE} WHERE worker = ?",
+                                             (self.worker(path, worker),)).fetchone()
+        return tuple(None if d is None else pd.Timestamp(d).date() for d in (first, last))
+
+    def write(self, df, path, worker=None):
+        """Replaces one worker's rows in a single transaction; other workers are untouched."""
+        worker = self.worker(path, worker)
+        rows = zip([worker] * len(df), (d.isoformat() for d in df["Date"]), df["Day"].astype(str),
+                   df["Hours Worked"].astype(float), df["Hourly Rate"].astype(float), df["Earned"].astype(float),
+                   df["To Earn"].astype(float))
+        with self.connect(path, create=True) as connection:
+            connection.execute(f"DELETE FROM {self.TABLE} WHERE worker = ?", (worker,))
+            connection.executemany(f"INSERT INTO {self.TABLE} VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def update_rows(self, path, changes, worker=None):
+        """Sets Hours Worked / Earned of (date, hours, earned) changes with one UPDATE each, in one transaction."""
+        worker = self.worker(path, worker)
+        with self.connect(path, create=True) as connection:
+            connection.executemany(
+                f"UPDATE {self.TABLE} SET hours_worked = ?, earned = ? WHERE worker = ? AND date = ?",
+                [(float(hours), float(earned), worker, date.isoformat()) for date, hours, earned in changes])
+
+
+BACKENDS = {
+    ".csv": CsvBackend(),
+    ".parquet": ParquetBackend(),
+    ".feather": FeatherBackend(),
+    ".sqlite": SqliteBackend(),
+    ".db": SqliteBackend(),
+    ".gz": ArchiveBackend(),
+}
+
+
+def get_backend(path):
+    """Returns the backend that handles a snapshot path, based on its extension."""
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        return BACKENDS[extension]
+    except KeyError:
+        raise ValueError(f"No worklog backend for '{extension}' files (known: {', '.join(BACKENDS)})") from None
+
+
+def migrate(src, dst, worker=None):
+    """One-shot conversion of a worklog (snapshot + WAL) into another format.
+
+    ``worker`` picks whose rows they become in a SQLite destination.
+    """
+    from worklog.locking import file_lock
+    from worklog.storage import load_data, save_data
+    df = load_data(src)
+    if worker is None:
+        save_data(df, dst, action="migrate")
+    else:
+        with file_lock(dst):
+            get_backend(dst).write(df, dst, worker)
+    return len(df)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a worklog between storage formats.")
+    parser.add_argument("src", help="existing worklog, e.g. worklog.csv")
+    parser.add_argument("dst", help="new worklog, e.g. worklog.parquet or team.sqlite")
+    parser.add_argument("--worker", help="store the rows under this worker in a SQLite destination")
+    args = parser.parse_args(argv)
+    if args.worker and not get_backend(args.dst).row_updates:
+        parser.error("--worker only applies to a .sqlite/.db destination")
+    rows = migrate(args.src, args.dst, args.worker)
+    print(f"Migrated {rows} rows from {args.src} to {args.dst}")
+
+
+if __name__ == "__main__":
+    main()
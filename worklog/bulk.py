@@ -0,0 +1,202 @@
+"""
+Bulk logging: apply hours to many dates in one vectorized pass and one write.
+
+The same rules as the "Log Missed Day" button apply to every date:
+non-working days are skipped, and so are days that already have hours logged
+(unless ``overwrite`` is set). All accepted changes are persisted with a
+single WAL append.
+
+Command line, for scripted backfills and timesheet imports:
+
+    python -m worklog.bulk --from 2025-09-14 --to 2025-10-11
+    python -m worklog.bulk --dates 2025-09-15 2025-09-16 --hours 3.5
+    python -m worklog.bulk --timesheet export.csv --worker alice
+"""
+
+import argparse
+import collections
+import datetime
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from worklog.audit import events
+from worklog.storage import DATA_FILE, data_version, load_data, log_changes
+from worklog.totals import DAILY_HOURS, Totals
+from worklog.workdays import load_calendar
+
+BulkResult = collections.namedtuple("BulkResult", ["logged", "non_working", "already_logged", "missing"])
+
+_DATE_COLUMNS = ("date", "day")
+_HOURS_COLUMNS = ("hours", "hours worked")
+_WORKER_COLUMNS = ("worker", "name")
+
+
+def date_range(start_date, end_date):
+    """Returns every date from start_date to end_date inclusive."""
+    return list(pd.date_range(start_date, end_date).date)
+
+
+def apply_hours(df, totals, dates, hours=DAILY_HOURS, overwrite=False):
+    """Sets hours for many dates of one worklog frame in a single vectorized pass.
+
+    ``hours`` is one number for every date or one per date. Returns the
+    BulkResult, the (date, hours, earned) changes that need persisting and
+    the (hours, earned) each changed date had before, for the audit trail.
+    """
+    entries = pd.Series(np.broadcast_to(np.asarray(hours, dtype=float), (len(dates),)), index=list(dates))
+    entries = entries[~entries.index.duplicated(keep="last")]
+    rows = pd.Index(df["Date"]).get_indexer(entries.index)
+    found = rows >= 0
+    found_rows = rows[found]
+    non_working = ~totals.workdays.mask(df["Date"].to_numpy()[found_rows])
+    logged = df["Hours Worked"].to_numpy()[found_rows] > 0
+    take = ~non_working & (overwrite | ~logged)
+
+    found_dates = entries.index[found]
+    take_dates = found_dates[take]
+    take_hours = entries.to_numpy()[found][take]
+    take_rows = found_rows[take]
+    previous = list(zip(df["Hours Worked"].to_numpy()[take_rows], df["Earned"].to_numpy()[take_rows]))
+    earned = totals.set_hours_many(df, df.index[take_rows], take_hours) if take.any() else []
+    result = BulkResult(
+        logged=list(take_dates),
+        non_working=list(found_dates[non_working]),
+        already_logged=list(found_dates[~non_working & logged & (not overwrite)]),
+        missing=list(entries.index[~found]),
+    )
+    return result, list(zip(take_dates, take_hours, earned)), previous
+
+
+def log_days(dates, hours=DAILY_HOURS, path=DATA_FILE, calendar=None, overwrite=False):
+    """Loads one worklog file, applies hours to many dates and persists them in one write.
+
+    Workdays come from ``calendar``, or everyone's calendar by default.
+    """
+    calendar = load_calendar() if calendar is None else calendar
+    version = data_version(path)
+    df = load_data(path)
+    result, changes, previous = apply_hours(df, Totals.from_frame(df, calendar), dates, hours, overwrite)
+    if changes:
+        log_changes(changes, path, expected_version=version, events=events(changes, previous, "bulk log"))
+    return result
+
+
+def _pick(columns, names, what, required=True):
+    lowered = {c.strip().lower(): c for c in columns}
+    for name in names:
+        if name in lowered:
+            return lowered[name]
+    if required:
+        raise ValueError(f"Timesheet has no {what} column (looked for: {', '.join(names)})")
+    return None
+
+
+def read_timesheet(path):
+    """Reads a CSV, JSON or JSON-lines timesheet into Date / Hours [/ Worker] columns.
+
+    Only a date column is required; rows without hours get the usual 4 hours.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        raw = pd.read_csv(path)
+    elif extension in (".jsonl", ".ndjson"):
+        raw = pd.read_json(path, lines=True, dtype=False)
+    elif extension == ".json":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            # {"2025-09-15": 4, ...}
+            data = [{"date": d, "hours": h} for d, h in data.items()]
+        raw = pd.DataFrame(data)
+    else:
+        raise ValueError(f"Unsupported timesheet format '{extension}' (use .csv, .json or .jsonl)")
+
+    sheet = pd.DataFrame({"Date": pd.to_datetime(raw[_pick(raw.columns, _DATE_COLUMNS, "date")]).dt.date})
+    hours_column = _pick(raw.columns, _HOURS_COLUMNS, "hours", required=False)
+    sheet["Hours"] = raw[hours_column].astype(float) if hours_column else float(DAILY_HOURS)
+    worker_column = _pick(raw.columns, _WORKER_COLUMNS, "worker", required=False)
+    if worker_column:
+        # Blank cells become "", not NaN (or "nan"), so they're reported as bad workers
+        sheet["Worker"] = raw[worker_column].fillna("").astype(str).str.strip()
+    return sheet
+
+
+def import_timesheet(sheet, path=DATA_FILE, worker=None, calendar=None, overwrite=False):
+    """Applies a timesheet, one write per worklog partition touched.
+
+    Rows go to ``path`` unless a worker is given (as an argument or as a
+    ``Worker`` column), in which case each date goes to that worker's period
+    and is checked against that worker's calendar unless ``calendar`` is set.
+    Dates of archived periods are not logged. Returns {partition path:
+    BulkResult}; dates without a writable period are reported as missing
+    under "<worker>: no period" and "<worker>: archived period", and rows
+    whose worker isn't a valid name under "<worker>: bad worker".
+    """
+    if worker is not None:
+        sheet = sheet.assign(Worker=worker)
+    if "Worker" not in sheet.columns:
+        return {path: log_days(sheet["Date"], sheet["Hours"].to_numpy(), path, calendar, overwrite)}
+
+    from worklog.periods import is_archived, is_worker_name, list_periods
+    results = {}
+    for name, rows in sheet.assign(Worker=sheet["Worker"].fillna("").astype(str)).groupby("Worker", sort=False):
+        if not is_worker_name(name):
+            results[f"{name or '(blank)'}: bad worker"] = BulkResult([], [], [], list(rows["Date"]))
+            continue
+        known = list_periods(name)
+        worker_calendar = load_calendar(name) if calendar is None else calendar
+        periods = {}
+        unmatched = []
+        archived = []
+        for date, hours in zip(rows["Date"], rows["Hours"]):
+            period = next((p for p in known if p.start <= date <= p.end), None)
+            if period is None:
+                unmatched.append(date)
+            elif is_archived(period.path):
+                archived.append(date)
+            else:
+                periods.setdefault(period.path, []).append((date, hours))
+        for partition, entries in periods.items():
+            dates, hours = zip(*entries)
+            results[partition] = log_days(dates, np.array(hours), partition, worker_calendar, overwrite)
+        if unmatched:
+            results[f"{name}: no period"] = BulkResult([], [], [], unmatched)
+        if archived:
+            results[f"{name}: archived period"] = BulkResult([], [], [], archived)
+    return results
+
+
+def _print_result(label, result):
+    print(f"{label}: logged {len(result.logged)}, non-working {len(result.non_working)}, "
+          f"already logged {len(result.already_logged)}, not in worklog {len(result.missing)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Log hours for many dates at once.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--dates", nargs="+", type=datetime.date.fromisoformat, help="dates to log (YYYY-MM-DD)")
+    source.add_argument("--from", dest="start", type=datetime.date.fromisoformat, help="first date of a range")
+    source.add_argument("--timesheet", help="CSV / JSON / JSON-lines file with a date and optional hours column")
+    parser.add_argument("--to", dest="end", type=datetime.date.fromisoformat, help="last date of a range")
+    parser.add_argument("--hours", type=float, default=DAILY_HOURS, help="hours per date (default: %(default)s)")
+    parser.add_argument("--file", default=DATA_FILE, help="worklog file (default: %(default)s)")
+    parser.add_argument("--worker", help="log into this worker's pay periods instead of --file")
+    parser.add_argument("--overwrite", action="store_true", help="replace hours on days that are already logged")
+    args = parser.parse_args(argv)
+
+    if args.timesheet:
+        sheet = read_timesheet(args.timesheet)
+    else:
+        if args.start and not args.end:
+            parser.error("--from needs --to")
+        dates = args.dates or date_range(args.start, args.end)
+        sheet = pd.DataFrame({"Date": dates, "Hours": args.hours})
+    for label, result in import_timesheet(sheet, args.file, args.worker, overwrite=args.overwrite).items():
+        _print_result(label, result)
+
+
+if __name__ == "__main__":
+    main()
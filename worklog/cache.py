@@ -0,0 +1,136 @@
+"""
+Process-wide worklog cache shared by every Streamlit session.
+
+Streamlit imports this module once per server process, so ``CACHE`` holds a
+single loaded copy (frame, date index and totals) per worklog file no matter
+how many browser sessions are open. Sessions read the cached frame directly,
+without copying. Writes go through ``CachedWorklog.set_hours``, which updates
+that shared copy in place and appends to the WAL, so every session sees the
+change on its next rerun without reloading. Each change carries its audit
+event, with the hours and earned it replaced.
+
+An entry is reloaded only when ``data_version`` shows another process
+changed the file. With ``background_writes()`` the WAL append is queued on
+the process's BackgroundWriter instead, so a change returns as soon as the
+shared copy is updated; an entry with changes still queued is never
+reloaded.
+"""
+
+import threading
+
+from worklog import profiling
+from worklog.audit import events
+from worklog.backends import get_backend
+from worklog.bulk import apply_hours
+from worklog.index import DateIndex
+from worklog.storage import data_version, load_data, log_changes
+from worklog.totals import Totals
+from worklog.writer import BackgroundWriter
+
+
+class CachedWorklog:
+    """One loaded worklog file plus the derived structures built from it."""
+
+    def __init__(self, path, calendar, writer=None):
+        self.path = path
+        self.writer = writer
+        self.read_only = get_backend(path).read_only  # An archived period
+        self.lock = threading.RLock()
+        self.revision = 0  # Changes made to this copy; the version lags behind while they're queued
+        self.version = data_version(path)
+        self.df = load_data(path)
+        self.index = DateIndex(self.df)
+        self.totals = Totals.from_frame(self.df, calendar)
+
+    @property
+    def cache_key(self):
+        """Identifies this copy's contents for page and chart caches; None while it is due to be reloaded."""
+        return None if self.version is None else (self.path, self.version, self.revision)
+
+    def set_hours(self, date, hours):
+        """Sets the hours for ``date`` in the shared frame and persists the change."""
+        with self.lock:
+            idx = self.index.position(date)
+            previous = (self.df.at[idx, "Hours Worked"], self.df.at[idx, "Earned"])
+            earned = self.totals.set_hours(self.df, idx, hours)
+            self.revision += 1
+            changes = [(date, hours, earned)]
+            if self.writer is not None:
+                self.writer.submit(self, changes, events(changes, [previous]))
+            else:
+                # None means another process wrote first; the next get() reloads
+                self.version = log_changes(changes, self.path, expected_version=self.version,
+                                           events=events(changes, [previous]))
+        return earned
+
+    def log_days(self, dates, hours, overwrite=False):
+        """Bulk version of ``set_hours``: one vectorized update and one WAL write."""
+        with self.lock:
+            result, changes, previous = apply_hours(self.df, self.totals, dates, hours, overwrite)
+            self.revision += bool(changes)
+            if changes and self.writer is not None:
+                self.writer.submit(self, changes, events(changes, previous, "bulk log"))
+            elif changes:
+                self.version = log_changes(changes, self.path, expected_version=self.version,
+                                           events=events(changes, previous, "bulk log"))
+        return result
+
+
+class WorklogCache:
+    """Maps a worklog file to its one shared CachedWorklog."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.writer = None
+        self.hits = 0
+        self.misses = 0
+
+    def background_writes(self, writer=None):
+        """Queues every later change on ``writer`` (a new BackgroundWriter by default); returns it.
+
+        Calling it again keeps the writer already in use.
+        """
+        with self._lock:
+            if self.writer is None:
+                self.writer = writer or BackgroundWriter()
+                # Entries loaded before now still write synchronously; start them afresh
+                self._entries.clear()
+            return self.writer
+
+    def flush(self, timeout=None):
+        """Waits for queued changes to reach disk, e.g. before reading a file directly."""
+        return self.writer is None or self.writer.flush(timeout)
+
+    def get(self, path, calendar):
+        """Returns the shared worklog for ``path``, loading it if missing or changed on disk."""
+        key = (path, calendar)
+        version = data_version(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            # Queued changes are newer than the file, so a copy holding them is kept
+            if entry is not None and (entry.version == version or
+                                      (self.writer is not None and self.writer.pending(path))):
+                self.hits += 1
+                profiling.count("cache_hits")
+                return entry
+            self.misses += 1
+        profiling.count("cache_misses")
+        # Load outside the cache-wide lock so other files stay available
+        entry = CachedWorklog(path, calendar, self.writer)
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def invalidate(self, path=None):
+        """Drops one file's entry, or every entry when no path is given."""
+        with self._lock:
+            for key in [k for k in self._entries if path is None or k[0] == path]:
+                del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+CACHE = WorklogCache()
@@ -0,0 +1,84 @@
+"""
+Chart figures for the apps, memoized and kept small.
+
+``earnings_pie`` is cached on its two totals, so reruns that didn't change
+them reuse the figure instead of rebuilding it. The time-series charts
+aggregate on the server (per day or per week) and downsample to at most
+``MAX_POINTS`` points. A multi-year history never ships more than that to
+the browser. They are cached on a caller-supplied key, normally the
+worklog's path and ``data_version``.
+
+plotly is only imported when a figure is actually built.
+"""
+
+import functools
+import math
+
+import pandas as pd
+
+from worklog import profiling
+from worklog.compact_history import CompactWorklog
+from worklog.lru import LRUCache
+
+MAX_POINTS = 500
+
+_series_cache = LRUCache(maxsize=32)
+
+
+@functools.lru_cache(maxsize=64)
+@profiling.timed("earnings_pie")
+def earnings_pie(total_earned, total_toearn):
+    """The Earned / To Earn donut. Pass rounded totals so equal amounts share a cache entry."""
+    import plotly.express as px
+    fig = px.pie(
+        names=["Earned", "To Earn"], values=[total_earned, total_toearn],
+        hole=0.5, color=["Earned", "To Earn"],
+        color_discrete_map={"Earned": "green", "To Earn": "gold"}
+    )
+    fig.update_traces(textinfo="label+percent", textfont_size=14)
+    return fig
+
+
+@profiling.timed("cumulative_earnings")
+def cumulative_earnings(df, freq="D", max_points=MAX_POINTS):
+    """Aggregates Earned per day ("D") or week ("W") with a running total, downsampled.
+
+    ``df`` is a worklog frame or a CompactWorklog.
+
+    Returns a frame indexed by date with "Earned" (per bucket) and "Cumulative".
+    """
+    if isinstance(df, CompactWorklog):
+        earned = pd.Series(df.earned, index=pd.DatetimeIndex(df.date))
+    else:
+        earned = pd.Series(df["Earned"].to_numpy(), index=pd.to_datetime(df["Date"]))
+    earned = earned.groupby(level=0).sum().sort_index()
+    if freq == "W":
+        # Pay periods start on a Sunday, so weeks end on Saturday
+        earned = earned.resample("W-SAT").sum()
+    cumulative = earned.cumsum()
+    if len(cumulative) > max_points:
+        step = math.ceil(len(cumulative) / max_points)
+        keep = list(range(step - 1, len(cumulative), step))
+        if keep[-1] != len(cumulative) - 1:
+            keep.append(len(cumulative) - 1)
+        cumulative = cumulative.iloc[keep]
+    # Per-bucket earnings are re-derived from the running total so they stay correct after downsampling
+    return pd.DataFrame({"Earned": cumulative.diff().fillna(cumulative.iloc[:1]), "Cumulative": cumulative})
+
+
+def cumulative_chart(key, data, freq="D"):
+    """Line chart of cumulative earnings, cached on ``key`` (e.g. path and data_version).
+
+    ``data`` is the worklog frame, or a function returning it that is only
+    called on a cache miss.
+    """
+    def build():
+        import plotly.express as px
+        series = cumulative_earnings(data() if callable(data) else data, freq)
+        fig = px.line(series.reset_index(names="Date"), x="Date", y="Cumulative",
+                      hover_data={"Earned": ":.2f", "Cumulative": ":.2f"}, markers=len(series) <= 60)
+        fig.update_traces(line_color="green")
+        fig.update_layout(yaxis_title="Cumulative earned", xaxis_title=None)
+        return fig
+
+    return _series_cache.get_or_build(None if key is None else (key, freq), build)
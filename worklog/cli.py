@@ -0,0 +1,210 @@
+"""
+Command line for everyday worklog operations, for cron jobs and scripts.
+
+    python -m worklog log                       # 4 hours today
+    python -m worklog log 2025-09-15 --hours 3.5
+    python -m worklog remove 2025-09-15
+    python -m worklog totals --worker alice
+    python -m worklog show --status Logged
+    python -m worklog show --as-of 2025-10-01T09:00  # as the worklog was then
+    python -m worklog history --date 2025-09-15      # who changed what, when
+    python -m worklog report --by month alice bob
+    python -m worklog export history.parquet alice --from 2024-01-01
+    python -m worklog import history.parquet
+
+Only the standard library is imported until a command runs, so ``--help``
+and argument errors return immediately; streamlit and plotly are never
+imported.
+"""
+
+import argparse
+import datetime
+import sys
+
+
+def _worklog(args):
+    from worklog.core import open_worklog
+    return open_worklog(args.file, args.worker, args.date)
+
+
+def _existing_path(args, date=None):
+    """The file a command reads or clears: the worker's period containing ``date`` (today by default), else --file.
+
+    Unlike ``log``, these commands never create a period; None (after
+    saying so) if the worker has none for that day.
+    """
+    if args.worker is None:
+        from worklog.core import worklog_path
+        return worklog_path(args.file)
+    from worklog.periods import find_period
+    date = date or datetime.date.today()
+    period = find_period(args.worker, date)
+    if period is None:
+        print(f"{args.worker} has no pay period containing {date}", file=sys.stderr)
+        return None
+    return period.path
+
+
+def _existing_worklog(args, date=None):
+    from worklog.core import open_worklog
+    from worklog.workdays import load_calendar
+    if args.worker is None:
+        return open_worklog(args.file)  # The default file is still rolled over when due
+    path = _existing_path(args, date)
+    return None if path is None else open_worklog(path, calendar=load_calendar(args.worker))
+
+
+def _log(args):
+    from worklog.core import LOGGED, log_day
+    result = log_day(_worklog(args), args.date, args.hours, args.overwrite)
+    print(f"{result.date} ({result.day}): {result.status}, {result.hours:g} hours")
+    return 0 if result.status == LOGGED else 1
+
+
+def _remove(args):
+    from worklog.core import REMOVED, remove_day
+    worklog = _existing_worklog(args, args.date)
+    if worklog is None:
+        return 1
+    result = remove_day(worklog, args.date)
+    print(f"{result.date} ({result.day}): {result.status}, {result.hours:g} hours")
+    return 0 if result.status == REMOVED else 1
+
+
+def _totals(args):
+    worklog = _existing_worklog(args)
+    if worklog is None:
+        return 1
+    totals = worklog.totals
+    print(f"Earned:   £{totals.earned:.2f}")
+    print(f"To earn:  £{totals.to_earn:.2f}")
+    print(f"Overall:  £{totals.overall:.2f}")
+    print(f"Workdays: {totals.workdays.count()} ({totals.expected_hours} hours expected)")
+    return 0
+
+
+def _show(args):
+    from worklog.core import DEFAULT_WORKER
+    from worklog.storage import load_range
+    from worklog.table import Query, select
+    from worklog.totals import Totals
+    from worklog.workdays import load_calendar
+    path = _existing_path(args, args.start)
+    if path is None:
+        return 1
+    calendar = load_calendar(args.worker or DEFAULT_WORKER)
+    if args.as_of is not None:
+        from worklog.audit import as_of
+        try:
+            df = as_of(path, args.as_of, calendar)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+        df = df[(df["Date"] >= (args.start or datetime.date.min)) & (df["Date"] <= (args.end or datetime.date.max))]
+    else:
+        # Only the requested dates are read (an index range scan for SQLite worklogs)
+        df = load_range(path, args.start, args.end)
+        Totals.from_frame(df, calendar)
+    print(df.iloc[select(df, Query(status=args.status))].to_string(index=False))
+    return 0
+
+
+def _history(args):
+    from worklog.audit import trail
+    path = _existing_path(args, args.date)
+    if path is None:
+        return 1
+    df = trail(path, args.date, args.since, args.until)
+    print(df.to_string(index=False) if len(df) else "No changes recorded")
+    return 0
+
+
+def _report(args):
+    from worklog.periods import list_workers
+    from worklog.rollups import rollups
+    report = rollups(args.workers or list_workers(), args.by, args.start, args.end)
+    print(report.to_string(index=False, formatters={"Utilization": "{:.0%}".format}))
+    return 0
+
+
+def _export(args):
+    from worklog.transfer import export
+    rows = export(args.dst, args.workers or None, args.start, args.end, args.file, args.format)
+    print(f"Exported {rows} rows to {args.dst}")
+    return 0
+
+
+def _import(args):
+    from worklog.transfer import import_file
+    result = import_file(args.src, args.file, args.worker, args.format)
+    print(f"Read {result.rows} rows: {result.upserted} changed, {result.periods_created} periods created")
+    for reason, rows in result.rejected.items():
+        print(f"  skipped {rows} rows: {reason}")
+    return 1 if result.rejected else 0
+
+
+def main(argv=None):
+    today = datetime.date.today()
+    parser = argparse.ArgumentParser(prog="python -m worklog", description="Log and inspect work hours.")
+    where = argparse.ArgumentParser(add_help=False)
+    where.add_argument("--file", help="worklog file (default: $WORKLOG_FILE or worklog.csv)")
+    where.add_argument("--worker", help="use this worker's pay period instead of --file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    log_cmd = commands.add_parser("log", parents=[where], help="log hours on a day (today by default)")
+    log_cmd.add_argument("date", nargs="?", type=datetime.date.fromisoformat, default=today)
+    log_cmd.add_argument("--hours", type=float, default=4.0, help="hours worked (default: %(default)s)")
+    log_cmd.add_argument("--overwrite", action="store_true", help="replace hours already logged that day")
+    log_cmd.set_defaults(run=_log)
+
+    remove_cmd = commands.add_parser("remove", parents=[where], help="clear the hours logged on a day")
+    remove_cmd.add_argument("date", type=datetime.date.fromisoformat)
+    remove_cmd.set_defaults(run=_remove)
+
+    totals_cmd = commands.add_parser("totals", parents=[where], help="print earned / to earn / overall")
+    totals_cmd.set_defaults(run=_totals)
+
+    show_cmd = commands.add_parser("show", parents=[where], help="print the worklog rows")
+    show_cmd.add_argument("--from", dest="start", type=datetime.date.fromisoformat)
+    show_cmd.add_argument("--to", dest="end", type=datetime.date.fromisoformat)
+    show_cmd.add_argument("--status", choices=["All", "Logged", "Unlogged"], default="All")
+    show_cmd.add_argument("--as-of", type=datetime.datetime.fromisoformat,
+                          help="show the rows as they were at this time, e.g. 2025-10-01T09:00")
+    show_cmd.set_defaults(run=_show)
+
+    history_cmd = commands.add_parser("history", parents=[where], help="print the audit trail of changes")
+    history_cmd.add_argument("--date", type=datetime.date.fromisoformat, help="only changes to this day")
+    history_cmd.add_argument("--since", type=datetime.datetime.fromisoformat)
+    history_cmd.add_argument("--until", type=datetime.datetime.fromisoformat)
+    history_cmd.set_defaults(run=_history)
+
+    report_cmd = commands.add_parser("report", help="weekly / monthly / per-period totals and utilization")
+    report_cmd.add_argument("workers", nargs="*", help="workers to report on (default: all)")
+    report_cmd.add_argument("--by", choices=["week", "month", "period"], default="week")
+    report_cmd.add_argument("--from", dest="start", type=datetime.date.fromisoformat)
+    report_cmd.add_argument("--to", dest="end", type=datetime.date.fromisoformat)
+    report_cmd.set_defaults(run=_report)
+
+    formats = ["csv", "jsonl", "parquet"]
+    export_cmd = commands.add_parser("export", help="stream rows out as CSV / JSON lines / Parquet")
+    export_cmd.add_argument("dst", help="file to write, e.g. history.jsonl")
+    export_cmd.add_argument("workers", nargs="*", help="workers to export (default: all)")
+    export_cmd.add_argument("--file", help="export this worklog file instead of workers' periods")
+    export_cmd.add_argument("--from", dest="start", type=datetime.date.fromisoformat)
+    export_cmd.add_argument("--to", dest="end", type=datetime.date.fromisoformat)
+    export_cmd.add_argument("--format", choices=formats, help="default: from the file extension")
+    export_cmd.set_defaults(run=_export)
+
+    import_cmd = commands.add_parser("import", help="validate and upsert rows from an export, chunk by chunk")
+    import_cmd.add_argument("src", help="CSV / JSON lines / Parquet file with Date and Hours Worked columns")
+    import_cmd.add_argument("--file", help="import every row into this worklog file")
+    import_cmd.add_argument("--worker", help="import every row as this worker's")
+    import_cmd.add_argument("--format", choices=formats, help="default: from the file extension")
+    import_cmd.set_defaults(run=_import)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Compact typed representation of a worker's full history, for the all-periods chart.
+
+The UI-facing frame stores a Python ``datetime.date`` object, a day-name
+string, a repeated hourly rate and two derived money columns per row. A
+CompactWorklog keeps only what can't be derived:
+
+    day      int32    days since 1970-01-01
+    hours    float32  hours worked
+    rate     uint8/16 code into a small table of distinct hourly rates
+    worker   uint16   code into a table of worker names (optional)
+
+Earned is computed from these on read. The all-periods history behind the
+cumulative earnings chart (``periods.load_history``) is held this way; a
+single period's worklog stays a regular frame.
+"""
+
+import datetime
+
+import numpy as np
+
+EPOCH = datetime.date(1970, 1, 1)
+WEEKDAYS = np.array(["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"])
+EPOCH_WEEKDAY = EPOCH.weekday()  # 1970-01-01 was a Thursday; for the workday bitmaps
+
+
+def _codes(values):
+    """Encodes values as the smallest unsigned codes into a table of distinct values."""
+    table, codes = np.unique(values, return_inverse=True)
+    dtype = np.uint8 if len(table) <= 2**8 else np.uint16 if len(table) <= 2**16 else np.uint32
+    return table, codes.astype(dtype)
+
+
+class CompactWorklog:
+    """Column arrays for many worklog rows, a few bytes each."""
+
+    def __init__(self, day, hours, rate_code, rates, worker_code=None, workers=None):
+        self.day = day
+        self.hours = hours
+        self.rate_code = rate_code
+        self.rates = rates
+        self.worker_code = worker_code
+        self.workers = workers
+
+    @classmethod
+    def from_frame(cls, df, worker=None):
+        """Encodes a UI-facing worklog frame, optionally tagging every row with a worker."""
+        day = np.asarray(df["Date"], dtype="datetime64[D]").astype(np.int32)
+        rates, rate_code = _codes(df["Hourly Rate"].to_numpy(dtype=float))
+        compact = cls(day, df["Hours Worked"].to_numpy(dtype=np.float32), rate_code, rates)
+        if worker is not None:
+            compact.worker_code = np.zeros(len(day), dtype=np.uint16)
+            compact.workers = np.array([worker])
+        return compact
+
+    @classmethod
+    def concat(cls, parts):
+        """Joins several compact worklogs, re-encoding the rate and worker tables."""
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return cls(np.empty(0, np.int32), np.empty(0, np.float32), np.empty(0, np.uint8), np.empty(0))
+        rates, rate_code = _codes(np.concatenate([p.rate for p in parts]))
+        compact = cls(np.concatenate([p.day for p in parts]), np.concatenate([p.hours for p in parts]),
+                      rate_code, rates)
+        if all(p.workers is not None for p in parts):
+            compact.workers, compact.worker_code = _codes(np.concatenate([p.worker for p in parts]))
+        return compact
+
+    def __len__(self):
+        return len(self.day)
+
+    @property
+    def nbytes(self):
+        arrays = [self.day, self.hours, self.rate_code, self.rates, self.worker_code]
+        return sum(a.nbytes for a in arrays if a is not None)
+
+    # --- Derived columns ---
+    @property
+    def date(self):
+        return self.day.astype("datetime64[D]")
+
+    @property
+    def rate(self):
+        return self.rates[self.rate_code]
+
+    @property
+    def worker(self):
+        return None if self.workers is None else self.workers[self.worker_code]
+
+    @property
+    def earned(self):
+        return self.hours.astype(float) * self.rate
+
+
+def load_compact(path, worker=None):
+    """Loads a worklog file straight into compact form, reading only the columns it keeps."""
+    from worklog.storage import load_data
+    return CompactWorklog.from_frame(load_data(path, columns=["Date", "Hours Worked", "Hourly Rate"]), worker)
@@ -0,0 +1,108 @@
+"""
+Headless worklog operations: the rules behind the apps' buttons, without a UI.
+
+Every function works on a worklog object with ``df``, ``index``, ``totals``,
+``read_only`` and ``set_hours``: a CachedWorklog for a file on disk (``open_worklog``) or a
+MemoryWorklog for a frame that is never saved. The Streamlit apps and the
+``python -m worklog`` command line both call these, so a button and a cron
+job apply exactly the same checks.
+"""
+
+import collections
+import datetime
+
+from worklog.cache import CACHE
+from worklog.index import DateIndex
+from worklog.periods import ARCHIVE_AFTER_DAYS, DEFAULT_WORKER, current_period, period_bounds, roll_over
+from worklog.storage import DATA_FILE
+from worklog.totals import DAILY_HOURS, Totals
+from worklog.workdays import load_calendar
+
+# --- Outcomes of log_day / remove_day ---
+LOGGED = "logged"
+REMOVED = "removed"
+NON_WORKING = "non-working"
+ALREADY_LOGGED = "already logged"
+NOT_LOGGED = "not logged"
+MISSING = "missing"
+ARCHIVED = "archived"
+
+LogResult = collections.namedtuple("LogResult", ["status", "date", "day", "hours"])
+
+
+class MemoryWorklog:
+    """A worklog frame kept only in memory, with the same interface as CachedWorklog."""
+
+    def __init__(self, df, calendar):
+        self.path = None
+        self.version = None
+        self.read_only = False
+        self.df = df
+        self.index = DateIndex(df)
+        self.totals = Totals.from_frame(df, calendar)
+
+    def set_hours(self, date, hours):
+        return self.totals.set_hours(self.df, self.index.position(date), hours)
+
+
+def worklog_path(path=None, worker=None, date=None):
+    """The file to use: the worker's period containing ``date`` (created if needed), else ``path``."""
+    if worker is not None:
+        return current_period(worker, date).path
+    return path or DATA_FILE
+
+
+def open_worklog(path=None, worker=None, date=None, calendar=None):
+    """Returns the shared worklog of a file, or of the worker's period containing ``date``.
+
+    A worker's period is created if it doesn't exist yet. The calendar
+    defaults to the worker's (or everyone's) calendar.
+    The default file (no path, no worker) is rolled over first when today
+    is past its last day or its oldest period is due for archiving.
+    """
+    calendar = load_calendar(worker or DEFAULT_WORKER) if calendar is None else calendar
+    worklog = CACHE.get(worklog_path(path, worker, date), calendar)
+    if path is None and worker is None and _needs_roll_over(worklog.index):
+        CACHE.flush()
+        # Waits for any roll-over already under way and then has nothing left to do
+        roll_over(DATA_FILE)
+        worklog = CACHE.get(DATA_FILE, calendar)  # Reloaded, whoever rolled it over
+    return worklog
+
+
+def _needs_roll_over(index, today=None):
+    today = today or datetime.date.today()
+    closed_before = today - datetime.timedelta(days=ARCHIVE_AFTER_DAYS)
+    return index.end < today or period_bounds(index.start)[1] < closed_before
+
+
+def log_day(worklog, date, hours=DAILY_HOURS, overwrite=False):
+    """Logs ``hours`` on ``date`` unless it's a non-working day or (without overwrite) already logged."""
+    idx = worklog.index.position(date)
+    if idx is None:
+        return LogResult(MISSING, date, None, 0.0)
+    day = worklog.df.at[idx, "Day"]
+    logged = float(worklog.df.at[idx, "Hours Worked"])
+    if worklog.read_only:
+        return LogResult(ARCHIVED, date, day, logged)
+    if not worklog.totals.workdays.is_workday(date):
+        return LogResult(NON_WORKING, date, day, logged)
+    if logged > 0 and not overwrite:
+        return LogResult(ALREADY_LOGGED, date, day, logged)
+    worklog.set_hours(date, hours)
+    return LogResult(LOGGED, date, day, float(hours))
+
+
+def remove_day(worklog, date):
+    """Clears the hours logged on ``date``, if there are any."""
+    idx = worklog.index.position(date)
+    if idx is None:
+        return LogResult(MISSING, date, None, 0.0)
+    day = worklog.df.at[idx, "Day"]
+    logged = float(worklog.df.at[idx, "Hours Worked"])
+    if worklog.read_only:
+        return LogResult(ARCHIVED, date, day, logged)
+    if logged <= 0:
+        return LogResult(NOT_LOGGED, date, day, 0.0)
+    worklog.set_hours(date, 0.0)
+    return LogResult(REMOVED, date, day, logged)
@@ -0,0 +1,46 @@
+"""
+Constant-time date -> row lookup for a worklog frame.
+
+A worklog covers one contiguous run of days, so the row of a date is simply
+its day offset from the first date. Frames with gaps or an unusual order fall
+back to a dict; either way a lookup no longer scans the ``Date`` column.
+"""
+
+import numpy as np
+
+
+class DateIndex:
+    """Maps each date in a worklog frame to its row label."""
+
+    def __init__(self, df):
+        self.labels = df.index
+        days = np.asarray(df["Date"], dtype="datetime64[D]")
+        if len(days) == 0:
+            self.start = self.end = None
+            self._offset = None
+            self._rows = {}
+            return
+        self.start = days.min().item()
+        self.end = days.max().item()
+        if bool(np.all(np.diff(days) == np.timedelta64(1, "D"))):
+            # Contiguous period: the row is just the ordinal-day offset
+            self._offset = self.start.toordinal()
+            self._rows = None
+        else:
+            self._offset = None
+            self._rows = dict(zip(days.tolist(), self.labels))
+
+    def position(self, date):
+        """Returns the row label for ``date``, or None if the worklog doesn't cover it."""
+        if self._offset is None:
+            return self._rows.get(date)
+        i = date.toordinal() - self._offset
+        if 0 <= i < len(self.labels):
+            return self.labels[i]
+        return None
+
+    def __contains__(self, date):
+        return self.position(date) is not None
+
+    def __len__(self):
+        return len(self.labels)
@@ -0,0 +1,51 @@
+"""
+Advisory file locks around worklog reads and writes.
+
+Every snapshot gets a sibling ``<path>.lock`` file. Writers take it
+exclusively and readers take it shared. The lock is held on a fresh file
+descriptor each time, so it excludes other threads of the same process as
+well as other processes.
+"""
+
+import contextlib
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def lock_path(path):
+    """Returns the lock file that guards a snapshot and its WAL."""
+    return path + ".lock"
+
+
+@contextlib.contextmanager
+def file_lock(path, shared=False):
+    """Holds the advisory lock for ``path`` for the duration of the block."""
+    fd = os.open(lock_path(path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            # msvcrt has no shared locks; readers simply queue behind writers
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        os.close(fd)
+
+
+def fsync_file(path):
+    """Flushes a file that was written by a library that doesn't fsync itself."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
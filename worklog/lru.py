@@ -0,0 +1,32 @@
+"""A small thread-safe least-recently-used cache shared by the view helpers."""
+
+import collections
+import threading
+
+
+class LRUCache:
+    """Keeps the ``maxsize`` most recently used entries; ``None`` keys are never cached."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        """Returns the cached value for ``key``, calling ``build()`` to create it on a miss."""
+        if key is None:
+            return build()
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,243 @@
+"""
+Worklogs keyed by worker and pay period.
+
+Each (worker, period) pair is its own partition on disk:
+
+    worklogs/<worker>/<start>_<end>.csv   (+ its .wal)
+
+so loading one worker's current period reads only that file. Periods are
+found by listing file names; no partition is opened to list them.
+
+A period that ended more than ``ARCHIVE_AFTER_DAYS`` ago is closed:
+``archive_closed`` replaces its partition with a gzipped, read-only
+``<start>_<end>.csv.gz`` and writes its rollup summary once, so reports and
+reruns never touch its days again. A single-file worklog (``DATA_FILE``)
+rolls over the same way with ``roll_over``: it gets the rows of the period
+containing today when that starts, and its closed periods move out to
+``<file>-archive/``. Either way the files that change stay one or two
+periods long.
+"""
+
+import collections
+import datetime
+import functools
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from worklog.compact_history import CompactWorklog, load_compact
+from worklog.storage import (DATA_FILE, END_DATE, START_DATE, archive_data, data_version, default_frame,
+                             load_data, save_data, update_data, write_archive)
+
+# --- Settings ---
+DATA_DIR = os.environ.get("WORKLOG_DIR", "worklogs")
+PERIOD_DAYS = (END_DATE - START_DATE).days + 1  # Pay periods repeat the original four-week cycle
+EXTENSION = os.path.splitext(DATA_FILE)[1] or ".csv"
+DEFAULT_WORKER = "*"  # Stands for every worker in per-worker settings (rates, calendars)
+ARCHIVE_EXTENSION = ".csv.gz"  # Closed periods: compressed and read-only
+ARCHIVE_AFTER_DAYS = 14  # Days after a period ends during which late edits are still allowed
+
+_WORKER_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+_PARTITION_NAME = re.compile(r"^(\d{4}-\d{2}-\d{2})_(\d{4}-\d{2}-\d{2})(\.csv\.gz|\.\w+)$")
+
+Period = collections.namedtuple("Period", ["worker", "start", "end", "path"])
+
+
+def is_worker_name(name):
+    """True if ``name`` can be used as a worker (it names the worker's partition directory)."""
+    return bool(_WORKER_NAME.match(name or ""))
+
+
+def _check_worker(worker):
+    if not is_worker_name(worker):
+        raise ValueError(f"Invalid worker name {worker!r}: use letters, digits, '_', '.' or '-'")
+
+
+def period_bounds(day):
+    """Returns (start, end) of the pay period containing ``day``, aligned to START_DATE."""
+    offset = (day - START_DATE).days // PERIOD_DAYS * PERIOD_DAYS
+    start = START_DATE + datetime.timedelta(days=offset)
+    return start, start + datetime.timedelta(days=PERIOD_DAYS - 1)
+
+
+def partition_path(worker, start, end, root=DATA_DIR, extension=EXTENSION):
+    """Returns the file that holds one worker's worklog for one period."""
+    _check_worker(worker)
+    return os.path.join(root, worker, f"{start.isoformat()}_{end.isoformat()}{extension}")
+
+
+def worker_of(path):
+    """Returns the worker a partition file belongs to, or None for any other worklog file."""
+    worker = os.path.basename(os.path.dirname(os.path.abspath(path)))
+    if _PARTITION_NAME.match(os.path.basename(path)) and _WORKER_NAME.match(worker):
+        return worker
+    return None
+
+
+def is_archived(path):
+    """True for the read-only partition of a closed period."""
+    return path.endswith(ARCHIVE_EXTENSION)
+
+
+def archive_path(path):
+    """The archived partition a live one becomes: same directory and dates, ARCHIVE_EXTENSION."""
+    name = os.path.basename(path)
+    return os.path.join(os.path.dirname(path), name[:name.index(".")] + ARCHIVE_EXTENSION)
+
+
+def list_workers(root=DATA_DIR):
+    """Returns the names of all workers that have at least one period."""
+    if not os.path.isdir(root):
+        return []
+    return sorted(name for name in os.listdir(root)
+                  if _WORKER_NAME.match(name) and os.path.isdir(os.path.join(root, name)))
+
+
+def list_periods(worker, root=DATA_DIR):
+    """Returns a worker's periods, oldest first."""
+    _check_worker(worker)
+    directory = os.path.join(root, worker)
+    if not os.path.isdir(directory):
+        return []
+    periods = {}
+    for name in os.listdir(directory):
+        match = _PARTITION_NAME.match(name)
+        if match:
+            start, end = (datetime.date.fromisoformat(match.group(i)) for i in (1, 2))
+            path = os.path.join(directory, name)
+            # An archive wins over a live file that an interrupted archive_period left behind
+            if start not in periods or is_archived(path):
+                periods[start] = Period(worker, start, end, path)
+    return [periods[start] for start in sorted(periods)]
+
+
+def find_period(worker, day, root=DATA_DIR):
+    """Returns the worker's period that contains ``day``, or None."""
+    for period in list_periods(worker, root):
+        if period.start <= day <= period.end:
+            return period
+    return None
+
+
+def create_period(worker, start_date, end_date, hourly_rate=None, root=DATA_DIR):
+    """Creates an empty worklog partition for one worker and period.
+
+    Day rates come from the worker's rate schedule unless ``hourly_rate`` is
+    given. Raises ValueError if it would overlap one of the worker's
+    existing periods.
+    """
+    if end_date < start_date:
+        raise ValueError(f"Period ends ({end_date}) before it starts ({start_date})")
+    for period in list_periods(worker, root):
+        if start_date <= period.end and period.start <= end_date:
+            raise ValueError(f"{worker} already has a period from {period.start} to {period.end}")
+    path = partition_path(worker, start_date, end_date, root)
+    if hourly_rate is None:
+        from worklog.rates import load_rates, rates_for  # rates builds on this module
+        hourly_rate = rates_for(load_rates(), worker, pd.date_range(start_date, end_date))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    save_data(default_frame(start_date, end_date, hourly_rate), path, action="create")
+    return Period(worker, start_date, end_date, path)
+
+
+def current_period(worker, today=None, hourly_rate=None, root=DATA_DIR):
+    """Returns the worker's period containing today, creating it if needed."""
+    today = today or datetime.date.today()
+    period = find_period(worker, today, root)
+    if period is None:
+        period = create_period(worker, *period_bounds(today), hourly_rate=hourly_rate, root=root)
+    return period
+
+
+def archive_period(period):
+    """Replaces a period's live partition (snapshot + WAL) with a gzipped, read-only one.
+
+    Its rollup summary is written at the same time and never rebuilt.
+    Returns the archived Period.
+    """
+    if is_archived(period.path):
+        return period
+    from worklog.rollups import summary_path, update_summary  # rollups builds on this module
+    path = archive_path(period.path)
+    df = archive_data(period.path, path)
+    update_summary(path, df, data_version(path))
+    if os.path.exists(summary_path(period.path)):
+        os.remove(summary_path(period.path))
+    return period._replace(path=path)
+
+
+def archive_closed(worker, today=None, after_days=ARCHIVE_AFTER_DAYS, root=DATA_DIR):
+    """Archives the worker's periods that ended more than ``after_days`` ago; returns those archived.
+
+    Cheap when there is nothing to do (one directory listing), so the apps
+    call it on every rerun.
+    """
+    cutoff = (today or datetime.date.today()) - datetime.timedelta(days=after_days)
+    return [archive_period(p) for p in list_periods(worker, root)
+            if p.end < cutoff and not is_archived(p.path)]
+
+
+def roll_over(path=DATA_FILE, today=None, after_days=ARCHIVE_AFTER_DAYS):
+    """Keeps a single-file worklog on the current pay period.
+
+    Once today is past the file's last day, the rows of the period
+    containing today are added (periods nobody opened the app in are
+    skipped), and periods that ended more than ``after_days`` ago move to
+    ``<file>-archive/<start>_<end>.csv.gz``. Returns True if the file changed.
+
+    The file stays locked throughout, so concurrent callers wait and then
+    find nothing left to do, and no change logged meanwhile is lost.
+    """
+    update = functools.partial(_roll_over, path=path, today=today or datetime.date.today(), after_days=after_days)
+    return update_data(path, update, action="roll over") is not None
+
+
+def _roll_over(df, path, today, after_days):
+    """The rolled-over frame, or None if it's already on the current period; see ``roll_over``."""
+    start, end = period_bounds(today)
+    changed = False
+    if df["Date"].iloc[-1] < end:
+        from worklog.rates import load_rates, rates_for  # rates builds on this module
+        first = max(df["Date"].iloc[-1] + datetime.timedelta(days=1), start)
+        rates = rates_for(load_rates(), DEFAULT_WORKER, pd.date_range(first, end))
+        df = pd.concat([df, default_frame(first, end, rates)], ignore_index=True)
+        df["Day"] = df["Day"].astype("category")
+        changed = True
+
+    # Start of each row's pay period, vectorized period_bounds
+    origin = np.datetime64(START_DATE, "D")
+    offsets = (np.asarray(df["Date"], dtype="datetime64[D]") - origin).astype(int)
+    period_starts = origin + offsets // PERIOD_DAYS * PERIOD_DAYS
+    closed = period_starts + (PERIOD_DAYS - 1) < np.datetime64(today - datetime.timedelta(days=after_days), "D")
+    if closed.any():
+        from worklog.rollups import update_summary  # rollups builds on this module
+        directory = os.path.splitext(path)[0] + "-archive"
+        os.makedirs(directory, exist_ok=True)
+        for first in np.unique(period_starts[closed]).astype(datetime.date):
+            last = first + datetime.timedelta(days=PERIOD_DAYS - 1)
+            archive = os.path.join(directory, f"{first.isoformat()}_{last.isoformat()}{ARCHIVE_EXTENSION}")
+            # Already there if an earlier roll_over was interrupted before saving the file
+            if not os.path.exists(archive):
+                rows = df[period_starts == np.datetime64(first, "D")].reset_index(drop=True)
+                update_summary(archive, rows, write_archive(rows, archive))
+        df = df[~closed].reset_index(drop=True)
+        changed = True
+
+    return df if changed else None
+
+
+def load_period(period, columns=None):
+    """Loads only the partition that belongs to ``period``."""
+    return load_data(period.path, columns=columns)
+
+
+def history_version(worker, root=DATA_DIR):
+    """A key that changes whenever any of a worker's partitions does; cheap, only stats live files."""
+    return tuple((p.path, None if is_archived(p.path) else data_version(p.path)) for p in list_periods(worker, root))
+
+
+def load_history(worker, root=DATA_DIR):
+    """Loads every one of a worker's periods, oldest first, as one CompactWorklog."""
+    return CompactWorklog.concat([load_compact(p.path, worker) for p in list_periods(worker, root)])
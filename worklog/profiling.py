@@ -0,0 +1,179 @@
+"""
+Opt-in timing and counters for app reruns and storage calls.
+
+Profiling is off by default, and then every hook below costs one flag check.
+Turn it on with ``WORKLOG_PROFILE=<log file>`` (``=1`` logs to
+``worklog-profile.jsonl``), with ``enable()``, or from an app's debug panel.
+
+An app script marks its rerun like this:
+
+    begin_run("App4")        # top of the script
+    ...
+    lap("load")              # time since the previous lap is the "load" stage
+    ...
+    run = end_run()          # bottom: finish the record and log it
+
+Library functions wrapped with ``@timed`` (or a ``timer`` block) add their
+call count and time to the current run. ``count`` adds to the run's counters:
+rows read and written, bytes persisted, cache hits and misses. Each finished
+run is appended to the log file as one JSON line, and the last few are kept
+for the debug panel. Work done outside any run, such as background
+compaction, still goes into the process-wide ``TOTALS``.
+"""
+
+import collections
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+DEFAULT_LOG = "worklog-profile.jsonl"
+RECENT_RUNS = 20
+
+_setting = os.environ.get("WORKLOG_PROFILE", "")
+_enabled = _setting not in ("", "0")
+_log_path = (DEFAULT_LOG if _setting in ("1", "true", "yes") else _setting) if _enabled else None
+
+_local = threading.local()
+_lock = threading.Lock()
+_NOOP = contextlib.nullcontext()
+
+RECENT = collections.deque(maxlen=RECENT_RUNS)
+TOTALS = collections.Counter()  # Process-wide counters, including work outside any run
+
+
+class Run:
+    """Timings and counters of one app rerun."""
+
+    def __init__(self, label):
+        self.label = label
+        self.started = time.time()
+        self.status = "running"
+        self.seconds = None
+        self.stages = []  # (name, seconds), in order
+        self.calls = {}  # name -> [count, seconds]
+        self.counters = collections.Counter()
+        self._began = self._lap = time.perf_counter()
+
+    def as_dict(self):
+        return {
+            "label": self.label,
+            "started": self.started,
+            "status": self.status,
+            "ms": round(self.seconds * 1000, 3),
+            "stages": {name: round(seconds * 1000, 3) for name, seconds in self.stages},
+            "calls": {name: {"count": n, "ms": round(seconds * 1000, 3)} for name, (n, seconds) in self.calls.items()},
+            "counters": dict(self.counters),
+        }
+
+
+def enabled():
+    return _enabled
+
+
+def enable(log_path=DEFAULT_LOG):
+    """Turns profiling on for the whole process; ``log_path=None`` keeps runs in memory only."""
+    global _enabled, _log_path
+    _log_path = log_path
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+    _local.run = None
+
+
+def current_run():
+    return getattr(_local, "run", None) if _enabled else None
+
+
+def begin_run(label):
+    """Starts timing a rerun on this thread; returns the Run, or None when profiling is off."""
+    if not _enabled:
+        return None
+    previous = getattr(_local, "run", None)
+    if previous is not None:
+        # st.rerun() and st.stop() raise before the script reaches end_run
+        _finish(previous, "interrupted")
+    _local.run = Run(label)
+    return _local.run
+
+
+def end_run():
+    """Finishes this thread's rerun, logs it and returns it (None if none was running)."""
+    run = current_run()
+    if run is None:
+        return None
+    _local.run = None
+    _finish(run, "done")
+    return run
+
+
+def _finish(run, status):
+    run.status = status
+    run.seconds = time.perf_counter() - run._began
+    with _lock:
+        RECENT.append(run)
+        if _log_path:
+            with open(_log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(run.as_dict()) + "\n")
+
+
+def lap(name):
+    """Ends the current stage of the rerun: the time since the previous lap is recorded as ``name``."""
+    run = current_run()
+    if run is not None:
+        now = time.perf_counter()
+        run.stages.append((name, now - run._lap))
+        run._lap = now
+
+
+def _record_call(name, seconds):
+    run = current_run()
+    if run is not None:
+        entry = run.calls.setdefault(name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+    with _lock:
+        TOTALS[f"{name} calls"] += 1
+
+
+@contextlib.contextmanager
+def _timer(name):
+    began = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record_call(name, time.perf_counter() - began)
+
+
+def timer(name):
+    """Context manager that adds one call of ``name`` to the current run."""
+    return _timer(name) if _enabled else _NOOP
+
+
+def timed(name):
+    """Decorator version of ``timer``."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _timer(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, n=1):
+    """Adds ``n`` to a counter of the current run and to TOTALS."""
+    if not _enabled:
+        return
+    run = current_run()
+    if run is not None:
+        run.counters[name] += n
+    with _lock:
+        TOTALS[name] += n
@@ -0,0 +1,170 @@
+"""
+Hourly rate history and the vectorized earnings engine.
+
+Rates live in a small schedule table (``worklogs/rates.csv``):
+
+    Worker, Effective From, Hourly Rate
+    *,      2025-09-14,     12.48        <- default for everyone
+    alice,  2025-10-12,     13.50        <- alice's rate from that day on
+
+The rate for any set of dates is found with one ``searchsorted`` per worker
+against the effective-from dates, so repricing or auditing millions of rows
+is a handful of array operations rather than a per-row loop.
+
+    python -m worklog.rates set alice 2025-10-12 13.50
+    python -m worklog.rates show
+    python -m worklog.rates reprice alice --since 2025-10-12
+    python -m worklog.rates audit alice
+"""
+
+import argparse
+import datetime
+import os
+
+import numpy as np
+import pandas as pd
+
+from worklog.locking import file_lock
+from worklog.periods import DATA_DIR, DEFAULT_WORKER, is_archived, list_periods
+from worklog.storage import HOURLY_RATE, load_data, update_data
+from worklog.totals import Totals
+from worklog.workdays import day_numbers, load_calendar
+
+RATES_FILE = os.path.join(DATA_DIR, "rates.csv")
+
+
+def load_rates(path=RATES_FILE):
+    """Returns the rate schedule, sorted by worker and effective date."""
+    if not os.path.exists(path):
+        return pd.DataFrame({"Worker": pd.Series(dtype=str), "Effective From": pd.Series(dtype=object),
+                             "Hourly Rate": pd.Series(dtype=float)})
+    schedule = pd.read_csv(path, dtype={"Worker": str})
+    schedule["Effective From"] = pd.to_datetime(schedule["Effective From"], format="%Y-%m-%d").dt.date
+    return schedule.sort_values(["Worker", "Effective From"], kind="stable", ignore_index=True)
+
+
+def set_rate(worker, effective_from, hourly_rate, path=RATES_FILE):
+    """Adds (or replaces) the rate a worker is paid from ``effective_from`` onwards."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with file_lock(path):
+        schedule = load_rates(path)
+        keep = ~((schedule["Worker"] == worker) & (schedule["Effective From"] == effective_from))
+        entry = pd.DataFrame({"Worker": [worker], "Effective From": [effective_from], "Hourly Rate": [float(hourly_rate)]})
+        schedule = pd.concat([schedule[keep], entry], ignore_index=True)
+        schedule = schedule.sort_values(["Worker", "Effective From"], kind="stable", ignore_index=True)
+        tmp = path + ".tmp"
+        schedule.to_csv(tmp, index=False)
+        os.replace(tmp, path)
+    return schedule
+
+
+def rates_for(schedule, worker, dates):
+    """Hourly rate on each of ``dates`` for one worker, in one vectorized pass.
+
+    The worker's own entries override the default (``*``) ones from their
+    first effective date; dates before any entry get HOURLY_RATE.
+    """
+    days = day_numbers(dates)
+    result = np.full(len(days), HOURLY_RATE)
+    for who in (DEFAULT_WORKER, worker):
+        entries = schedule[schedule["Worker"] == who]
+        if entries.empty:
+            continue
+        effective = day_numbers(entries["Effective From"])
+        i = np.searchsorted(effective, days, side="right") - 1
+        found = i >= 0
+        result[found] = entries["Hourly Rate"].to_numpy()[i[found]]
+    return result
+
+
+def _mismatches(df, rates):
+    """Rows whose stored rate or Earned disagrees with the scheduled ``rates``."""
+    earned = df["Hours Worked"].to_numpy() * rates
+    return ~np.isclose(rates, df["Hourly Rate"].to_numpy()) | ~np.isclose(earned, df["Earned"].to_numpy())
+
+
+def reprice(path, worker=DEFAULT_WORKER, schedule=None, calendar=None):
+    """Rewrites Hourly Rate / Earned / To Earn of one worklog file from the schedule.
+
+    Returns the number of rows that changed.
+    """
+    schedule = load_rates() if schedule is None else schedule
+    calendar = load_calendar(worker) if calendar is None else calendar
+    changed = 0
+
+    def update(df):
+        nonlocal changed
+        rates = rates_for(schedule, worker, df["Date"])
+        changed = int(np.count_nonzero(_mismatches(df, rates)))
+        if not changed:
+            return None
+        df["Hourly Rate"] = rates
+        df["Earned"] = df["Hours Worked"] * rates
+        Totals.from_frame(df, calendar)
+        return df
+
+    # Under the file's lock, so a change logged meanwhile is repriced rather than lost or stale
+    update_data(path, update, action="reprice")
+    return changed
+
+
+def reprice_worker(worker, since=None, schedule=None, calendar=None):
+    """Reprices every live period of a worker that ends on or after ``since``; returns rows changed.
+
+    Archived periods keep the rates they were closed with.
+    """
+    schedule = load_rates() if schedule is None else schedule
+    calendar = load_calendar(worker) if calendar is None else calendar
+    return sum(reprice(p.path, worker, schedule, calendar)
+               for p in list_periods(worker) if (since is None or p.end >= since) and not is_archived(p.path))
+
+
+def audit(worker, schedule=None):
+    """Rows of a worker's whole history whose stored rate or Earned disagrees with the schedule.
+
+    Only the four columns involved are read from each partition.
+    """
+    schedule = load_rates() if schedule is None else schedule
+    reports = []
+    for period in list_periods(worker):
+        df = load_data(period.path, columns=["Date", "Hours Worked", "Hourly Rate", "Earned"])
+        rates = rates_for(schedule, worker, df["Date"])
+        wrong = _mismatches(df, rates)
+        if wrong.any():
+            reports.append(df[wrong].assign(**{"Scheduled Rate": rates[wrong],
+                                               "Scheduled Earned": df["Hours Worked"][wrong] * rates[wrong]}))
+    if not reports:
+        return pd.DataFrame(columns=["Date", "Hours Worked", "Hourly Rate", "Earned", "Scheduled Rate",
+                                     "Scheduled Earned"])
+    return pd.concat(reports, ignore_index=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage hourly rate history and reprice worklogs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    set_cmd = commands.add_parser("set", help="add a rate effective from a date")
+    set_cmd.add_argument("worker", help=f"worker name, or '{DEFAULT_WORKER}' for everyone")
+    set_cmd.add_argument("effective_from", type=datetime.date.fromisoformat)
+    set_cmd.add_argument("rate", type=float)
+    commands.add_parser("show", help="print the rate schedule")
+    reprice_cmd = commands.add_parser("reprice", help="recompute earnings from the schedule")
+    reprice_cmd.add_argument("worker")
+    reprice_cmd.add_argument("--since", type=datetime.date.fromisoformat, help="only periods ending on or after this date")
+    audit_cmd = commands.add_parser("audit", help="list rows whose rate disagrees with the schedule")
+    audit_cmd.add_argument("worker")
+    args = parser.parse_args(argv)
+
+    if args.command == "set":
+        set_rate(args.worker, args.effective_from, args.rate)
+        print(f"{args.worker}: £{args.rate:.2f}/h from {args.effective_from}")
+    elif args.command == "show":
+        print(load_rates().to_string(index=False))
+    elif args.command == "reprice":
+        print(f"Repriced {reprice_worker(args.worker, args.since)} rows for {args.worker}")
+    else:
+        report = audit(args.worker)
+        print(report.to_string(index=False) if len(report) else f"All of {args.worker}'s rows match the schedule")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Weekly, monthly and per-period rollups per worker, from materialized summaries.
+
+Every worklog file gets a small summary next to it (``<file>.summary.json``):
+its hours, expected hours, earned and to-earn amounts, workdays and days
+logged per week (Sunday to Saturday, like the pay periods), per calendar
+month and for the whole file. A report over years of history reads these
+few rows per period instead of the raw days.
+
+Summaries are kept up to date incrementally. ``save_data`` rewrites the
+summary of the one file it saved. A summary also records the
+``data_version`` it was built from, so one left behind by single-day WAL
+writes is rebuilt from that file alone the next time it is read. No read
+rescans the rest of the history. An archived period's summary is written
+when it is archived and, like the period, never changes: it is read once
+per process and its file isn't even stat'ed after that.
+
+    python -m worklog report --by month alice
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from worklog import storage
+from worklog.periods import DEFAULT_WORKER, is_archived, list_periods, worker_of
+from worklog.storage import data_version, load_data
+from worklog.totals import DAILY_HOURS
+from worklog.workdays import load_calendar
+
+LEVELS = ("week", "month", "period")
+MEASURES = ["Hours", "Expected Hours", "Earned", "To Earn", "Workdays", "Days Logged"]
+_COUNTS = ["Workdays", "Days Logged"]
+_COLUMNS = ["Date", "Hours Worked", "Hourly Rate", "Earned"]
+
+_archived = {}  # path -> summary of an archived period
+
+
+def summary_path(path):
+    return path + ".summary.json"
+
+
+def summarize(df, calendar):
+    """Week, month and whole-file rows of one worklog frame (Level, Start, End and MEASURES)."""
+    dates = pd.DatetimeIndex(pd.to_datetime(df["Date"]))
+    workday = calendar.covering(df["Date"]).mask(df["Date"])
+    hours = df["Hours Worked"].to_numpy(dtype=float)
+    earned = df["Earned"].to_numpy(dtype=float)
+    rate = df["Hourly Rate"].to_numpy(dtype=float)
+    daily = pd.DataFrame({
+        "Hours": hours,
+        "Expected Hours": np.where(workday, float(DAILY_HOURS), 0.0),
+        "Earned": earned,
+        "To Earn": np.where(workday, np.clip(DAILY_HOURS * rate - earned, 0.0, None), 0.0),
+        "Workdays": workday.astype(int),
+        "Days Logged": (hours > 0).astype(int),
+    })
+    parts = []
+    for level, periods in (("week", dates.to_period("W-SAT")), ("month", dates.to_period("M"))):
+        groups = daily.groupby([periods.start_time, periods.end_time.normalize()]).sum()
+        groups.index.names = ["Start", "End"]
+        parts.append(groups.reset_index().assign(Level=level))
+    if len(dates):
+        whole = daily.sum().to_frame().T.assign(Start=dates.min(), End=dates.max(), Level="period")
+        parts.append(whole)
+    summary = pd.concat(parts, ignore_index=True)[["Level", "Start", "End", *MEASURES]]
+    summary["Start"] = summary["Start"].dt.date
+    summary["End"] = summary["End"].dt.date
+    summary[_COUNTS] = summary[_COUNTS].astype(int)
+    return summary
+
+
+def _calendar_for(path):
+    return load_calendar(worker_of(path) or DEFAULT_WORKER)
+
+
+def update_summary(path, df=None, version=None):
+    """Rebuilds the summary of one worklog file (from ``df`` if given) and writes it atomically."""
+    if df is None:
+        version = data_version(path)
+        df = load_data(path, columns=_COLUMNS)
+    summary = summarize(df, _calendar_for(path))
+    record = {"version": version, "rows": json.loads(summary.to_json(orient="records", date_format="iso"))}
+    tmp = summary_path(path) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(record, f)
+    os.replace(tmp, summary_path(path))
+    return summary
+
+
+def _on_save(path, df, version):
+    if all(column in df.columns for column in _COLUMNS):
+        update_summary(path, df, version)
+
+
+storage.SAVE_HOOKS.append(_on_save)
+
+
+def load_summary(path):
+    """The summary of one worklog file, rebuilt first if the file changed since it was written."""
+    if path in _archived:
+        return _archived[path]
+    try:
+        with open(summary_path(path), encoding="utf-8") as f:
+            record = json.load(f)
+    except (FileNotFoundError, ValueError):
+        record = None
+    current = json.loads(json.dumps(data_version(path)))
+    if record is None or record["version"] != current:
+        summary = update_summary(path)
+    else:
+        summary = pd.DataFrame(record["rows"], columns=["Level", "Start", "End", *MEASURES])
+        for column in ("Start", "End"):
+            summary[column] = pd.to_datetime(summary[column]).dt.date
+        summary[_COUNTS] = summary[_COUNTS].astype(int)
+    if is_archived(path):
+        _archived[path] = summary
+    return summary
+
+
+def rollup(worker, level="week", start=None, end=None):
+    """One worker's rollup at ``level`` ("week", "month" or "period"), oldest first.
+
+    Rows that overlap [start, end] are kept. Utilization is hours logged over
+    hours expected on workdays.
+    """
+    if level not in LEVELS:
+        raise ValueError(f"Unknown rollup level {level!r} (use one of {', '.join(LEVELS)})")
+    periods = [p for p in list_periods(worker)
+               if (start is None or p.end >= start) and (end is None or p.start <= end)]
+    parts = [load_summary(p.path) for p in periods]
+    parts = [s[s["Level"] == level] for s in parts]
+    if not parts:
+        report = pd.DataFrame(columns=["Start", "End", *MEASURES])
+    else:
+        # A week or month that spans two periods is the sum of both halves
+        report = pd.concat(parts).groupby(["Start", "End"], as_index=False)[MEASURES].sum()
+        if start is not None:
+            report = report[report["End"] >= start]
+        if end is not None:
+            report = report[report["Start"] <= end]
+    report = report.reset_index(drop=True)
+    expected = report["Expected Hours"].to_numpy(dtype=float)
+    report["Utilization"] = np.divide(report["Hours"].to_numpy(dtype=float), expected,
+                                      out=np.zeros(len(report)), where=expected > 0)
+    return report.assign(Worker=worker)[["Worker", "Start", "End", *MEASURES, "Utilization"]]
+
+
+def rollups(workers, level="week", start=None, end=None):
+    """``rollup`` for several workers, one after the other."""
+    reports = [rollup(w, level, start, end) for w in workers]
+    if not reports:
+        return pd.DataFrame(columns=["Worker", "Start", "End", *MEASURES, "Utilization"])
+    return pd.concat(reports, ignore_index=True)
@@ -0,0 +1,489 @@
+"""
+Worklog storage: a snapshot file plus an append-only write-ahead log.
+
+Every log or removal is appended to ``<DATA_FILE>.wal`` as one small JSON
+record instead of rewriting the whole snapshot. Once the log grows past
+``COMPACT_BYTES`` it is folded back into the snapshot on a background thread.
+``load_data`` rebuilds the current state as snapshot + replayed tail.
+
+The snapshot format follows the extension of ``DATA_FILE`` (see
+``worklog.backends``); set ``WORKLOG_FILE=worklog.parquet`` to switch the apps
+to the columnar backend, or ``WORKLOG_FILE=worklog.sqlite`` for SQLite. A
+SQLite worklog is updated in place: row changes are single UPDATE statements
+instead of WAL records, and there is nothing to compact.
+
+Other modules follow every write through the hooks below. The ones called
+with the file's lock held see writes in the order they happen; the audit
+trail (``worklog.audit``) is kept that way, and is loaded before the first
+write whoever the caller is.
+"""
+
+import datetime
+import functools
+import json
+import os
+import stat
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from worklog import profiling
+from worklog.backends import get_backend
+from worklog.locking import file_lock, fsync_file
+
+# --- Settings ---
+DATA_FILE = os.environ.get("WORKLOG_FILE", "worklog.csv")
+HOURLY_RATE = 12.48
+NON_WORKING_DAYS = ["Sunday", "Wednesday"]
+START_DATE = datetime.date(2025, 9, 14)
+END_DATE = datetime.date(2025, 10, 11)
+COMPACT_BYTES = 64 * 1024  # Compact once the WAL is bigger than this
+READ_RETRIES = 3  # Optimistic reads before falling back to the shared lock
+CHUNK_ROWS = 50_000  # Rows per frame when streaming a worklog (iter_range)
+
+_compacting_lock = threading.Lock()
+_compacting = set()
+
+SAVE_HOOKS = []  # fn(path, df, version), called after save_data has written a snapshot
+# Called with the file's lock held:
+WRITE_HOOKS = []  # fn(path, state) before an existing file changes; state() loads its current frame
+CHANGE_HOOKS = []  # fn(path, changes, events, state) after log_changes has written row changes
+SNAPSHOT_HOOKS = []  # fn(path, df, action) after save_data / update_data has written a snapshot
+ARCHIVE_HOOKS = []  # fn(path, dst) after archive_data has moved a worklog into dst
+
+
+class StaleWorklogError(RuntimeError):
+    """Raised when saving a worklog copy that is older than the file on disk."""
+
+
+class ReadOnlyWorklogError(RuntimeError):
+    """Raised when changing an archived (read-only) worklog file."""
+
+
+def _check_writable(backend, path):
+    if backend.read_only:
+        raise ReadOnlyWorklogError(f"{path} is archived and can't be changed")
+
+
+def _load_hooks():
+    from worklog import audit  # noqa: F401  audit builds on this module and registers its hooks on import
+
+
+def wal_path(path):
+    """Returns the write-ahead log that belongs to a snapshot file."""
+    return path + ".wal"
+
+
+def _rotated_wal_path(path):
+    return path + ".wal.compacting"
+
+
+def data_version(path=DATA_FILE):
+    """Returns a cheap signature of the snapshot and its WAL that changes on every write.
+
+    Callers keep the version they loaded and only reload when it differs.
+    """
+    version = []
+    # <path>-wal is SQLite's own journal, where its commits land until a checkpoint
+    for file in (path, wal_path(path), _rotated_wal_path(path), path + "-wal"):
+        try:
+            info = os.stat(file)
+        except FileNotFoundError:
+            version.append(None)
+        else:
+            version.append((info.st_mtime_ns, info.st_size))
+    return tuple(version)
+
+
+# --- Functions to Load and Save Data ---
+def default_frame(start_date=START_DATE, end_date=END_DATE, hourly_rate=HOURLY_RATE):
+    """Creates an empty worklog covering every day from start_date to end_date.
+
+    ``hourly_rate`` is one rate for every day or an array with one per day.
+    """
+    dates = pd.date_range(start_date, end_date)
+    return pd.DataFrame({
+        "Date": dates.date,
+        "Day": pd.Categorical(dates.day_name()),
+        "Hours Worked": [0.0] * len(dates),
+        "Hourly Rate": np.full(len(dates), hourly_rate, dtype=float),
+        "Earned": [0.0] * len(dates),
+        "To Earn": [0.0] * len(dates)
+    })
+
+
+def _read_snapshot(path, columns=None):
+    backend = get_backend(path)
+    if backend.exists(path):
+        return backend.read(path, columns)
+    df = default_frame()
+    return df if columns is None else df[columns]
+
+
+def _read_wal(wal_file):
+    """Reads the WAL into {date: record}, keeping only the last record per date."""
+    changes = {}
+    try:
+        f = open(wal_file, encoding="utf-8")
+    except FileNotFoundError:
+        # Missing, or just renamed or removed by a compaction; lock-free readers see the version change
+        return changes
+    with f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A torn final line from a crash mid-append; everything before it is good
+                break
+            changes[datetime.date.fromisoformat(record.pop("Date"))] = record
+    return changes
+
+
+def apply_changes(df, changes):
+    """Applies {date: {"Hours Worked", "Earned"}} changes (WAL records) to a frame in one vectorized pass."""
+    if not changes:
+        return df
+    dates = list(changes)
+    rows = pd.Index(df["Date"]).get_indexer(dates)
+    found = rows >= 0
+    for column in ("Hours Worked", "Earned"):
+        if column not in df.columns:
+            continue
+        values = [changes[d][column] for d, ok in zip(dates, found) if ok]
+        df.loc[df.index[rows[found]], column] = values
+    return df
+
+
+@profiling.timed("load_data")
+def load_data(path=DATA_FILE, columns=None):
+    """Loads the worklog as snapshot + replayed WAL, or creates a new one if it doesn't exist.
+
+    Pass ``columns`` to read only what a page needs, e.g. ``["Date", "Earned"]``
+    for the totals. ``Date`` is always included because the WAL is keyed on it.
+
+    Reads are optimistic: if a writer touched the files while they were being
+    read, the read is retried, and only then done under the shared lock.
+    """
+    if columns is not None and "Date" not in columns:
+        columns = ["Date", *columns]
+    for _ in range(READ_RETRIES):
+        version = data_version(path)
+        try:
+            df = _load(path, columns)
+        except FileNotFoundError:
+            continue  # A file was replaced or removed mid-read: the same as a version change
+        if data_version(path) == version:
+            profiling.count("rows_read", len(df))
+            return df
+    with file_lock(path, shared=True):
+        df = _load(path, columns)
+    profiling.count("rows_read", len(df))
+    return df
+
+
+def _load(path, columns):
+    df = _read_snapshot(path, columns)
+    # A rotated log left behind by an interrupted compaction is older than the live one
+    df = apply_changes(df, _read_wal(_rotated_wal_path(path)))
+    return apply_changes(df, _read_wal(wal_path(path)))
+
+
+def _file_mode(path):
+    """The permission bits of ``path``, or those a new file gets under the process umask."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def _write_snapshot(df, path):
+    """Writes to a temp file, fsyncs it and renames it over the snapshot.
+
+    A crash mid-write leaves the previous snapshot untouched. Backends that
+    update in place (SQLite) get the same guarantee from a transaction.
+    """
+    backend = get_backend(path)
+    if backend.in_place:
+        backend.write(df, path)
+        profiling.count("rows_written", len(df))
+        return
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp",
+                               dir=os.path.dirname(os.path.abspath(path)))
+    os.close(fd)
+    try:
+        backend.write(df, tmp)
+        # mkstemp creates the file 0600; keep the permissions of the snapshot it replaces
+        os.chmod(tmp, _file_mode(path))
+        fsync_file(tmp)
+        if profiling.enabled():
+            profiling.count("rows_written", len(df))
+            profiling.count("bytes_persisted", os.path.getsize(tmp))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def write_archive(df, path):
+    """Writes a read-only worklog file (an archived period) once and returns its ``data_version``.
+
+    Raises ReadOnlyWorklogError if the file already exists.
+    """
+    with file_lock(path):
+        if os.path.exists(path):
+            raise ReadOnlyWorklogError(f"{path} is archived and can't be changed")
+        _write_snapshot(df, path)
+        os.chmod(path, 0o444)
+        return data_version(path)
+
+
+def archive_data(path, dst):
+    """Moves a worklog (snapshot + WAL) into the new read-only file ``dst``; returns the frame.
+
+    The source's lock is held throughout, so no change to it can be lost. If
+    ``dst`` already exists (an earlier archive_data was interrupted), only
+    the source is removed.
+    """
+    _load_hooks()
+    with file_lock(path):
+        df = _load(path, None)
+        if not os.path.exists(dst):
+            write_archive(df, dst)
+        for hook in ARCHIVE_HOOKS:
+            hook(path, dst)
+        # The lock file stays: other processes may be waiting on it
+        for file in (path, wal_path(path), _rotated_wal_path(path), path + "-wal", path + "-shm"):
+            if os.path.exists(file):
+                os.remove(file)
+    return df
+
+
+def _check_version(path, expected_version):
+    return expected_version is None or data_version(path) == expected_version
+
+
+@profiling.timed("save_data")
+def save_data(df, path=DATA_FILE, expected_version=None, action="save"):
+    """Saves the whole worklog DataFrame as a fresh snapshot and clears the WAL.
+
+    Pass the ``data_version`` the frame was loaded at as ``expected_version``
+    to refuse overwriting changes made by someone else since then. ``action``
+    names the save for the SNAPSHOT_HOOKS (the audit trail).
+    """
+    _load_hooks()
+    backend = get_backend(path)
+    _check_writable(backend, path)
+    with file_lock(path):
+        if not _check_version(path, expected_version):
+            raise StaleWorklogError(f"{path} changed since it was loaded; reload before saving")
+        version = _save_locked(df, path, backend, action)
+    for hook in SAVE_HOOKS:
+        hook(path, df, version)
+    return version
+
+
+def update_data(path, update, action="save"):
+    """Loads, changes and saves a worklog under its lock, so no other write can come in between.
+
+    ``update(df)`` returns the new frame, or None to leave the file as it
+    is. Returns the new ``data_version``, or None if nothing was saved.
+    """
+    _load_hooks()
+    backend = get_backend(path)
+    _check_writable(backend, path)
+    with file_lock(path):
+        df = update(_load(path, None))
+        if df is None:
+            return None
+        version = _save_locked(df, path, backend, action)
+    for hook in SAVE_HOOKS:
+        hook(path, df, version)
+    return version
+
+
+def _before_write(path, backend):
+    if backend.exists(path):
+        for hook in WRITE_HOOKS:
+            hook(path, functools.partial(_load, path, None))
+
+
+def _save_locked(df, path, backend, action):
+    _before_write(path, backend)
+    _write_snapshot(df, path)
+    for wal_file in (wal_path(path), _rotated_wal_path(path)):
+        if os.path.exists(wal_file):
+            os.remove(wal_file)
+    for hook in SNAPSHOT_HOOKS:
+        hook(path, df, action)
+    return data_version(path)
+
+
+def _after_changes(path, changes, events):
+    for hook in CHANGE_HOOKS:
+        hook(path, changes, events, functools.partial(_load, path, None))
+
+
+def log_change(date, hours, earned, path=DATA_FILE, expected_version=None):
+    """Appends one row change to the WAL; cost does not depend on the size of the worklog.
+
+    Row changes from different sessions merge: each one only touches its own
+    date. Returns the new ``data_version`` so the caller doesn't reload its own
+    write, or None if ``expected_version`` shows the caller's copy was already
+    stale, meaning it should reload to pick up the other changes.
+    """
+    return log_changes([(date, hours, earned)], path, expected_version)
+
+
+@profiling.timed("log_changes")
+def log_changes(changes, path=DATA_FILE, expected_version=None, events=None):
+    """Appends many (date, hours, earned) row changes with a single write and fsync.
+
+    A SQLite worklog is updated in place instead, in one transaction.
+    ``events`` describe the changes for the CHANGE_HOOKS (see
+    ``audit.events``). Returns the same as ``log_change``.
+    """
+    _load_hooks()
+    backend = get_backend(path)
+    _check_writable(backend, path)
+    if backend.row_updates:
+        with file_lock(path):
+            up_to_date = _check_version(path, expected_version)
+            _before_write(path, backend)
+            backend.update_rows(path, changes)
+            _after_changes(path, changes, events)
+            version = data_version(path) if up_to_date else None
+        profiling.count("rows_written", len(changes))
+        return version
+    lines = "".join(
+        json.dumps({"Date": date.isoformat(), "Hours Worked": float(hours), "Earned": float(earned)}) + "\n"
+        for date, hours, earned in changes
+    )
+    with file_lock(path):
+        up_to_date = _check_version(path, expected_version)
+        _before_write(path, backend)
+        with open(wal_path(path), "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        _after_changes(path, changes, events)
+        version = data_version(path) if up_to_date else None
+    profiling.count("rows_written", len(changes))
+    profiling.count("bytes_persisted", len(lines))
+    if size > COMPACT_BYTES:
+        compact_in_background(path)
+    return version
+
+
+def date_bounds(path=DATA_FILE):
+    """(first, last) date of a worklog; an index lookup for SQLite, a Date-only load otherwise."""
+    backend = get_backend(path)
+    if hasattr(backend, "date_bounds") and backend.exists(path):
+        return backend.date_bounds(path)
+    dates = load_data(path, columns=["Date"])["Date"]
+    return (dates.min(), dates.max()) if len(dates) else (None, None)
+
+
+def load_range(path=DATA_FILE, start=None, end=None, columns=None):
+    """The rows from ``start`` to ``end`` (inclusive); SQLite reads only those rows."""
+    if columns is not None and "Date" not in columns:
+        columns = ["Date", *columns]
+    backend = get_backend(path)
+    if hasattr(backend, "read_range") and backend.exists(path):
+        df = backend.read_range(path, start, end, columns)
+        profiling.count("rows_read", len(df))
+        return df
+    return _select_dates(load_data(path, columns), start, end)
+
+
+def iter_range(path=DATA_FILE, start=None, end=None, chunk_rows=CHUNK_ROWS, columns=None):
+    """``load_range`` as frames of at most ``chunk_rows`` rows, so memory stays bounded however big the file is.
+
+    WAL records are applied to each chunk as it is read. Except for SQLite
+    (whose readers never block writers), the shared lock is held until the
+    generator is exhausted or closed, so a compaction can't swap the
+    snapshot halfway through.
+    """
+    if columns is not None and "Date" not in columns:
+        columns = ["Date", *columns]
+    backend = get_backend(path)
+    if not backend.exists(path):
+        chunks = [load_range(path, start, end, columns)]
+    elif hasattr(backend, "iter_range"):
+        chunks = backend.iter_range(path, start, end, chunk_rows, columns)
+    else:
+        chunks = _iter_snapshot(backend, path, start, end, chunk_rows, columns)
+    for df in chunks:
+        if len(df):
+            profiling.count("rows_read", len(df))
+            yield df
+
+
+def _iter_snapshot(backend, path, start, end, chunk_rows, columns):
+    with file_lock(path, shared=True):
+        changes = _read_wal(_rotated_wal_path(path))
+        changes.update(_read_wal(wal_path(path)))
+        for df in backend.iter_chunks(path, chunk_rows, columns):
+            yield _select_dates(apply_changes(df, changes), start, end)
+
+
+def _select_dates(df, start, end):
+    dates = np.asarray(df["Date"], dtype="datetime64[D]")
+    keep = np.ones(len(df), dtype=bool)
+    if start is not None:
+        keep &= dates >= np.datetime64(start, "D")
+    if end is not None:
+        keep &= dates <= np.datetime64(end, "D")
+    return df[keep].reset_index(drop=True)
+
+
+# --- Compaction ---
+@profiling.timed("compact")
+def compact(path=DATA_FILE):
+    """Folds the WAL into the snapshot.
+
+    The live WAL is first renamed aside so that new changes keep appending to a
+    fresh file while the snapshot is rewritten without holding the lock. The
+    result is only installed if nobody replaced the snapshot in the meantime.
+    """
+    rotated = _rotated_wal_path(path)
+    with file_lock(path):
+        if not os.path.exists(rotated):
+            if not os.path.exists(wal_path(path)):
+                return False
+            os.replace(wal_path(path), rotated)
+    before = data_version(path)[0]
+    df = apply_changes(_read_snapshot(path), _read_wal(rotated))
+    if data_version(path)[0] != before:
+        return False
+    with file_lock(path):
+        if not os.path.exists(rotated) or data_version(path)[0] != before:
+            # Another compaction or a full save got there first
+            return False
+        _write_snapshot(df, path)
+        os.remove(rotated)
+    return True
+
+
+def compact_in_background(path=DATA_FILE):
+    """Starts compaction on a daemon thread unless one is already running for this file."""
+    with _compacting_lock:
+        if path in _compacting:
+            return None
+        _compacting.add(path)
+
+    def run():
+        try:
+            compact(path)
+        finally:
+            with _compacting_lock:
+                _compacting.discard(path)
+
+    thread = threading.Thread(target=run, name=f"compact-{path}", daemon=True)
+    thread.start()
+    return thread
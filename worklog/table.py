@@ -0,0 +1,73 @@
+"""
+Server-side filtering, sorting and paging for the Detailed Work Log table.
+
+Only the requested page is sliced out of the worklog and handed to the UI,
+so the browser receives ``page_size`` rows instead of the whole history.
+Pages are cached on the data key (path and ``data_version``) plus the
+query, so paging back and forth over unchanged data costs nothing.
+"""
+
+import collections
+import math
+
+import numpy as np
+
+from worklog import profiling
+from worklog.lru import LRUCache
+
+PAGE_SIZE = 50
+STATUSES = ("All", "Logged", "Unlogged")
+
+Query = collections.namedtuple(
+    "Query", ["start", "end", "status", "workers", "sort_by", "ascending"],
+    defaults=[None, None, "All", None, "Date", True]
+)
+Page = collections.namedtuple("Page", ["rows", "number", "pages", "total"])
+
+_page_cache = LRUCache(maxsize=128)
+
+
+def _sort_values(df, column):
+    if column == "Date":
+        return np.asarray(df["Date"], dtype="datetime64[D]")
+    return df[column].to_numpy()
+
+
+@profiling.timed("table.select")
+def select(df, query):
+    """Returns the row positions that match ``query``, in display order."""
+    mask = np.ones(len(df), dtype=bool)
+    if query.start is not None or query.end is not None:
+        dates = np.asarray(df["Date"], dtype="datetime64[D]")
+        if query.start is not None:
+            mask &= dates >= np.datetime64(query.start, "D")
+        if query.end is not None:
+            mask &= dates <= np.datetime64(query.end, "D")
+    if query.status == "Logged":
+        mask &= df["Hours Worked"].to_numpy() > 0
+    elif query.status == "Unlogged":
+        mask &= df["Hours Worked"].to_numpy() == 0
+    if query.workers and "Worker" in df.columns:
+        mask &= df["Worker"].isin(query.workers).to_numpy()
+    positions = np.flatnonzero(mask)
+    if query.sort_by:
+        order = np.argsort(_sort_values(df, query.sort_by)[positions], kind="stable")
+        positions = positions[order if query.ascending else order[::-1]]
+    return positions
+
+
+def get_page(key, data, query=Query(), number=1, page_size=PAGE_SIZE):
+    """Returns one Page of the filtered, sorted worklog.
+
+    ``data`` is the frame, or a function returning it that is only called on a
+    cache miss. ``number`` is 1-based and clamped to the available pages.
+    """
+    def build():
+        df = data() if callable(data) else data
+        positions = select(df, query)
+        pages = max(1, math.ceil(len(positions) / page_size))
+        page = min(max(1, number), pages)
+        rows = df.iloc[positions[(page - 1) * page_size:page * page_size]]
+        return Page(rows, page, pages, len(positions))
+
+    return _page_cache.get_or_build(None if key is None else (key, query, number, page_size), build)
@@ -0,0 +1,74 @@
+"""
+Running totals for the worklog.
+
+``Totals.from_frame`` does the full "To Earn" recalculation once, when the
+worklog is loaded. After that every log or remove goes through
+``Totals.set_hours``, which rewrites the one affected row and adjusts the
+running sums in O(1) instead of re-masking and re-summing the whole frame.
+Whether a day is a workday comes from the period's precomputed
+WorkdayBitmap, so no day names are compared.
+"""
+
+import numpy as np
+
+from worklog import profiling
+
+DAILY_HOURS = 4  # Expected hours on a working day
+
+
+class Totals:
+    """Earned / to-earn sums kept in step with a worklog frame."""
+
+    def __init__(self, workdays, earned=0.0, to_earn=0.0):
+        self.workdays = workdays
+        self.earned = earned
+        self.to_earn = to_earn
+
+    @property
+    def overall(self):
+        return self.earned + self.to_earn
+
+    @property
+    def expected_hours(self):
+        """Hours expected over the whole frame: DAILY_HOURS on every workday."""
+        return DAILY_HOURS * self.workdays.count()
+
+    @classmethod
+    @profiling.timed("Totals.from_frame")
+    def from_frame(cls, df, calendar):
+        """Recalculates the whole "To Earn" column and sums both columns."""
+        workdays = calendar.covering(df["Date"])
+        workdays_mask = workdays.mask(df["Date"])
+        # On working days, potential earning is 4 hours. "To Earn" is that potential minus what's already earned.
+        df["To Earn"] = ((DAILY_HOURS * df["Hourly Rate"]) - df["Earned"]).clip(lower=0).where(workdays_mask, 0.0)
+        return cls(workdays, float(df["Earned"].sum()), float(df["To Earn"].sum()))
+
+    def _to_earn(self, df, idx, earned):
+        if not self.workdays.is_workday(df.at[idx, "Date"]):
+            return 0.0
+        return max(DAILY_HOURS * df.at[idx, "Hourly Rate"] - earned, 0.0)
+
+    def set_hours(self, df, idx, hours):
+        """Sets the hours of one row, recomputes its Earned/To Earn and updates the sums."""
+        earned = hours * df.at[idx, "Hourly Rate"]
+        to_earn = self._to_earn(df, idx, earned)
+        self.earned += earned - df.at[idx, "Earned"]
+        self.to_earn += to_earn - df.at[idx, "To Earn"]
+        df.at[idx, "Hours Worked"] = float(hours)
+        df.at[idx, "Earned"] = earned
+        df.at[idx, "To Earn"] = to_earn
+        return earned
+
+    def set_hours_many(self, df, rows, hours):
+        """Vectorized ``set_hours`` for many row labels at once; returns the Earned values."""
+        rate = df.loc[rows, "Hourly Rate"].to_numpy(dtype=float)
+        hours = np.broadcast_to(np.asarray(hours, dtype=float), rate.shape)
+        earned = hours * rate
+        workday = self.workdays.mask(df.loc[rows, "Date"])
+        to_earn = np.where(workday, np.clip(DAILY_HOURS * rate - earned, 0.0, None), 0.0)
+        self.earned += float(earned.sum() - df.loc[rows, "Earned"].sum())
+        self.to_earn += float(to_earn.sum() - df.loc[rows, "To Earn"].sum())
+        df.loc[rows, "Hours Worked"] = hours
+        df.loc[rows, "Earned"] = earned
+        df.loc[rows, "To Earn"] = to_earn
+        return earned
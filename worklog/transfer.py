@@ -0,0 +1,268 @@
+"""
+Streaming export and import of worklogs, for moving history between instances.
+
+An export writes the rows of some workers (every worker by default) and an
+optional date range as CSV, JSON lines or Parquet. It reads one partition at
+a time and at most ``CHUNK_ROWS`` rows at once (see ``storage.iter_range``),
+and each chunk is written out before the next is read. Memory is bounded by
+the chunk size, not by the size of the history.
+
+An import reads such a file back in chunks as well. Each chunk is validated
+and upserted before the next one is read. Bad rows are counted and skipped.
+A good row sets the hours (and the hourly rate, if the file has one) of that
+worker's day, and a day outside every period of the worker gets its period
+created first; days of archived periods are skipped. Re-importing the same
+file writes nothing.
+
+    python -m worklog export history.jsonl alice bob --from 2024-01-01
+    python -m worklog import history.jsonl
+"""
+
+import collections
+import os
+
+import numpy as np
+import pandas as pd
+
+from worklog.audit import events
+from worklog.periods import (DEFAULT_WORKER, create_period, is_archived, is_worker_name, list_periods,
+                             list_workers, period_bounds, worker_of)
+from worklog.storage import (CHUNK_ROWS, DATA_FILE, data_version, iter_range, load_data, log_changes,
+                             save_data)
+from worklog.totals import Totals
+from worklog.workdays import load_calendar
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+MIME_TYPES = {"csv": "text/csv", "jsonl": "application/x-ndjson", "parquet": "application/vnd.apache.parquet"}
+EXPORT_COLUMNS = ["Worker", "Date", "Day", "Hours Worked", "Hourly Rate", "Earned", "To Earn"]
+MAX_HOURS = 24
+
+ImportResult = collections.namedtuple("ImportResult", ["rows", "upserted", "periods_created", "rejected"])
+
+
+def format_of(name, fmt=None):
+    """The format to use for a file: ``fmt`` if given, else the one its extension names."""
+    if fmt is not None:
+        if fmt not in MIME_TYPES:
+            raise ValueError(f"Unknown format {fmt!r} (use one of {', '.join(MIME_TYPES)})")
+        return fmt
+    extension = os.path.splitext(name)[1].lower()
+    try:
+        return FORMATS[extension]
+    except KeyError:
+        raise ValueError(f"Unsupported worklog export '{extension}' (use .csv, .jsonl or .parquet)") from None
+
+
+# --- Export ---
+def iter_export(workers=None, start=None, end=None, path=None, chunk_rows=CHUNK_ROWS):
+    """Yields the rows to export as frames of EXPORT_COLUMNS, each at most ``chunk_rows`` long.
+
+    Rows come from ``path`` if given, otherwise from the periods of
+    ``workers`` that overlap [start, end].
+    """
+    if path is not None:
+        sources = [(worker_of(path) or DEFAULT_WORKER, path)]
+    else:
+        sources = ((p.worker, p.path) for w in (list_workers() if workers is None else workers)
+                   for p in list_periods(w)
+                   if (start is None or p.end >= start) and (end is None or p.start <= end))
+    for worker, source in sources:
+        for df in iter_range(source, start, end, chunk_rows):
+            yield df.assign(Worker=worker)[EXPORT_COLUMNS]
+
+
+def write_export(chunks, out, fmt):
+    """Writes frames to a binary file object as they arrive; returns the number of rows written."""
+    rows = 0
+    writer = None
+    try:
+        for df in chunks:
+            # Plain strings, so every chunk has the same schema whatever categories it happens to hold
+            df = df.assign(Worker=df["Worker"].astype(str), Day=df["Day"].astype(str))
+            if fmt == "csv":
+                out.write(df.to_csv(index=False, header=rows == 0).encode("utf-8"))
+            elif fmt == "jsonl":
+                text = df.assign(Date=df["Date"].astype(str)).to_json(orient="records", lines=True)
+                out.write(text.encode("utf-8") + (b"" if text.endswith("\n") else b"\n"))
+            else:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(out, table.schema)
+                writer.write_table(table.cast(writer.schema))
+            rows += len(df)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def export(dst, workers=None, start=None, end=None, path=None, fmt=None, chunk_rows=CHUNK_ROWS):
+    """Streams an export into ``dst`` (a file name or a binary file object); returns the number of rows.
+
+    The format follows the file name unless ``fmt`` ("csv", "jsonl" or
+    "parquet") is given.
+    """
+    chunks = iter_export(workers, start, end, path, chunk_rows)
+    if not isinstance(dst, str):
+        return write_export(chunks, dst, format_of(getattr(dst, "name", ""), fmt))
+    fmt = format_of(dst, fmt)
+    with open(dst, "wb") as out:
+        return write_export(chunks, out, fmt)
+
+
+# --- Import ---
+def iter_file(src, fmt=None, chunk_rows=CHUNK_ROWS):
+    """Reads an export (a file name or a binary file object) as frames of at most ``chunk_rows`` rows."""
+    fmt = format_of(src if isinstance(src, str) else getattr(src, "name", ""), fmt)
+    if fmt == "csv":
+        # Everything as text: validate() does the parsing, so a bad value can't fail a whole chunk
+        with pd.read_csv(src, dtype=str, chunksize=chunk_rows) as reader:
+            yield from reader
+    elif fmt == "jsonl":
+        with pd.read_json(src, lines=True, dtype=False, convert_dates=False, chunksize=chunk_rows) as reader:
+            yield from reader
+    else:
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(src).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+
+
+def validate(chunk, worker=DEFAULT_WORKER):
+    """Splits a chunk into clean rows and a Counter of rejected rows per reason.
+
+    Clean rows have Worker, Date, Hours Worked and Hourly Rate (NaN where the
+    file has none, which keeps the day's current rate). ``worker`` is used
+    when the file has no Worker column. The last row for a (worker, date)
+    wins.
+    """
+    missing = [c for c in ("Date", "Hours Worked") if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"Import has no {' or '.join(missing)} column")
+    dates = pd.to_datetime(chunk["Date"], format="%Y-%m-%d", errors="coerce")
+    hours = pd.to_numeric(chunk["Hours Worked"], errors="coerce")
+    raw_rate = chunk["Hourly Rate"] if "Hourly Rate" in chunk.columns else pd.Series(np.nan, index=chunk.index)
+    rate = pd.to_numeric(raw_rate, errors="coerce")
+    if "Worker" in chunk.columns:
+        workers = chunk["Worker"].fillna("").astype(str).str.strip()  # A blank worker is rejected, not NaN
+    else:
+        workers = pd.Series(worker, index=chunk.index)
+    valid_worker = {w: w == DEFAULT_WORKER or is_worker_name(w) for w in workers.unique()}
+
+    rejected = collections.Counter()
+    bad = pd.Series(False, index=chunk.index)
+    for reason, rows in (
+        ("bad date", dates.isna()),
+        ("bad hours", hours.isna() | (hours < 0) | (hours > MAX_HOURS)),
+        ("bad hourly rate", (raw_rate.notna() & rate.isna()) | (rate < 0)),
+        ("bad worker", ~workers.map(valid_worker).astype(bool)),
+    ):
+        rows = rows & ~bad
+        if rows.any():
+            rejected[reason] += int(rows.sum())
+            bad |= rows
+    clean = pd.DataFrame({"Worker": workers, "Date": dates.dt.date, "Hours Worked": hours.astype(float),
+                          "Hourly Rate": rate.astype(float)})[~bad]
+    return clean.drop_duplicates(["Worker", "Date"], keep="last"), rejected
+
+
+def _period_paths(worker, dates):
+    """The partition holding each date among the worker's periods (None where there is none)."""
+    periods = list_periods(worker)
+    paths = np.full(len(dates), None, dtype=object)
+    if periods:
+        days = np.asarray(dates, dtype="datetime64[D]")
+        starts = np.array([p.start for p in periods], dtype="datetime64[D]")
+        ends = np.array([p.end for p in periods], dtype="datetime64[D]")
+        pos = np.searchsorted(starts, days, side="right") - 1
+        inside = (pos >= 0) & (days <= ends[pos.clip(0)])
+        paths[inside] = np.array([p.path for p in periods], dtype=object)[pos[inside]]
+    return paths
+
+
+def upsert_rows(rows, path, calendar):
+    """Applies Date / Hours Worked / Hourly Rate rows to one worklog file.
+
+    Only rows that change something are written: as WAL records when just
+    hours change, as a new snapshot when a rate does. Returns (rows changed,
+    rows whose date isn't in the file).
+    """
+    version = data_version(path)
+    df = load_data(path)
+    pos = pd.Index(df["Date"]).get_indexer(rows["Date"])
+    found = pos >= 0
+    pos = pos[found]
+    current_hours = df["Hours Worked"].to_numpy(dtype=float)[pos]
+    current_rate = df["Hourly Rate"].to_numpy(dtype=float)[pos]
+    hours = rows["Hours Worked"].to_numpy(dtype=float)[found]
+    rate = rows["Hourly Rate"].to_numpy(dtype=float)[found]
+    rate = np.where(np.isnan(rate), current_rate, rate)
+    changed = (hours != current_hours) | (rate != current_rate)
+    outside = int((~found).sum())
+    if not changed.any():
+        return 0, outside
+
+    labels = df.index[pos[changed]]
+    hours = hours[changed]
+    if (rate[changed] != current_rate[changed]).any():
+        df.loc[labels, "Hourly Rate"] = rate[changed]
+        df.loc[labels, "Hours Worked"] = hours
+        df.loc[labels, "Earned"] = hours * rate[changed]
+        Totals.from_frame(df, calendar)
+        save_data(df, path, expected_version=version, action="import")
+    else:
+        previous = list(zip(current_hours[changed], df["Earned"].to_numpy(dtype=float)[pos[changed]]))
+        earned = Totals.from_frame(df, calendar).set_hours_many(df, labels, hours)
+        changes = list(zip(df.loc[labels, "Date"], hours, earned))
+        log_changes(changes, path, expected_version=version, events=events(changes, previous, "import"))
+    return len(labels), outside
+
+
+def import_file(src, path=None, worker=None, fmt=None, chunk_rows=CHUNK_ROWS):
+    """Validates and upserts an export chunk by chunk; returns an ImportResult.
+
+    Rows go to their worker's periods (``worker`` overrides the file's Worker
+    column), or all to ``path`` if given. A file with neither goes to the
+    default worklog file.
+    """
+    total = upserted = created = 0
+    rejected = collections.Counter()
+    for chunk in iter_file(src, fmt, chunk_rows):
+        total += len(chunk)
+        if worker is not None:
+            chunk = chunk.assign(Worker=worker)
+        target = path if path is not None else (None if "Worker" in chunk.columns else DATA_FILE)
+        clean, bad = validate(chunk)
+        rejected.update(bad)
+
+        if target is not None:
+            calendar = load_calendar(worker_of(target) or DEFAULT_WORKER)
+            changed, outside = upsert_rows(clean, target, calendar)
+            upserted += changed
+            rejected["outside worklog"] += outside
+            continue
+
+        for name, rows in clean.groupby("Worker", sort=False):
+            if name == DEFAULT_WORKER:
+                rejected["no worker"] += len(rows)
+                continue
+            paths = _period_paths(name, rows["Date"])
+            if pd.isna(paths).any():
+                for bounds in sorted({period_bounds(d) for d in rows["Date"][pd.isna(paths)]}):
+                    try:
+                        create_period(name, *bounds)
+                        created += 1
+                    except ValueError:
+                        pass  # Overlaps an irregular period; those days are rejected below
+                paths = _period_paths(name, rows["Date"])
+            rejected["no period"] += int(pd.isna(paths).sum())
+            calendar = load_calendar(name)
+            for partition, part in rows[~pd.isna(paths)].groupby(paths[~pd.isna(paths)], sort=False):
+                if is_archived(partition):
+                    rejected["archived period"] += len(part)
+                    continue
+                changed, outside = upsert_rows(part, partition, calendar)
+                upserted += changed
+                rejected["outside worklog"] += outside
+    return ImportResult(total, upserted, created, +rejected)
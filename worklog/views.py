@@ -0,0 +1,98 @@
+"""
+Streamlit widgets shared by the apps.
+
+This is the only module in the package that imports streamlit; the rest of
+``worklog`` stays usable from scripts and the command line.
+"""
+
+import pandas as pd
+import streamlit as st
+
+from worklog import profiling
+from worklog.audit import set_actor
+from worklog.cache import CACHE
+from worklog.table import PAGE_SIZE, STATUSES, Query, get_page
+
+SORT_COLUMNS = ["Date", "Hours Worked", "Earned", "To Earn"]
+
+
+def paged_table(key, data, start, end, widget_key="worklog_table", page_size=PAGE_SIZE):
+    """Renders filter/sort controls and a single page of the worklog.
+
+    ``key`` identifies the data version for page caching (None disables it)
+    and ``data`` is the frame or a function returning it. ``start``/``end``
+    bound the date filter.
+    """
+    col1, col2, col3 = st.columns([2, 1, 1])
+    date_range = col1.date_input("Dates", value=(start, end), min_value=start, max_value=end,
+                                 key=f"{widget_key}_dates")
+    status = col2.selectbox("Show", STATUSES, key=f"{widget_key}_status")
+    sort_by = col3.selectbox("Sort by", SORT_COLUMNS, key=f"{widget_key}_sort")
+    # While the second date is still being picked the widget returns a single date
+    range_start = date_range[0] if len(date_range) > 0 else start
+    range_end = date_range[1] if len(date_range) > 1 else end
+    descending = st.toggle("Newest / largest first", key=f"{widget_key}_descending")
+    query = Query(range_start, range_end, status, None, sort_by, not descending)
+
+    page_key = f"{widget_key}_page"
+    page = get_page(key, data, query, st.session_state.get(page_key, 1), page_size)
+    if st.session_state.get(page_key, 1) != page.number:
+        # The filters shrank the result below the selected page
+        st.session_state[page_key] = page.number
+    with profiling.timer("st.dataframe"):
+        st.dataframe(page.rows, hide_index=True, use_container_width=True)
+
+    col1, col2 = st.columns([1, 3])
+    col1.number_input("Page", min_value=1, max_value=page.pages, step=1, key=page_key)
+    first = (page.number - 1) * page_size + 1 if page.total else 0
+    col2.caption(f"Rows {first}–{first + len(page.rows) - 1 if page.total else 0} of {page.total} "
+                 f"(page {page.number} of {page.pages})")
+    return page
+
+
+def debug_panel(label="Debug"):
+    """Sidebar switch for rerun profiling, with the timings and counters of this rerun.
+
+    Call it last in the script: it ends the run started by
+    ``profiling.begin_run``.
+    """
+    run = profiling.end_run()
+    with st.sidebar.expander(label):
+        on = st.toggle("Time reruns", value=profiling.enabled(), key="profiling_widget")
+        if on and not profiling.enabled():
+            profiling.enable()
+        elif not on and profiling.enabled():
+            profiling.disable()
+        stats = CACHE.stats()
+        st.caption(f"Worklog cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} files")
+        if run is None:
+            st.caption("Turn on to time each stage of the next rerun.")
+            return
+        st.caption(f"This rerun: {run.seconds * 1000:.1f} ms")
+        stages = pd.DataFrame([(name, seconds * 1000) for name, seconds in run.stages], columns=["Stage", "ms"])
+        st.dataframe(stages.round(2), hide_index=True)
+        calls = pd.DataFrame([(name, n, seconds * 1000) for name, (n, seconds) in run.calls.items()],
+                             columns=["Call", "Count", "ms"])
+        st.dataframe(calls.round(2), hide_index=True)
+        st.json(dict(run.counters))
+
+
+def set_session_actor(app):
+    """Records this session's changes in the audit trail as the signed-in user's, else as the app's."""
+    user = getattr(st, "user", None) or getattr(st, "experimental_user", None)
+    set_actor(getattr(user, "email", None) or app)
+
+
+def _sync_status():
+    """Saved / saving indicator for the background writer (see ``CACHE.background_writes``)."""
+    status = CACHE.writer.status() if CACHE.writer is not None else {"pending": 0, "error": None}
+    if status["error"]:
+        st.caption(f"⚠️ Not saved yet, retrying: {status['error']}")
+    elif status["pending"]:
+        st.caption(f"⏳ Saving {status['pending']} change{'s' if status['pending'] != 1 else ''}…")
+    else:
+        st.caption("✅ All changes saved")
+
+
+# Redrawn on its own every couple of seconds (without rerunning the script) where fragments exist
+sync_status = st.fragment(run_every=2)(_sync_status) if hasattr(st, "fragment") else _sync_status
@@ -0,0 +1,176 @@
+"""
+Working calendar: which days are workdays, for everyone or per worker.
+
+A calendar is a weekly pattern of non-working weekdays plus holidays and
+extra working days. They are read from ``worklogs/calendar.json``:
+
+    {
+      "*":     {"non_working_days": ["Sunday", "Wednesday"], "holidays": ["2025-12-25"]},
+      "alice": {"non_working_days": ["Saturday", "Sunday"], "working_days": ["2025-12-27"]}
+    }
+
+The ``*`` entry applies to everyone. A worker's own entry replaces the weekly
+pattern when it has one and adds its holidays and working days to the shared
+ones; a listed working day wins over a holiday. Without the file every worker
+gets NON_WORKING_DAYS and no holidays.
+
+``WorkCalendar.bitmap(start, end)`` precomputes one bit per day of a period,
+so checking a day is a byte lookup and counting workdays (and so expected
+hours) is a popcount over a few bytes.
+"""
+
+import datetime
+import functools
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from worklog.compact_history import EPOCH, EPOCH_WEEKDAY, WEEKDAYS
+from worklog.periods import DATA_DIR, DEFAULT_WORKER
+from worklog.storage import NON_WORKING_DAYS
+
+CALENDAR_FILE = os.environ.get("WORKLOG_CALENDAR", os.path.join(DATA_DIR, "calendar.json"))
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def day_numbers(dates):
+    """Dates, datetime64 values or day numbers since 1970-01-01 as an int64 array."""
+    values = np.asarray(dates)
+    if values.dtype.kind in "iu":
+        return values.astype(np.int64)
+    if values.dtype == object:
+        # datetime.date objects: pandas converts them in C, numpy one at a time
+        values = pd.to_datetime(values).to_numpy()
+    return values.astype("datetime64[D]").astype(np.int64)
+
+
+class WorkdayBitmap:
+    """One bit per day from ``start`` to ``end``, set on the calendar's workdays.
+
+    Dates outside the range are answered by the calendar's rules instead.
+    """
+
+    def __init__(self, calendar, start, end):
+        self.calendar = calendar
+        self.start = start
+        self.end = end
+        self.days = max((end - start).days + 1, 0)
+        self._first = (start - EPOCH).days
+        self.bits = np.packbits(calendar.mask(np.arange(self._first, self._first + self.days)))
+
+    def _bits(self, i):
+        return (self.bits[i >> 3] >> (7 - (i & 7))) & 1
+
+    def is_workday(self, date):
+        i = (date - EPOCH).days - self._first
+        if 0 <= i < self.days:
+            return bool(self._bits(i))
+        return self.calendar.is_workday(date)
+
+    def mask(self, dates):
+        """Vectorized ``is_workday`` for many dates at once."""
+        days = day_numbers(dates)
+        i = days - self._first
+        inside = (i >= 0) & (i < self.days)
+        result = np.empty(len(days), dtype=bool)
+        result[inside] = self._bits(i[inside]).astype(bool)
+        if not inside.all():
+            result[~inside] = self.calendar.mask(days[~inside])
+        return result
+
+    def count(self, start=None, end=None):
+        """Number of workdays from ``start`` to ``end`` (both inclusive, clipped to the bitmap)."""
+        if start is None and end is None:
+            return int(_POPCOUNT[self.bits].sum())
+        i = max((start - self.start).days, 0) if start else 0
+        j = min((end - self.start).days, self.days - 1) if end else self.days - 1
+        if j < i:
+            return 0
+        chunk = np.unpackbits(self.bits[i >> 3:(j >> 3) + 1])
+        return int(chunk[i & 7:(i & 7) + j - i + 1].sum())
+
+    def __len__(self):
+        return self.days
+
+
+class WorkCalendar:
+    """A weekly pattern of non-working days, with holiday and extra-workday exceptions."""
+
+    def __init__(self, non_working_days=NON_WORKING_DAYS, holidays=(), working_days=()):
+        self.non_working_days = frozenset(non_working_days)
+        unknown = self.non_working_days.difference(WEEKDAYS)
+        if unknown:
+            raise ValueError(f"Unknown weekday(s) {', '.join(sorted(unknown))}")
+        self.holidays = frozenset(holidays)
+        self.working_days = frozenset(working_days)
+        self._week = np.array([name not in self.non_working_days for name in WEEKDAYS])
+        self._holidays = day_numbers(sorted(self.holidays)) if self.holidays else None
+        self._working = day_numbers(sorted(self.working_days)) if self.working_days else None
+
+    def _key(self):
+        return self.non_working_days, self.holidays, self.working_days
+
+    def __eq__(self, other):
+        return isinstance(other, WorkCalendar) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def is_workday(self, date):
+        if date in self.working_days:
+            return True
+        return date not in self.holidays and WEEKDAYS[date.weekday()] not in self.non_working_days
+
+    def mask(self, dates):
+        """Workday flags for many dates, from the rules (see ``bitmap`` for repeated lookups)."""
+        days = day_numbers(dates)
+        workday = self._week[(days + EPOCH_WEEKDAY) % 7]
+        if self._holidays is not None:
+            workday &= ~np.isin(days, self._holidays)
+        if self._working is not None:
+            workday |= np.isin(days, self._working)
+        return workday
+
+    @functools.lru_cache(maxsize=128)
+    def bitmap(self, start, end):
+        """The precomputed WorkdayBitmap of one period; built once per calendar and range."""
+        return WorkdayBitmap(self, start, end)
+
+    def covering(self, dates):
+        """The bitmap from the first to the last of ``dates`` (an empty one if there are none)."""
+        days = day_numbers(dates)
+        if len(days) == 0:
+            return self.bitmap(EPOCH, EPOCH - datetime.timedelta(days=1))
+        return self.bitmap(EPOCH + datetime.timedelta(days=int(days.min())),
+                           EPOCH + datetime.timedelta(days=int(days.max())))
+
+
+def _dates(values):
+    return {datetime.date.fromisoformat(v) for v in values}
+
+
+@functools.lru_cache(maxsize=64)
+def _load_calendar(worker, path, mtime):
+    if mtime is None:
+        return WorkCalendar()
+    with open(path, encoding="utf-8") as f:
+        settings = json.load(f)
+    shared = settings.get(DEFAULT_WORKER, {})
+    own = settings.get(worker, {}) if worker != DEFAULT_WORKER else {}
+    return WorkCalendar(
+        own.get("non_working_days", shared.get("non_working_days", NON_WORKING_DAYS)),
+        _dates(shared.get("holidays", [])) | _dates(own.get("holidays", [])),
+        _dates(shared.get("working_days", [])) | _dates(own.get("working_days", [])),
+    )
+
+
+def load_calendar(worker=DEFAULT_WORKER, path=CALENDAR_FILE):
+    """Returns a worker's calendar (everyone's with the default), re-read only when the file changes."""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+    return _load_calendar(worker, path, mtime)
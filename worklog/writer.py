@@ -0,0 +1,128 @@
+"""
+Background persistence: button handlers update the shared frame and return.
+
+With a writer attached to the cache (``CACHE.background_writes()``), a
+``CachedWorklog`` change is applied to the in-memory frame right away and
+queued here instead of being written before the handler returns. One daemon
+thread per process drains the queue. It waits ``COALESCE_SECONDS`` after the
+first queued change, so a burst of edits (several clicks, several sessions,
+a bulk backfill) becomes one ``log_changes`` call per file, and the last
+change of a date wins. Every change's audit event is still written, in order.
+
+Queued changes are flushed when the interpreter exits (including a normal
+Streamlit shutdown), and ``flush()`` waits for them on demand, e.g. before
+an operation that reads the file from disk. A failed write is kept and
+retried; ``status()`` reports what is pending and the last error, for the
+apps' saved / saving indicator.
+"""
+
+import atexit
+import sys
+import threading
+import time
+
+from worklog import audit
+from worklog.storage import log_changes
+
+COALESCE_SECONDS = 0.2  # How long to wait for more changes before writing
+RETRY_SECONDS = 1.0  # Wait after a failed write
+
+
+class BackgroundWriter:
+    """Queues (date, hours, earned) changes per worklog and writes them on one thread."""
+
+    def __init__(self, delay=COALESCE_SECONDS):
+        self.delay = delay
+        self._cond = threading.Condition()
+        self._pending = {}  # path -> (CachedWorklog, {date: (hours, earned)}, [audit events])
+        self._writing = {}  # The batch being written, same shape
+        self._thread = None
+        self._stopping = False
+        self.error = None
+        self.last_write = None
+
+    def submit(self, worklog, changes, events=None):
+        """Queues changes to ``worklog`` (already applied to its frame) and returns immediately.
+
+        ``events`` are their audit events (see ``audit.events``).
+        """
+        with self._cond:
+            _, queued, queued_events = self._pending.setdefault(worklog.path, (worklog, {}, []))
+            for date, hours, earned in changes:
+                queued[date] = (hours, earned)
+            queued_events.extend(events if events is not None else audit.events(changes))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="worklog-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+            self._cond.notify_all()
+
+    def pending(self, path=None):
+        """Number of changes not on disk yet, for one file or for all of them."""
+        with self._cond:
+            return sum(len(changes) for batch in (self._pending, self._writing)
+                       for p, (_, changes, _) in batch.items() if path is None or p == path)
+
+    def status(self):
+        return {"pending": self.pending(), "error": self.error, "last_write": self.last_write}
+
+    def flush(self, timeout=None):
+        """Waits until every queued change is on disk; returns False on timeout."""
+        with self._cond:
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def stop(self, timeout=30):
+        """Writes what is queued and stops the thread (registered with atexit)."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._stopping)
+                if not self._pending:
+                    return
+                stopping = self._stopping
+            if not stopping:
+                time.sleep(self.delay)  # Let a burst of changes pile up
+            with self._cond:
+                self._writing, self._pending = self._pending, {}
+            failed = self._write(self._writing)
+            with self._cond:
+                self._writing = {}
+                if failed and not self._stopping:
+                    # Changes queued since then are newer, so they win over the failed ones
+                    for path, (worklog, changes, events) in failed.items():
+                        _, newer, newer_events = self._pending.get(path, (worklog, {}, []))
+                        self._pending[path] = (worklog, {**changes, **newer}, events + newer_events)
+                self._cond.notify_all()
+            if failed:
+                if self._stopping:
+                    print(f"worklog-writer: dropped unsaved changes to {', '.join(failed)}: {self.error}",
+                          file=sys.stderr)
+                else:
+                    time.sleep(RETRY_SECONDS)
+
+    def _write(self, batch):
+        """Writes one batch with one log_changes call per file; returns the files that failed."""
+        failed = {}
+        for path, (worklog, changes, events) in batch.items():
+            expected = worklog.version
+            try:
+                version = log_changes([(d, h, e) for d, (h, e) in changes.items()], path, expected_version=expected,
+                                      events=events)
+            except Exception as e:  # Kept for retry and shown in the UI instead of killing the thread
+                self.error = f"{type(e).__name__}: {e}"
+                failed[path] = (worklog, changes, events)
+                continue
+            with worklog.lock:
+                # None means another process wrote first; it stays None so the cache reloads the file
+                worklog.version = version if expected is not None else None
+            self.error = None
+            self.last_write = time.time()
+        return failed